@@ -0,0 +1,15 @@
+import django_filters
+from core.models import Order, OrderStatusChoices
+
+class OrderFilter(django_filters.FilterSet):
+    current_status = django_filters.MultipleChoiceFilter(
+        choices=OrderStatusChoices.choices,
+    )
+
+    start_date = django_filters.DateFromToRangeFilter(
+        field_name="start_date",
+    )
+
+    class Meta:
+        model = Order
+        fields = ["current_status", "has_delivery"]
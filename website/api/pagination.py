@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+class OrderCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-order_id"
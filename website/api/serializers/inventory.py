@@ -1,7 +1,25 @@
 from rest_framework import serializers
-from core.models import ItemStateChangeHistory
+from core.models import ItemCategory, ItemStateChangeHistory
+
+MAX_CALENDAR_DAYS = 366
 
 class ItemStateChangeHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = ItemStateChangeHistory
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+class AvailabilityCalendarQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    item_category = serializers.PrimaryKeyRelatedField(queryset=ItemCategory.objects.all(), required=False)
+
+    def validate(self, data):
+        days = (data["end_date"] - data["start_date"]).days + 1
+
+        if days < 1:
+            raise serializers.ValidationError("end_date must be on or after start_date")
+
+        if days > MAX_CALENDAR_DAYS:
+            raise serializers.ValidationError(f"Calendar window cannot exceed {MAX_CALENDAR_DAYS} days")
+
+        return data
@@ -23,7 +23,7 @@ class OrderSerializer(serializers.ModelSerializer):
     tasks = OrderTaskSerializer(many=True, read_only=True)
 
     current_status = serializers.CharField(read_only=True)
-    amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    amount = serializers.DecimalField(source="total_amount", max_digits=12, decimal_places=2, read_only=True)
 
     class Meta:
         model = Order
@@ -49,6 +49,28 @@ class OrderSerializer(serializers.ModelSerializer):
             "tasks",
         )
 
+class OrderListSerializer(serializers.ModelSerializer):
+    contact = OrderContactSerializer(read_only=True)
+
+    current_status = serializers.CharField(read_only=True)
+    amount = serializers.DecimalField(source="total_amount", max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = (
+            "order_id",
+            "code",
+            "date_created",
+            "start_date",
+            "end_date",
+            "has_delivery",
+
+            "current_status",
+            "amount",
+
+            "contact",
+        )
+
 class OrderBillingContactInputSerialier(serializers.Serializer):
     name = serializers.CharField(max_length=255)
     email = serializers.EmailField()
@@ -93,6 +115,7 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             "code",
             "date_created",
             "has_delivery",
+            "current_status",
             "lead",
             "user"
         )
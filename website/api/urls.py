@@ -6,12 +6,13 @@ from api.views.item import ItemViewSet
 from api.views.service import ServiceViewSet
 from api.views.item_category import ItemCategoryViewSet
 from api.views.order_task import OrderTaskViewSet
-from api.views.inventory import ItemStateChangeHistoryViewSet
+from api.views.inventory import AvailabilityCalendarViewSet, ItemStateChangeHistoryViewSet
 
 router = DefaultRouter()
 router.register(r'order', OrderViewSet, basename='order')
 router.register(r'item', ItemViewSet, basename='item')
 router.register(r'inventory', ItemStateChangeHistoryViewSet, basename='inventory')
+router.register(r'inventory-calendar', AvailabilityCalendarViewSet, basename='inventory-calendar')
 router.register(r'item-category', ItemCategoryViewSet, basename='item-category')
 router.register(r'order-task', OrderTaskViewSet, basename='order-task')
 router.register(r'service', ServiceViewSet, basename='service')
@@ -1,7 +1,58 @@
-from rest_framework.viewsets import ModelViewSet
-from core.models import ItemStateChangeHistory
-from api.serializers.inventory import ItemStateChangeHistorySerializer
+from datetime import timedelta
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from core.models import Item, ItemStateChangeHistory
+from core.logic.managers.item import ItemInventoryManager
+from api.serializers.inventory import AvailabilityCalendarQuerySerializer, ItemStateChangeHistorySerializer
+
+class ItemStateChangeHistoryViewSet(ReadOnlyModelViewSet):
+    """
+    Read-only: the availability projection is rebuilt by ItemInventoryManager as it writes history,
+    so rows created or edited here would leave it stale.
+    """
 
-class ItemStateChangeHistoryViewSet(ModelViewSet):
     queryset = ItemStateChangeHistory.objects.all()
-    serializer_class = ItemStateChangeHistorySerializer
\ No newline at end of file
+    serializer_class = ItemStateChangeHistorySerializer
+
+class AvailabilityCalendarViewSet(viewsets.ViewSet):
+    """
+    Units available per item per day for a window, e.g. ?start_date=2026-03-01&end_date=2026-03-31&item_category=2
+    """
+
+    def list(self, request):
+        query = AvailabilityCalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        start_date = query.validated_data["start_date"]
+        end_date = query.validated_data["end_date"]
+        item_category = query.validated_data.get("item_category")
+
+        items = Item.objects.order_by("item_category_id", "name")
+        if item_category:
+            items = items.filter(item_category=item_category)
+
+        items = list(items.values("item_id", "name", "item_category_id"))
+
+        matrix = ItemInventoryManager.availability_calendar(
+            [item["item_id"] for item in items],
+            start_date,
+            end_date,
+        )
+
+        dates = [start_date + timedelta(days=offset) for offset in range(matrix.shape[1])]
+
+        return Response({
+            "start_date": start_date,
+            "end_date": end_date,
+            "dates": dates,
+            "items": [
+                {
+                    "item_id": item["item_id"],
+                    "name": item["name"],
+                    "item_category": item["item_category_id"],
+                    "availability": row.tolist(),
+                }
+                for item, row in zip(items, matrix)
+            ],
+        })
@@ -1,12 +1,65 @@
+from decimal import Decimal
+
+from django.db.models import DecimalField, OuterRef, Prefetch, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.viewsets import ModelViewSet
-from core.models import Order
-from api.serializers.order import OrderCreateSerializer, OrderSerializer
+from core.models import Order, OrderAddress, OrderItem, OrderService, OrderStatusChangeHistory, OrderTask
+from api.serializers.order import OrderCreateSerializer, OrderListSerializer, OrderSerializer
+from api.filters.order import OrderFilter
+from api.pagination import OrderCursorPagination
+
+def line_total_subquery(model):
+    # units and price_per_unit are float columns; cast them so totals are summed as numeric, not doubles.
+    money = DecimalField(max_digits=12, decimal_places=2)
+    line_total = Cast("units", DecimalField(max_digits=12, decimal_places=4)) * Cast("price_per_unit", money)
 
+    return Coalesce(
+        Subquery(
+            model.objects
+            .filter(order=OuterRef("pk"))
+            .order_by()
+            .values("order")
+            .annotate(total=Sum(line_total, output_field=money))
+            .values("total")
+        ),
+        Value(Decimal("0")),
+        output_field=money,
+    )
 
 class OrderViewSet(ModelViewSet):
     queryset = Order.objects.all()
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrderFilter
+    pagination_class = OrderCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "create":
+            return queryset
+
+        queryset = queryset.annotate(
+            total_amount=line_total_subquery(OrderItem) + line_total_subquery(OrderService),
+        )
+
+        if self.action == "list":
+            return queryset.select_related("contact")
+
+        return queryset.select_related(
+            "contact",
+            "billing_contact",
+        ).prefetch_related(
+            Prefetch("items", queryset=OrderItem.objects.select_related("item__item_category")),
+            Prefetch("services", queryset=OrderService.objects.select_related("service")),
+            Prefetch("addresses", queryset=OrderAddress.objects.select_related("address__zip_code__city__state")),
+            Prefetch("changes", queryset=OrderStatusChangeHistory.objects.select_related("status")),
+            Prefetch("tasks", queryset=OrderTask.objects.select_related("task", "user")),
+        )
 
     def get_serializer_class(self):
         if self.action == "create":
             return OrderCreateSerializer
-        return OrderSerializer
\ No newline at end of file
+        if self.action == "list":
+            return OrderListSerializer
+        return OrderSerializer
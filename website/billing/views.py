@@ -1,12 +1,25 @@
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
 from core.billing import billing_service
+from core.models import WebhookProviderChoices
+from core.logic.webhooks.inbox import webhook_inbox
 
 @csrf_exempt
 @require_POST
 def handle_payment_webhook(request):
-    return billing_service.handle_payment_webhook(request=request)
+    event = billing_service.verify_payment_webhook(request)
+
+    if event is None:
+        return HttpResponse(status=400)
+
+    return webhook_inbox.receive(
+        request,
+        provider=WebhookProviderChoices.STRIPE,
+        event_type='stripe.payment',
+        external_id=event.get('id'),
+    )
 
 @require_POST
 def handle_initiate_payment(request):
@@ -4,12 +4,11 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
-import requests
 
 from crm.views import CRMCreateView
 from core.enums import AlertStatus
 from core.mixins import AlertMixin
-from core.models import Lead, Message, PhoneCallTranscription
+from core.models import Lead, Message, PhoneCallTranscription, WebhookProviderChoices
 from core.messaging import messaging_service
 from core.calling import calling_service
 from core.call_tracking import call_tracking_service
@@ -17,12 +16,25 @@ from core.logger import logger
 from core.transcription import transcription_service
 from communication.forms import OutboundPhoneCallForm
 from core.utils import get_transcription_external_id_from_object_key
+from core.logic.webhooks.inbox import webhook_inbox
+from core.logic.http.sessions import get_session
 
 from .forms import MessageForm
 
 @csrf_exempt
 def handle_inbound_message(request: HttpRequest):
-    return messaging_service.handle_inbound_message(request)
+    if request.method != "POST":
+        return HttpResponse("Only POST allowed", status=405)
+
+    if not messaging_service.verify_request(request):
+        return HttpResponse("Invalid Twilio signature.", status=403)
+
+    return webhook_inbox.receive(
+        request,
+        provider=WebhookProviderChoices.TWILIO,
+        event_type='twilio.inbound_message',
+        external_id=request.POST.get("MessageSid"),
+    )
 
 @csrf_exempt
 def handle_message_status_callback(request: HttpRequest):
@@ -36,7 +48,7 @@ def handle_transcription_subcription_callback(request: HttpRequest):
     # Step 1: Confirm subscription if needed
     if message_type == "SubscriptionConfirmation":
         subscribe_url = payload.get('SubscribeURL')
-        requests.get(subscribe_url)
+        get_session('aws').get(subscribe_url)
         return HttpResponse("Subscription confirmed", status=200)
 
     # Step 2: Handle notification
@@ -117,7 +129,20 @@ def handle_inbound_tracking_call(request: HttpRequest):
 
 @csrf_exempt
 def handle_inbound_tracking_call_end(request: HttpRequest):
-    return call_tracking_service.handle_inbound_tracking_call_end(request)
+    if not call_tracking_service.verify_request(request):
+        return HttpResponse("Invalid CallRail signature.", status=403)
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return HttpResponse("Invalid JSON.", status=400)
+
+    return webhook_inbox.receive(
+        request,
+        provider=WebhookProviderChoices.CALLRAIL,
+        event_type='callrail.tracking_call_end',
+        external_id=data.get('resource_id'),
+    )
 
 @csrf_exempt
 def handle_inbound_tracking_message(request: HttpRequest):
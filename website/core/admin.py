@@ -32,7 +32,18 @@ admin.site.register(UserRole)
 # Inventory / Items
 admin.site.register(ItemCategory)
 admin.site.register(Item)
-admin.site.register(ItemStateChangeHistory)
+
+# History rows are written by ItemInventoryManager, which keeps the availability projection in step.
+@admin.register(ItemStateChangeHistory)
+class ItemStateChangeHistoryAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 # Orders
 admin.site.register(Order)
@@ -2,4 +2,10 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        # Connect the page cache invalidation receivers in every process, not only those serving pages.
+        import core.logic.cache.pages
+        import core.logic.tracking.attribution
+        import core.logic.analytics.prospecting
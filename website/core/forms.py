@@ -4,7 +4,8 @@ import os
 
 from core.messaging.utils import MIME_EXTENSION_MAP
 from website.settings import COMPANY_NAME
-from .utils import add_form_field_class, cleanup_dir_files, convert_audio_format, convert_video_to_mp4, create_generic_file_name, get_upload_sub_dir, normalize_phone_number
+from .utils import add_form_field_class, cleanup_dir_files, create_generic_file_name, get_upload_sub_dir, normalize_phone_number
+from core.logic.helpers.media import convert_audio_format, convert_video_to_mp4
 from .widgets import ToggleSwitchWidget
 from .models import Lead, Service, UnitType, User, ServiceType
 from core.email import email_service
@@ -1,9 +1,10 @@
 from django.db import models
 
 from core.models import Lead, Message
+from core.logic.outbox.publisher import outbox
 from core.utils import format_text_message, get_most_frequent_communication_user
 from core.services.messaging import messaging_service
-from core.enums import EngagementAction, FollowUpVariant
+from core.enums import LeadEngagementAction, FollowUpVariant
 
 class LeadAction:
 
@@ -24,31 +25,52 @@ class LeadAction:
         message.status = resp.status
         message.save()
 
-    def send_automated_message(self, action: EngagementAction):
-        if action == EngagementAction.SEND_INITIAL_CONTACT:
-            self._send_initial_contact()
+    def queue_automated_message(self, action: LeadEngagementAction, variant: FollowUpVariant | None = None, idempotency_key: str | None = None):
+        """Records the automated text in the outbox, so it is only sent if the caller's transaction commits."""
+        if action == LeadEngagementAction.INTIATE_CONTACT:
+            text = self._build_initial_contact_text()
 
-        elif action == EngagementAction.SEND_FOLLOW_UP_1:
-            self._send_follow_up(variant="first")
+        elif action == LeadEngagementAction.SEND_FOLLOW_UP:
+            text = self._build_follow_up_text(variant=variant or FollowUpVariant.FIRST)
+
+        else:
+            return None
 
-        elif action == EngagementAction.SEND_FOLLOW_UP_2:
-            self._send_follow_up(variant="second")
-    
-    def _send_initial_contact(self):
         user = get_most_frequent_communication_user(messages=self.lead.messages())
 
-        text = "\n".join([
+        message = Message(
+            text=format_text_message(text),
+            text_from=user.forward_phone_number,
+            text_to=self.lead.phone_number,
+            is_inbound=False,
+            status="sent",
+            is_read=True,
+        )
+        return outbox.send_text_message(message, idempotency_key=idempotency_key)
+
+    def send_automated_message(self, action: LeadEngagementAction, variant: FollowUpVariant | None = None):
+        if action == LeadEngagementAction.INTIATE_CONTACT:
+            self._send_initial_contact()
+
+        elif action == LeadEngagementAction.SEND_FOLLOW_UP:
+            self._send_follow_up(variant=variant or FollowUpVariant.FIRST)
+    
+    def _build_initial_contact_text(self) -> str:
+        return "\n".join([
             f"Hi {self.lead.full_name}, thanks for reaching out!",
             f"I’ll be helping you with your request.",
         ])
 
+    def _send_initial_contact(self):
+        user = get_most_frequent_communication_user(messages=self.lead.messages())
+
         self._send_text(
             from_number=user.forward_phone_number,
             to_number=self.lead.phone_number,
-            text=text,
+            text=self._build_initial_contact_text(),
         )
     
-    def _build_follow_up_text(self, variant: str) -> str:
+    def _build_follow_up_text(self, variant: FollowUpVariant) -> str:
         if variant == FollowUpVariant.FIRST:
             return "\n".join([
                 f"Hey {self.lead.full_name}, just following up!",
@@ -63,10 +85,10 @@ class LeadAction:
 
         raise ValueError(f"Unknown follow-up variant: {variant}")
 
-    def _send_follow_up(self, variant: str):
+    def _send_follow_up(self, variant: FollowUpVariant):
         user = get_most_frequent_communication_user(messages=self.lead.messages())
 
-        text_content = self._build_follow_up_text(lead=self.lead, variant=variant)
+        text_content = self._build_follow_up_text(variant=variant)
 
         message = Message(
             text=format_text_message(text_content),
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.cache import caches
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from core.models import AdSpend, Lead
+from website import settings
+
+# Lead dimensions metrics can be grouped by, as expressions over Lead.
+DIMENSIONS = {
+    'platform': F('lead_marketing__attribution__ad_platform'),
+    'campaign': F('lead_marketing__attribution__ad_campaign'),
+    'ad_group': F('lead_marketing__attribution__ad_group'),
+    'ad': F('lead_marketing__attribution__ad'),
+    'day': TruncDay('created_at', output_field=DateField()),
+    'week': TruncWeek('created_at', output_field=DateField()),
+    'month': TruncMonth('created_at', output_field=DateField()),
+}
+
+# Ad spend is only recorded per platform and day, so spend metrics exist for these dimensions alone.
+SPEND_DIMENSIONS = {
+    'platform': F('platform_id'),
+    'day': F('date'),
+    'week': TruncWeek('date', output_field=DateField()),
+    'month': TruncMonth('date', output_field=DateField()),
+}
+
+def _ratio(numerator, denominator) -> float:
+    if numerator is None or not denominator:
+        return 0
+    return numerator / denominator
+
+@dataclass(frozen=True)
+class MarketingMetrics:
+    dimensions: dict
+    leads: int = 0
+    converted_leads: int = 0
+    events: int = 0
+    revenue: float = 0
+    ad_spend: float | None = None
+
+    @property
+    def aov(self) -> float:
+        return _ratio(self.revenue, self.converted_leads)
+
+    @property
+    def closing_percent(self) -> float:
+        return _ratio(self.converted_leads * 100, self.leads)
+
+    @property
+    def roas(self) -> float:
+        return _ratio(self.revenue, self.ad_spend)
+
+    @property
+    def cpl(self) -> float:
+        return _ratio(self.ad_spend, self.leads)
+
+    @property
+    def cpa(self) -> float:
+        return _ratio(self.ad_spend, self.converted_leads)
+
+class MarketingAnalyticsEngine:
+    """
+    Lead, booking and revenue metrics for leads created in a date range, grouped by any of
+    DIMENSIONS. Everything comes from one grouped query over leads joined to their events, plus
+    one grouped query over ad spend when the dimensions allow it, so the cost doesn't grow with the
+    number of platforms or metrics. Results are cached per (range, dimensions).
+    """
+
+    def get(self, date_from: datetime, date_to: datetime, dimensions: tuple[str, ...] = ('platform',)) -> list[MarketingMetrics]:
+        key = self.cache_key(date_from, date_to, dimensions)
+        cache = caches[settings.MARKETING_ANALYTICS_CACHE]
+
+        metrics = cache.get(key)
+        if metrics is None:
+            metrics = self.compute(date_from, date_to, dimensions)
+            cache.set(key, metrics, settings.MARKETING_ANALYTICS_CACHE_TIMEOUT)
+
+        return metrics
+
+    def compute(self, date_from: datetime, date_to: datetime, dimensions: tuple[str, ...] = ('platform',)) -> list[MarketingMetrics]:
+        unknown = set(dimensions) - DIMENSIONS.keys()
+        if unknown:
+            raise ValueError(f"Unknown analytics dimension(s): {', '.join(sorted(unknown))}.")
+
+        rows = (
+            Lead.objects
+            .filter(created_at__range=(date_from, date_to))
+            .values(**{name: DIMENSIONS[name] for name in dimensions})
+            .annotate(
+                leads=Count('pk', distinct=True),
+                converted_leads=Count('pk', distinct=True, filter=Q(events__isnull=False)),
+                event_count=Count('events'),
+                revenue=Sum('events__amount'),
+            )
+            .order_by()
+        )
+
+        spend = self._spend(date_from, date_to, dimensions)
+
+        metrics = {}
+        for row in rows:
+            key = tuple(row[name] for name in dimensions)
+            metrics[key] = MarketingMetrics(
+                dimensions=dict(zip(dimensions, key)),
+                leads=row['leads'],
+                converted_leads=row['converted_leads'],
+                events=row['event_count'],
+                revenue=row['revenue'] or 0,
+                ad_spend=spend.get(key, 0) if spend is not None else None,
+            )
+
+        # Spend that produced no leads still counts against the platform.
+        for key, ad_spend in (spend or {}).items():
+            if key not in metrics:
+                metrics[key] = MarketingMetrics(dimensions=dict(zip(dimensions, key)), ad_spend=ad_spend)
+
+        return list(metrics.values())
+
+    def _spend(self, date_from: datetime, date_to: datetime, dimensions: tuple[str, ...]) -> dict[tuple, float] | None:
+        if not set(dimensions) <= SPEND_DIMENSIONS.keys():
+            return None
+
+        rows = (
+            AdSpend.objects
+            .filter(date__range=(date_from.date(), date_to.date()))
+            .values(**{name: SPEND_DIMENSIONS[name] for name in dimensions})
+            .annotate(ad_spend=Sum('spend'))
+            .order_by()
+        )
+
+        return {tuple(row[name] for name in dimensions): row['ad_spend'] or 0 for row in rows}
+
+    @staticmethod
+    def cache_key(date_from: datetime, date_to: datetime, dimensions: tuple[str, ...]) -> str:
+        return f"analytics:marketing:{date_from.isoformat()}:{date_to.isoformat()}:{','.join(dimensions)}"
+
+marketing_analytics = MarketingAnalyticsEngine()
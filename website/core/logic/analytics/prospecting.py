@@ -0,0 +1,220 @@
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count, DateField, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from core.models import Invoice, InvoiceTypeEnum, Lead, LeadAttribution, ProspectingRollup, Quote, QuoteService
+
+# Nothing before this month is reported.
+ROLLUP_START = date(2025, 8, 1)
+
+# Rental leads only started being tracked by Google click from this date.
+RENTAL_START = date(2025, 10, 1)
+
+SEGMENTS = {
+    'all': Q(),
+    'bartending': Q(lead_marketing__attribution__has_facebook_click=True),
+    'rental': Q(
+        created_at__gte=timezone.make_aware(datetime(RENTAL_START.year, RENTAL_START.month, RENTAL_START.day)),
+        lead_marketing__attribution__has_google_click=True,
+    ),
+}
+
+BOOKED_INVOICE_TYPES = (InvoiceTypeEnum.FULL.value, InvoiceTypeEnum.DEPOSIT.value)
+
+def month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        value = timezone.localtime(value) if timezone.is_aware(value) else value
+    return date(value.year, value.month, 1)
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def months_between(first: date, last: date) -> list[date]:
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+def _paid_invoices():
+    """A quote is booked once its full or deposit invoice has been paid, as in Quote.is_booked."""
+    return Invoice.objects.filter(date_paid__isnull=False, invoice_type__type__in=BOOKED_INVOICE_TYPES)
+
+class ProspectingRollups:
+    """
+    Monthly prospecting metrics per segment: leads created, how many of them booked, leads with a
+    quote for an event that month, how many of those booked, and the value of the booked quotes.
+
+    Each metric is a grouped SQL aggregate over leads and quotes annotated with whether they are
+    booked. Months before the current one are stored in ProspectingRollup and only recomputed when
+    their row is missing; the receivers below delete the rows a change to a lead, its attribution,
+    a quote, quote service or invoice affects. The current month and later ones keep changing, so they are always
+    computed on demand.
+    """
+
+    def get(self, segment: str, first: date, last: date) -> list[ProspectingRollup]:
+        months = months_between(first, last)
+        current = month_start(timezone.now())
+
+        rollups = {month: ProspectingRollup(segment=segment, month=month) for month in months if month < ROLLUP_START}
+        rollups.update({
+            rollup.month: rollup
+            for rollup in ProspectingRollup.objects.filter(segment=segment, month__in=[m for m in months if m < current])
+        })
+
+        missing = [month for month in months if month not in rollups]
+        if missing:
+            computed = self.compute(segment, missing[0], missing[-1])
+            self._store(segment, [computed[month] for month in missing if month < current])
+            rollups.update({month: computed[month] for month in missing})
+
+        return [rollups[month] for month in months]
+
+    def refresh(self, segment: str, first: date, last: date) -> int:
+        """Recomputes and stores the closed months between `first` and `last`."""
+        current = month_start(timezone.now())
+        months = [month for month in months_between(max(first, ROLLUP_START), last) if month < current]
+        if not months:
+            return 0
+
+        computed = self.compute(segment, months[0], months[-1])
+        self._store(segment, [computed[month] for month in months])
+        return len(months)
+
+    def compute(self, segment: str, first: date, last: date) -> dict[date, ProspectingRollup]:
+        if segment not in SEGMENTS:
+            raise ValueError(f"Unknown prospecting segment '{segment}'.")
+
+        first, end = month_start(first), next_month(month_start(last))
+        leads = Lead.objects.filter(SEGMENTS[segment])
+
+        rollups = {
+            month: ProspectingRollup(segment=segment, month=month)
+            for month in months_between(first, last)
+        }
+
+        lead_rows = (
+            leads
+            .filter(
+                created_at__gte=timezone.make_aware(datetime(first.year, first.month, 1)),
+                created_at__lt=timezone.make_aware(datetime(end.year, end.month, 1)),
+            )
+            .annotate(is_booked=Exists(_paid_invoices().filter(quote__lead=OuterRef('pk'))))
+            .values(period=TruncMonth('created_at', output_field=DateField()))
+            .annotate(
+                leads=Count('pk', distinct=True),
+                converted_leads=Count('pk', distinct=True, filter=Q(is_booked=True)),
+            )
+            .order_by()
+        )
+        for row in lead_rows:
+            rollup = rollups[row['period']]
+            rollup.leads = row['leads']
+            rollup.converted_leads = row['converted_leads']
+
+        quotes = Quote.objects.filter(lead__in=leads, event_date__gte=first, event_date__lt=end)
+
+        quote_rows = (
+            quotes
+            .annotate(is_booked=Exists(_paid_invoices().filter(quote=OuterRef('pk'))))
+            .values(period=TruncMonth('event_date'))
+            .annotate(
+                quotes=Count('lead', distinct=True),
+                booked=Count('lead', distinct=True, filter=Q(is_booked=True)),
+            )
+            .order_by()
+        )
+        for row in quote_rows:
+            rollup = rollups[row['period']]
+            rollup.quotes = row['quotes']
+            rollup.booked = row['booked']
+
+        value_rows = (
+            QuoteService.objects
+            .filter(
+                Exists(_paid_invoices().filter(quote=OuterRef('quote'))),
+                quote__in=quotes,
+            )
+            .values(period=TruncMonth('quote__event_date'))
+            .annotate(value=Sum(F('units') * F('price_per_unit')))
+            .order_by()
+        )
+        for row in value_rows:
+            rollups[row['period']].value = row['value'] or 0
+
+        return rollups
+
+    def invalidate(self, months: set[date]):
+        """Drops the stored rollups of `months` once the current transaction commits."""
+        months = {month for month in months if month is not None}
+        if months:
+            transaction.on_commit(lambda: ProspectingRollup.objects.filter(month__in=months).delete())
+
+    def _store(self, segment: str, rollups: list[ProspectingRollup]):
+        if not rollups:
+            return
+
+        ProspectingRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['segment', 'month'],
+            update_fields=['leads', 'converted_leads', 'quotes', 'booked', 'value', 'date_refreshed'],
+        )
+
+prospecting_rollups = ProspectingRollups()
+
+def _quote_months(quote_id: int) -> set[date]:
+    row = Quote.objects.filter(pk=quote_id).values_list('event_date', 'lead__created_at').first()
+    if row is None:
+        return set()
+
+    event_date, created_at = row
+    return {month_start(event_date), month_start(created_at)}
+
+# A quote whose event_date or lead changes leaves the months it used to count toward stale too.
+def _on_quote_saving(sender, instance: Quote, **kwargs):
+    instance._prospecting_previous_months = _quote_months(instance.pk) if instance.pk else set()
+
+def _on_quote_saved(sender, instance: Quote, **kwargs):
+    previous = getattr(instance, '_prospecting_previous_months', set())
+    prospecting_rollups.invalidate(_quote_months(instance.pk) | previous)
+
+def _on_quote_deleted(sender, instance: Quote, **kwargs):
+    created_at = Lead.objects.filter(pk=instance.lead_id).values_list('created_at', flat=True).first()
+    prospecting_rollups.invalidate({month_start(instance.event_date), month_start(created_at) if created_at else None})
+
+# Invoices decide whether a quote is booked and quote services make up its value.
+def _on_quote_child_changed(sender, instance: Invoice | QuoteService, **kwargs):
+    prospecting_rollups.invalidate(_quote_months(instance.quote_id))
+
+def _on_lead_saved(sender, instance: Lead, created: bool, **kwargs):
+    if created:
+        prospecting_rollups.invalidate({month_start(instance.created_at)})
+
+def _on_lead_deleted(sender, instance: Lead, **kwargs):
+    prospecting_rollups.invalidate({month_start(instance.created_at)})
+
+# The attribution flags decide which segments a lead and its quotes count toward.
+def _on_attribution_saved(sender, instance: LeadAttribution, **kwargs):
+    created_at = Lead.objects.filter(lead_marketing=instance.lead_marketing_id).values_list('created_at', flat=True).first()
+    if created_at is None:
+        return
+
+    event_dates = Quote.objects.filter(lead__lead_marketing=instance.lead_marketing_id).values_list('event_date', flat=True)
+    prospecting_rollups.invalidate({month_start(created_at), *(month_start(event_date) for event_date in event_dates)})
+
+pre_save.connect(_on_quote_saving, sender=Quote, weak=False, dispatch_uid='prospecting_quote_pre_save')
+post_save.connect(_on_quote_saved, sender=Quote, weak=False, dispatch_uid='prospecting_quote_save')
+post_delete.connect(_on_quote_deleted, sender=Quote, weak=False, dispatch_uid='prospecting_quote_delete')
+post_save.connect(_on_quote_child_changed, sender=Invoice, weak=False, dispatch_uid='prospecting_invoice_save')
+post_delete.connect(_on_quote_child_changed, sender=Invoice, weak=False, dispatch_uid='prospecting_invoice_delete')
+post_save.connect(_on_quote_child_changed, sender=QuoteService, weak=False, dispatch_uid='prospecting_quote_service_save')
+post_delete.connect(_on_quote_child_changed, sender=QuoteService, weak=False, dispatch_uid='prospecting_quote_service_delete')
+post_save.connect(_on_lead_saved, sender=Lead, weak=False, dispatch_uid='prospecting_lead_save')
+post_delete.connect(_on_lead_deleted, sender=Lead, weak=False, dispatch_uid='prospecting_lead_delete')
+post_save.connect(_on_attribution_saved, sender=LeadAttribution, weak=False, dispatch_uid='prospecting_attribution_save')
@@ -0,0 +1,48 @@
+from django.core.cache import caches
+from django.db import transaction
+
+from core.models import Message
+from website import settings
+
+class UnreadMessageCounter:
+    """
+    Unread inbound message count, kept in the cache so CRM pages don't COUNT the message table.
+    Writers adjust it with atomic incr/decr once their transaction commits. A missing or expired key
+    falls back to counting in the database, which also bounds drift from paths that change is_read
+    without going through the counter.
+    """
+
+    key = 'crm:unread_messages'
+
+    @property
+    def cache(self):
+        return caches[settings.UNREAD_MESSAGES_CACHE]
+
+    def get(self) -> int:
+        count = self.cache.get(self.key)
+        if count is None:
+            count = self.recount()
+        return count
+
+    def recount(self) -> int:
+        count = Message.objects.filter(is_read=False).count()
+        self.cache.set(self.key, count, timeout=settings.UNREAD_MESSAGES_CACHE_TIMEOUT)
+        return count
+
+    def incr(self, delta: int = 1):
+        transaction.on_commit(lambda: self._adjust(delta))
+
+    def decr(self, delta: int = 1):
+        transaction.on_commit(lambda: self._adjust(-delta))
+
+    def _adjust(self, delta: int):
+        try:
+            count = self.cache.incr(self.key, delta)
+        except ValueError:
+            # Not cached; the next read counts from the database.
+            return
+
+        if count < 0:
+            self.cache.delete(self.key)
+
+unread_message_counter = UnreadMessageCounter()
@@ -0,0 +1,80 @@
+import threading
+from typing import Generic, Type, TypeVar
+
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from core.models import AdPlatform, DriverStopStatus, EventStatus, ItemState, LeadStatus, OrderStatus, OrderTaskChoice, OrderTaskStatus
+
+T = TypeVar('T', bound=models.Model)
+
+class LookupTableCache(Generic[T]):
+    """
+    Process-local cache for small, enum-backed lookup tables, keyed by choice value.
+    The whole table is loaded on first access and dropped whenever a row is saved or deleted.
+    """
+
+    def __init__(self, model: Type[T], field: str):
+        self.model = model
+        self.field = field
+        self._rows: dict[str, T] | None = None
+        self._lock = threading.Lock()
+
+        post_save.connect(self._on_change, sender=model, weak=False, dispatch_uid=f'lookup_cache_{model.__name__}_save')
+        post_delete.connect(self._on_change, sender=model, weak=False, dispatch_uid=f'lookup_cache_{model.__name__}_delete')
+
+    def get(self, value: str) -> T:
+        rows = self._rows
+        if rows is None:
+            rows = self.warm()
+
+        row = rows.get(value)
+        if row is None:
+            # Unknown values fall through to the database so callers keep .get() semantics.
+            row = self.model.objects.get(**{self.field: value})
+            self.invalidate()
+
+        return row
+
+    def warm(self) -> dict[str, T]:
+        with self._lock:
+            if self._rows is None:
+                self._rows = {
+                    getattr(row, self.field): row
+                    for row in self.model.objects.all()
+                }
+            return self._rows
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = None
+
+    def _on_change(self, sender, **kwargs):
+        self.invalidate()
+
+        # Re-read once the writing transaction commits, so rows it created are never missed.
+        transaction.on_commit(self.invalidate)
+
+item_states: LookupTableCache[ItemState] = LookupTableCache(ItemState, 'state')
+order_statuses: LookupTableCache[OrderStatus] = LookupTableCache(OrderStatus, 'status')
+order_task_statuses: LookupTableCache[OrderTaskStatus] = LookupTableCache(OrderTaskStatus, 'status')
+order_task_choices: LookupTableCache[OrderTaskChoice] = LookupTableCache(OrderTaskChoice, 'task')
+lead_statuses: LookupTableCache[LeadStatus] = LookupTableCache(LeadStatus, 'status')
+event_statuses: LookupTableCache[EventStatus] = LookupTableCache(EventStatus, 'status')
+driver_stop_statuses: LookupTableCache[DriverStopStatus] = LookupTableCache(DriverStopStatus, 'status')
+ad_platforms: LookupTableCache[AdPlatform] = LookupTableCache(AdPlatform, 'platform')
+
+LOOKUP_CACHES = [
+    item_states,
+    order_statuses,
+    order_task_statuses,
+    order_task_choices,
+    lead_statuses,
+    event_statuses,
+    driver_stop_statuses,
+    ad_platforms,
+]
+
+def warm_lookup_caches():
+    for cache in LOOKUP_CACHES:
+        cache.warm()
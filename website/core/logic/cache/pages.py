@@ -0,0 +1,73 @@
+import time
+from functools import lru_cache
+
+from django.core.cache import caches
+from django.core.files.storage import storages
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.db.models.signals import post_delete, post_save
+
+from core.models import Event, GoogleReview
+from core.utils import get_paired_reviews
+from website import settings
+
+@lru_cache(maxsize=None)
+def media_url(name: str) -> str:
+    """Storage URL of a fixed marketing asset, resolved once per process (i.e. once per deploy)."""
+    return storages['media'].url(name)
+
+class SocialProofCache:
+    """
+    Review and event figures shown on the public marketing pages, built once and shared through the cache.
+    Dropped when a review changes or an event is created or deleted. Every rebuild gets a new version,
+    which the templates put in their fragment cache keys so the rendered review blocks expire with it.
+    """
+
+    key = 'marketing:social_proof'
+
+    def __init__(self):
+        post_save.connect(self._on_change, sender=GoogleReview, weak=False, dispatch_uid='social_proof_review_save')
+        post_delete.connect(self._on_change, sender=GoogleReview, weak=False, dispatch_uid='social_proof_review_delete')
+        post_save.connect(self._on_event_save, sender=Event, weak=False, dispatch_uid='social_proof_event_save')
+        post_delete.connect(self._on_change, sender=Event, weak=False, dispatch_uid='social_proof_event_delete')
+
+    @property
+    def cache(self):
+        return caches[settings.MARKETING_PAGE_CACHE]
+
+    def get(self) -> dict:
+        data = self.cache.get(self.key)
+        if data is None:
+            data = self.build()
+            self.cache.set(self.key, data, timeout=settings.MARKETING_PAGE_CACHE_TIMEOUT)
+        return data
+
+    def get_context(self) -> dict:
+        return {
+            **self.get(),
+            'social_proof_cache_timeout': settings.MARKETING_PAGE_CACHE_TIMEOUT,
+        }
+
+    def build(self) -> dict:
+        ratings = GoogleReview.objects.aggregate(count=Count('pk'), rating_value=Avg('rating_value'))
+
+        return {
+            'social_proof_version': time.time_ns(),
+            'reviews_count': ratings['count'],
+            'reviews_ratings': ratings['rating_value'],
+            'paired_reviews': get_paired_reviews(),
+            'events': Event.objects.count(),
+        }
+
+    def invalidate(self):
+        self.cache.delete(self.key)
+
+    def _on_change(self, sender, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+    def _on_event_save(self, sender, created=False, **kwargs):
+        # Only the event count is shown, so status updates don't need a rebuild.
+        if created:
+            self._on_change(sender, **kwargs)
+
+social_proof = SocialProofCache()
@@ -0,0 +1,106 @@
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable, Generic, Optional, Type, TypeVar
+
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.timezone import is_naive, make_aware
+
+from core.models import FacebookAccessToken, GoogleAccessToken
+
+T = TypeVar('T')
+
+class TokenCache(Generic[T]):
+    """
+    Process-local cache for an API credential. The value is reloaded when it comes within
+    `refresh_ahead` of its expiry, so callers refresh before a request fails rather than after,
+    and whenever a new row of `model` is saved (e.g. another code path refreshed the token).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Optional[T]],
+        expires_at: Callable[[T], Optional[datetime]],
+        refresh_ahead: timedelta,
+        model: Type[models.Model] | None = None,
+    ):
+        self.loader = loader
+        self.expires_at = expires_at
+        self.refresh_ahead = refresh_ahead
+        self._value: T | None = None
+
+        # Re-entrant: loaders may save a fresh token row, which fires _on_change inside get().
+        self._lock = threading.RLock()
+
+        if model is not None:
+            post_save.connect(self._on_change, sender=model, weak=False, dispatch_uid=f'token_cache_{model.__name__}_save')
+
+    def get(self) -> T | None:
+        value = self._value
+        if value is not None and not self.needs_refresh(value):
+            return value
+
+        with self._lock:
+            if self._value is None or self.needs_refresh(self._value):
+                self._value = self.loader()
+            return self._value
+
+    def set(self, value: T):
+        with self._lock:
+            self._value = value
+
+    def needs_refresh(self, value: T) -> bool:
+        expires_at = self.expires_at(value)
+        if expires_at is None:
+            return False
+
+        if is_naive(expires_at):
+            expires_at = make_aware(expires_at, dt_timezone.utc)
+
+        return expires_at - timezone.now() < self.refresh_ahead
+
+    def warm(self) -> T | None:
+        return self.get()
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+    def _on_change(self, sender, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+GOOGLE_REFRESH_AHEAD = timedelta(minutes=5)
+
+def _latest_facebook_token() -> FacebookAccessToken | None:
+    return FacebookAccessToken.objects.order_by('-date_created').first()
+
+def _load_google_credentials():
+    # Imported here so the Google client libraries load only when credentials are first needed.
+    from core.logic.helpers.google import load_google_credentials
+    return load_google_credentials(refresh_ahead=GOOGLE_REFRESH_AHEAD)
+
+# FacebookAccessToken.refresh_needed already asks for a new long-lived token 5 days out and the
+# service performs the exchange, so this cache only drops a row once it has actually expired.
+facebook_tokens: TokenCache[FacebookAccessToken] = TokenCache(
+    _latest_facebook_token,
+    lambda token: token.date_expires,
+    refresh_ahead=timedelta(0),
+    model=FacebookAccessToken,
+)
+
+google_credentials = TokenCache(
+    _load_google_credentials,
+    lambda creds: creds.expiry,
+    refresh_ahead=GOOGLE_REFRESH_AHEAD,
+    model=GoogleAccessToken,
+)
+
+TOKEN_CACHES = [
+    facebook_tokens,
+    google_credentials,
+]
+
+def warm_token_caches():
+    for cache in TOKEN_CACHES:
+        cache.warm()
@@ -0,0 +1,40 @@
+from django.db import connection
+from django.utils.functional import empty
+
+from core.logger import logger
+from core.logic.cache.lookups import warm_lookup_caches
+from core.logic.cache.tokens import facebook_tokens, google_credentials
+
+def _service_singletons():
+    from core.services.billing import billing_service
+    from core.services.email import email_service
+    from core.services.facebook.api import facebook_api_service
+    from core.services.google.api import google_api_service
+
+    return [billing_service, email_service, facebook_api_service, google_api_service]
+
+def warm_up():
+    """
+    Fills the process-local caches and constructs the service singletons ahead of the first request.
+    Meant for worker boot (see gunicorn.conf.py); every step is best-effort, so a missing token only
+    moves the cost back to the request that needs it.
+    """
+    steps = [
+        ('lookup tables', warm_lookup_caches),
+        ('Facebook token', facebook_tokens.warm),
+        ('Google credentials', google_credentials.warm),
+    ]
+
+    for service in _service_singletons():
+        if service._wrapped is empty:
+            steps.append((type(service).__name__, service._setup))
+
+    try:
+        for name, step in steps:
+            try:
+                step()
+            except Exception as e:
+                logger.warning(f'Warm-up of {name} failed: {e}', exc_info=True)
+    finally:
+        # Worker threads open their own connections; don't keep the boot one around.
+        connection.close()
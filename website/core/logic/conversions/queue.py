@@ -0,0 +1,33 @@
+import uuid
+
+from website import settings
+
+from core.models import ConversionUpload
+from core.services.conversions import conversion_service
+
+class ConversionQueue:
+    """
+    Records a conversion once per ad platform that accepts it, in the caller's transaction.
+    `upload_conversions` sends the pending rows to each platform in batches.
+    """
+
+    def enqueue(self, data: dict, idempotency_key: str | None = None, services: list[str] | None = None) -> list[ConversionUpload]:
+        idempotency_key = idempotency_key or uuid.uuid4().hex
+        uploads = []
+
+        for name in services or settings.CONVERSION_SERVICES:
+            if not conversion_service.get(name).accepts(data):
+                continue
+
+            upload, _ = ConversionUpload.objects.get_or_create(
+                idempotency_key=f"{idempotency_key}:{name}",
+                defaults={
+                    'service': name,
+                    'payload': data,
+                },
+            )
+            uploads.append(upload)
+
+        return uploads
+
+conversion_queue = ConversionQueue()
@@ -0,0 +1,72 @@
+from django.utils import timezone
+from website import settings
+
+from core.logger import logger
+from core.models import ConversionUpload, ConversionUploadStatusChoices
+from core.logic.queues.lease import LeasedQueue
+from core.services.conversions import conversion_service
+from core.services.conversions.base import ConversionResult
+
+class ConversionUploadWorker:
+    """
+    Leases due conversion uploads per platform and sends each platform's share as one batch with
+    no transaction open. Every row keeps its own result: failed items are retried with jittered
+    exponential backoff until CONVERSION_UPLOAD_MAX_ATTEMPTS, while items the platform rejected
+    outright are marked failed straight away.
+    """
+
+    queue = LeasedQueue(
+        ConversionUpload,
+        pending=ConversionUploadStatusChoices.PENDING,
+        in_progress=ConversionUploadStatusChoices.IN_PROGRESS,
+        failed=ConversionUploadStatusChoices.FAILED,
+        settings_prefix='CONVERSION_UPLOAD',
+    )
+
+    def process_service(self, name: str, batch_size: int) -> int:
+        service = conversion_service.get(name)
+
+        uploads = self.queue.claim(limit=min(batch_size, service.max_batch_size), service=name)
+        if not uploads:
+            return 0
+
+        try:
+            results = service.send_conversions([upload.payload for upload in uploads])
+        except Exception as e:
+            results = [ConversionResult(ok=False, error=str(e)) for _ in uploads]
+
+        if len(results) != len(uploads):
+            logger.error(f'{name} returned {len(results)} result(s) for {len(uploads)} conversion upload(s).')
+
+        now = timezone.now()
+        for upload, result in zip(uploads, results):
+            upload.result = result.response
+
+            if result.ok:
+                upload.status = ConversionUploadStatusChoices.UPLOADED
+                upload.date_uploaded = now
+                upload.last_error = None
+            else:
+                self.queue.mark_failed_attempt(upload, result.error, retryable=result.retryable)
+
+        for upload in uploads[len(results):]:
+            self.queue.mark_failed_attempt(upload, 'missing result', retryable=True)
+
+        self.queue.release(uploads, ['result', 'date_uploaded'])
+        return len(uploads)
+
+    def run(self, batch_size: int = 500) -> int:
+        """Uploads every platform's batch at once on the conversion dispatch pool."""
+        futures = {
+            name: conversion_service.submit(self.process_service, name, batch_size)
+            for name in settings.CONVERSION_SERVICES
+        }
+
+        processed = 0
+        for name, future in futures.items():
+            try:
+                processed += future.result()
+            except Exception as e:
+                logger.error(f'Conversion uploads for {name} failed: {e}', exc_info=True)
+
+        return processed
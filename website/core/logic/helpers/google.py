@@ -0,0 +1,49 @@
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.timezone import make_aware, make_naive, is_naive
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+
+from website import settings
+
+def load_google_credentials(refresh_ahead: timedelta = timedelta(0)):
+    from core.models import GoogleAccessToken
+    token = GoogleAccessToken.objects.order_by("-date_created").first()
+    if not token:
+        raise Exception("No Google access token found in DB.")
+
+    with open(settings.GOOGLE_API_CREDENTIALS_PATH, "r") as f:
+        credentials_data = json.load(f)
+
+    client_info = credentials_data.get("installed") or credentials_data.get("web")
+    client_id = client_info.get('client_id')
+    client_secret = client_info.get('client_secret')
+
+    creds = Credentials(
+        token=token.access_token,
+        refresh_token=token.refresh_token,
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=client_id,
+        client_secret=client_secret,
+        scopes=settings.GOOGLE_API_SCOPES,
+        # google-auth compares expiry against naive UTC.
+        expiry=make_naive(token.date_expires, dt_timezone.utc),
+    )
+
+    if creds.expired or token.date_expires - timezone.now() < refresh_ahead:
+        creds.refresh(Request())
+        date_expires = creds.expiry
+        if is_naive(date_expires):
+            date_expires = make_aware(date_expires, dt_timezone.utc)
+        
+        new_token = GoogleAccessToken(
+            access_token=creds.token,
+            refresh_token=creds.refresh_token,
+            scope=",".join(creds.scopes),
+            date_expires=date_expires,
+        )
+        new_token.save()
+
+    return creds
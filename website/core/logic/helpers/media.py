@@ -0,0 +1,86 @@
+import os
+from io import BytesIO
+
+import requests
+
+from website import settings
+from core.logger import logger
+from core.logic.http.sessions import get_session
+
+# pydub and moviepy (which drags in IPython) are imported inside the converters so
+# importing this module, or core.utils, does not pay for them.
+
+class AttachmentProcessingError(Exception):
+    pass
+
+def convert_audio_format(file, target_file_path: str, to_format: str) -> BytesIO:
+    from pydub import AudioSegment
+
+    try:
+        with open(target_file_path, "wb") as tmp_file:
+            if hasattr(file, "chunks"):
+                for chunk in file.chunks():
+                    tmp_file.write(chunk)
+            else:
+                tmp_file.write(file.read())
+
+        audio = AudioSegment.from_file(target_file_path)
+        buffer = BytesIO()
+        audio.export(buffer, format=to_format, bitrate="192k")
+        buffer.seek(0)
+        return buffer
+
+    except Exception as e:
+        raise AttachmentProcessingError(f"Audio conversion failed: {str(e)}") from e
+
+    finally:
+        if os.path.exists(target_file_path):
+            os.remove(target_file_path)
+
+def convert_video_to_mp4(input_path: str, output_path: str):
+    from moviepy import VideoFileClip
+
+    clip = VideoFileClip(input_path)
+    clip.write_videofile(output_path, codec="libx264", audio_codec="aac", preset="medium", threads=2)
+    clip.close()
+
+def download_file_from_twilio(twilio_resource: str, local_file_path: str) -> None:
+        try:
+            response = get_session('twilio').get(
+                twilio_resource,
+                auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+                stream=True
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.exception(str(e), exc_info=True)
+            raise Exception(f"Failed to download file: {e}")
+
+        try:
+            with open(local_file_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+        except Exception as e:
+            logger.exception(str(e), exc_info=True)
+            raise Exception(f"Failed to save file locally: {e}")
+
+def get_content_type_from_url(url: str) -> str:
+    response = get_session('media').head(url, allow_redirects=True)
+    return response.headers.get("Content-Type")
+
+def download_file_from_url(url: str, local_file_path: str, headers: dict | None = None, params: dict | None = None,) -> None:
+    try:
+        response = get_session('media').get(url, stream=True, headers=headers, params=params)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.exception("Failed to download file", exc_info=True)
+        raise Exception(f"Failed to download file from {url}: {e}") from e
+
+    try:
+        with open(local_file_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=8192):
+                if chunk:
+                    f.write(chunk)
+    except Exception as e:
+        logger.exception("Failed to save file locally", exc_info=True)
+        raise Exception(f"Failed to save file locally at {local_file_path}: {e}") from e
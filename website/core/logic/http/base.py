@@ -3,19 +3,42 @@ import requests
 from datetime import datetime, date
 from core.models import HTTPLog
 from core.logger import logger
+from core.logic.http.capture import http_log_writer
+from core.logic.http.sessions import get_session
 
 class BaseHttpClient:
+    def __init__(self, service: str | None = None):
+        self.service = service or self.__class__.__name__
+
+    @property
+    def session(self):
+        return get_session(self.service)
+
     def request(self, method, url, payload=None, headers=None, params=None, **kwargs):
         start = time.time()
 
-        response = requests.request(
-            method=method,
-            url=url,
-            json=self._safe_serialize(payload),
-            headers=headers,
-            params=params,
-            **kwargs
-        )
+        try:
+            response = self.session.request(
+                method=method,
+                url=url,
+                json=self._safe_serialize(payload),
+                headers=headers,
+                params=params,
+                **kwargs
+            )
+        except requests.RequestException as e:
+            self.log_request(
+                method=method,
+                url=url,
+                payload=payload,
+                headers=headers,
+                params=params,
+                response=None,
+                start_time=start,
+                status_code=None,
+                error=str(e)
+            )
+            raise
 
         data = self._parse_response(response=response, url=url)
 
@@ -38,6 +61,7 @@ class BaseHttpClient:
     def log_request(self, method, url, payload, headers, params, response, start_time, status_code, error=None, retries=0):
         duration = time.time() - start_time
 
+        # Queued for the background writer, which samples successes and caps body sizes.
         try:
             log = HTTPLog(
                 method=method,
@@ -50,13 +74,12 @@ class BaseHttpClient:
                 error=error,
                 duration_seconds=round(duration, 3),
                 retries=retries,
-                service_name=self.__class__.__name__
+                service_name=self.service
             )
 
-            log.save()
+            http_log_writer.capture(log)
         except Exception as e:
-            logger.error(e, exc_info=True)
-            raise Exception('Failed to save HTTP log to DB.')
+            logger.error(f'Failed to queue HTTP log: {e}', exc_info=True)
 
     def _safe_serialize(self, value):
         if isinstance(value, (datetime, date)):
@@ -0,0 +1,65 @@
+import json
+import random
+
+from core.logger import logger
+from core.logic.queues.batch import BackgroundBatchWriter
+from core.models import HTTPLog
+from website import settings
+
+class HTTPLogWriter(BackgroundBatchWriter):
+    """
+    Records outbound API calls to HTTPLog from a background thread with bulk_create, every
+    HTTP_LOG_FLUSH_INTERVAL seconds or once HTTP_LOG_FLUSH_BATCH_SIZE rows are waiting.
+
+    Failed calls (an error, a status of 400 or above, or no response at all) are always kept;
+    successful ones are kept at HTTP_LOG_SAMPLE_RATE. JSON bodies larger than HTTP_LOG_MAX_BODY_BYTES
+    are replaced with a truncated preview. When the queue is full new rows are dropped and counted,
+    since a log row is never worth blocking the call it describes.
+    """
+
+    thread_name = 'http-log-writer'
+
+    def __init__(self):
+        super().__init__(
+            capacity=settings.HTTP_LOG_BUFFER_SIZE,
+            flush_interval=settings.HTTP_LOG_FLUSH_INTERVAL,
+            batch_size=settings.HTTP_LOG_FLUSH_BATCH_SIZE,
+        )
+
+    def capture(self, log: HTTPLog):
+        if self.should_keep(log):
+            self.put(log)
+
+    def should_keep(self, log: HTTPLog) -> bool:
+        if log.error or log.status_code is None or log.status_code >= 400:
+            return True
+
+        return random.random() < settings.HTTP_LOG_SAMPLE_RATE
+
+    def write(self, logs: list[HTTPLog], dropped: int):
+        if dropped:
+            logger.warning(f'Dropped {dropped} HTTP log(s) because the HTTP log queue was full.')
+
+        if not logs:
+            return
+
+        for log in logs:
+            self._truncate(log)
+
+        HTTPLog.objects.bulk_create(logs, batch_size=self.batch_size)
+
+    def _truncate(self, log: HTTPLog):
+        for field in ('query_params', 'payload', 'headers', 'response', 'error'):
+            value = getattr(log, field)
+            if value is None:
+                continue
+
+            body = json.dumps(value, default=str)
+            if len(body) > settings.HTTP_LOG_MAX_BODY_BYTES:
+                setattr(log, field, {
+                    'truncated': True,
+                    'size': len(body),
+                    'preview': body[:settings.HTTP_LOG_MAX_BODY_BYTES],
+                })
+
+http_log_writer = HTTPLogWriter()
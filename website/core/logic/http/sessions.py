@@ -0,0 +1,115 @@
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.logger import logger
+from website import settings
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+class CircuitBreaker:
+    """
+    Fails calls to a service fast once it has failed `failure_threshold` times in a row. After
+    `reset_timeout` seconds requests are let through again; the first failure re-opens the circuit
+    and the first success closes it.
+    """
+
+    def __init__(self, service: str, failure_threshold: int, reset_timeout: float):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def before_request(self):
+        if self.is_open:
+            raise CircuitOpenError(f'Circuit for {self.service} is open after {self.failures} consecutive failure(s).')
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f'Opening circuit for {self.service} after {self.failures} consecutive failure(s).')
+                self.opened_at = time.monotonic()
+
+class ServiceSession(requests.Session):
+    """
+    Keep-alive session for one external service. Requests get the service's default timeout unless
+    they pass their own, idempotent requests are retried with jittered backoff on 429/5xx, and a
+    circuit breaker stops calling the service while it is down.
+    """
+
+    def __init__(self, service: str, timeout):
+        super().__init__()
+        self.service = service
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(
+            service,
+            failure_threshold=settings.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.HTTP_CIRCUIT_RESET_SECONDS,
+        )
+
+        # Shared across threads, so nothing from one caller's response may leak into another's request.
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        retry = Retry(
+            total=settings.HTTP_RETRY_TOTAL,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+            backoff_jitter=settings.HTTP_RETRY_BACKOFF_JITTER,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=settings.HTTP_POOL_MAXSIZE, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        self.breaker.before_request()
+        kwargs.setdefault('timeout', self.timeout)
+
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self.breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        return response
+
+_sessions: dict[str, ServiceSession] = {}
+_lock = threading.Lock()
+
+def get_session(service: str) -> ServiceSession:
+    """Returns the process-wide session for `service`, using its HTTP_SERVICE_TIMEOUTS entry if it has one."""
+    session = _sessions.get(service)
+    if session is not None:
+        return session
+
+    with _lock:
+        if service not in _sessions:
+            timeout = settings.HTTP_SERVICE_TIMEOUTS.get(service, settings.HTTP_TIMEOUT)
+            _sessions[service] = ServiceSession(service, timeout=timeout)
+        return _sessions[service]
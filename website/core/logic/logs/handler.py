@@ -1,17 +1,86 @@
 import logging
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from core.logic.queues.batch import BackgroundBatchWriter
+
+_default_formatter = logging.Formatter()
+
+class DatabaseLogHandler(BackgroundBatchWriter, logging.Handler):
+    """
+    Write-behind handler for InternalLog. emit() only formats the record and queues it; a background
+    thread writes the queue with bulk_create every `flush_interval` seconds. Identical records within
+    a flush are stored once with their number of occurrences, so an error storm costs one row per
+    distinct error rather than one insert per record on the failing request.
+
+    When the queue is full new records are dropped and counted; the count is written as a WARNING row
+    with the next batch. close(), which logging runs at interpreter exit, writes whatever is queued.
+    """
+
+    thread_name = 'db-log-handler'
+
+    def __init__(self, level=logging.NOTSET, capacity=10000, flush_interval=2.0, batch_size=500):
+        logging.Handler.__init__(self, level)
+        BackgroundBatchWriter.__init__(self, capacity=capacity, flush_interval=flush_interval, batch_size=batch_size)
 
-class DatabaseLogHandler(logging.Handler):
     def emit(self, record):
-        from core.models import InternalLog
+        # Errors raised while writing logs must not be queued again.
+        if self.in_writer_thread:
+            return
+
         try:
-            log = InternalLog(
-                level=record.levelname,
-                message=record.getMessage(),
-                logger=record.name,
-                pathname=record.pathname,
-                lineno=record.lineno,
-                exception=self.formatException(record.exc_info) if record.exc_info else None,
+            entry = (
+                record.levelname,
+                record.getMessage(),
+                record.name,
+                record.pathname,
+                record.lineno,
+                (self.formatter or _default_formatter).formatException(record.exc_info) if record.exc_info else None,
             )
-            log.save()
+
+            self.put((entry, time.time()))
         except Exception:
-            pass
\ No newline at end of file
+            self.handleError(record)
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def report_error(self, message: str):
+        # Logging the failure would feed it back into this handler.
+        print(message, file=sys.stderr)
+
+    def write(self, items, dropped):
+        from core.models import InternalLog
+
+        counts = Counter()
+        first_seen = {}
+        for entry, created in items:
+            counts[entry] += 1
+            first_seen.setdefault(entry, created)
+
+        logs = []
+        for entry, occurrences in counts.items():
+            level, message, logger, pathname, lineno, exception = entry
+            logs.append(InternalLog(
+                level=level,
+                message=message,
+                logger=logger,
+                pathname=pathname,
+                lineno=lineno,
+                exception=exception,
+                occurrences=occurrences,
+                date_created=datetime.fromtimestamp(first_seen[entry], tz=dt_timezone.utc),
+            ))
+
+        if dropped:
+            logs.append(InternalLog(
+                level='WARNING',
+                message=f'Dropped {dropped} log record(s) because the log queue was full.',
+                logger=__name__,
+                occurrences=dropped,
+            ))
+
+        InternalLog.objects.bulk_create(logs, batch_size=self.batch_size)
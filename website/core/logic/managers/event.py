@@ -4,12 +4,14 @@ from django.urls import reverse
 from django.utils import timezone
 from website import settings
 
-from core.models import Event, EventStatus, EventStatusHistory, EventStatusChoices, EventTaskLog, LeadStatusEnum, Message, PhoneCallTranscription, User
+from core.models import Event, EventStatusHistory, EventStatusChoices, EventTaskLog, LeadStatusEnum, Message, PhoneCallTranscription, User
 from core.email import email_service
 from core.messaging import messaging_service
 from crm.utils import generate_event_pdf
 from core.ai import ai_agent
 from core.google.api import google_api_service
+from core.logic.cache.lookups import event_statuses
+from core.logic.outbox.publisher import outbox
 class InvalidTransitionError(ValidationError):
 
     """Raised when an invalid event state transition is attempted."""
@@ -65,18 +67,18 @@ class EventManager:
                 f"Cannot transition from '{current_status}' to '{new_status}'"
             )
 
-        event_status = EventStatus.objects.get(status=new_status)
+        event_status = event_statuses.get(new_status)
 
         self.event.event_status = event_status
         self.event.save(update_fields=['event_status'])
 
-        EventStatusHistory.objects.create(
+        status_change = EventStatusHistory.objects.create(
             event=self.event,
             event_status=event_status,
             user=self.user,
         )
 
-        self._run_hooks(new_status)
+        self._run_hooks(new_status, status_change)
     
     def process_background_action(self, action: str, triggered_by="cron", **kwargs):
         """Process a background action with automatic logging and error handling."""
@@ -115,12 +117,12 @@ class EventManager:
     def start_service(self):
         return self.transition_to(EventStatusChoices.IN_PROGRESS)
 
-    def _run_hooks(self, new_status):
+    def _run_hooks(self, new_status, status_change: EventStatusHistory):
         match new_status:
             case EventStatusChoices.BOOKED:
                 self._on_book()
             case EventStatusChoices.CONFIRMED:
-                self._on_confirmed()
+                self._on_confirmed(status_change)
             case EventStatusChoices.IN_PROGRESS:
                 self._on_in_progress()
             case EventStatusChoices.SERVICE_COMPLETED:
@@ -131,10 +133,25 @@ class EventManager:
         # self._send_onboarding_reminder()
         # self.transition_to(EventStatusChoices.ONBOARDING)
 
-    def _on_confirmed(self, data):
-        self._send_event_confirmation_notification()
+    def _idempotency_key(self, status_change: EventStatusHistory, side_effect: str) -> str:
+        """
+        Keys a side effect to the status change that caused it, so an event confirmed again
+        (e.g. after a reschedule) sends it again.
+        """
+        return f"event:{self.event.pk}:status-change:{status_change.pk}:{side_effect}"
+
+    def _on_confirmed(self, status_change: EventStatusHistory):
+        outbox.enqueue(
+            'event.send_confirmation_notification',
+            {'event_id': self.event.pk},
+            idempotency_key=self._idempotency_key(status_change, "confirmation-notification"),
+        )
 
-        google_api_service.create_google_calendar_event()
+        outbox.enqueue(
+            'event.create_calendar_event',
+            {'event_id': self.event.pk},
+            idempotency_key=self._idempotency_key(status_change, "calendar-event"),
+        )
 
     def _on_in_progress(self):
         print(f"Event {self.event.event_id} started at {timezone.now()}.")
@@ -260,6 +277,18 @@ class EventManager:
             html=html
         )
     
+    def _create_google_calendar_event(self):
+        address = ", ".join(part for part in [self.event.street_address, self.event.street_address_two, self.event.city, self.event.zip_code] if part)
+
+        google_api_service.create_google_calendar_event(
+            title=f"{self.event.lead.full_name} - Event",
+            start_time=self.event.start_time,
+            end_time=self.event.end_time,
+            description=self.event.special_instructions or "",
+            location=address,
+            calendar_id=settings.GOOGLE_CALENDAR_ID,
+        )
+
     def _send_lead_event_booking_notification(self):
         users_to_notify = [u.forward_phone_number for u in User.objects.filter(is_superuser=True)]
         users_to_notify.append(self.event.lead.phone_number)
@@ -278,9 +307,10 @@ class EventManager:
                 status='sent',
                 is_read=True,
             )
-            response = messaging_service.send_text_message(message)
-            message.external_id = response.sid
-            message.save()
+            outbox.send_text_message(
+                message,
+                idempotency_key=f"event:{self.event.pk}:booking-notification:{phone_number}",
+            )
 
     def _mark_service_completed(self):
         if timezone.now() > self.event.end_time:
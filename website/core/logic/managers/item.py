@@ -1,66 +1,293 @@
+import numpy as np
+
 from django.utils import timezone
 from django.db import transaction
 from django.core.exceptions import ValidationError
-from django.db.models import Sum, Case, When, IntegerField, F, Window, Min, Value
+from django.db.models import Sum, Case, When, IntegerField, F, Min, OuterRef, Subquery, Value
 from django.db.models.functions import Coalesce
 
-from core.models import Item, ItemState, ItemStateChangeHistory, ItemStateChoices, Order
+from core.models import Item, ItemAvailability, ItemStateChangeHistory, ItemStateChoices, Order
+from core.logic.cache.lookups import item_states
+
+INCREASING_STATES = [
+    ItemStateChoices.PURCHASED,
+    ItemStateChoices.RETURNED,
+]
+
+DECREASING_STATES = [
+    ItemStateChoices.RESERVED,
+    ItemStateChoices.SOLD,
+    ItemStateChoices.DECOMMISSIONED,
+]
 
 AVAILABILITY_DELTA = Case(
-    When(state__state__in=[
-        ItemStateChoices.PURCHASED,
-        ItemStateChoices.RETURNED,
-    ], then=F('quantity')),
-    When(state__state__in=[
-        ItemStateChoices.RESERVED,
-        ItemStateChoices.SOLD,
-        ItemStateChoices.DECOMMISSIONED,
-    ], then=-F('quantity')),
+    When(state__state__in=INCREASING_STATES, then=F('quantity')),
+    When(state__state__in=DECREASING_STATES, then=-F('quantity')),
     default=0,
     output_field=IntegerField(),
 )
 
+def availability_delta(state: str, quantity: int) -> int:
+    if state in INCREASING_STATES:
+        return quantity
+    if state in DECREASING_STATES:
+        return -quantity
+    return 0
+
 class ItemInventoryManager:
     """
     Ledger-based inventory manager.
     All inventory mutations MUST go through this class.
+
+    Every ledger write also updates the ItemAvailability projection, so
+    availability reads never have to scan the item's full history.
     """
 
     def __init__(self, item: Item):
         self.item = item
 
     def available_units_on_date(self, on_date):
-        result = self.item.state_changes.filter(
-            target_date__lte=on_date,
-        ).aggregate(
-            total=Sum(AVAILABILITY_DELTA)
+        available = (
+            ItemAvailability.objects
+            .filter(item=self.item, target_date__lte=on_date)
+            .order_by('-target_date')
+            .values_list('available', flat=True)
+            .first()
         )
 
-        return result['total'] or 0
+        return available or 0
 
     def available_units_for_range(self, start_date, end_date):
-        qs = (
-            self.item.state_changes
-            .filter(target_date__lte=end_date)
-            .annotate(delta=AVAILABILITY_DELTA)
+        opening = self.available_units_on_date(start_date)
+
+        lowest = (
+            ItemAvailability.objects
+            .filter(
+                item=self.item,
+                target_date__gt=start_date,
+                target_date__lte=end_date,
+            )
+            .aggregate(min_available=Min('available'))
+        )['min_available']
+
+        if lowest is None:
+            return opening
+
+        return min(opening, lowest)
+
+    @staticmethod
+    def available_units_for_items(item_ids, start_date, end_date) -> dict:
+        """
+        Range-minimum availability for many items in a single query, as {item_id: available}.
+        """
+        opening = (
+            ItemAvailability.objects
+            .filter(item=OuterRef('pk'), target_date__lte=start_date)
+            .order_by('-target_date')
+            .values('available')[:1]
+        )
+
+        lowest = (
+            ItemAvailability.objects
+            .filter(
+                item=OuterRef('pk'),
+                target_date__gt=start_date,
+                target_date__lte=end_date,
+            )
+            .order_by()
+            .values('item')
+            .annotate(min_available=Min('available'))
+            .values('min_available')
+        )
+
+        rows = (
+            Item.objects
+            .filter(pk__in=item_ids)
+            .annotate(
+                opening=Coalesce(Subquery(opening), Value(0)),
+                lowest=Subquery(lowest),
+            )
+            .values_list('pk', 'opening', 'lowest')
+        )
+
+        return {
+            pk: opening if lowest is None else min(opening, lowest)
+            for pk, opening, lowest in rows
+        }
+
+    @staticmethod
+    def availability_calendar(item_ids, start_date, end_date) -> np.ndarray:
+        """
+        Dense item x date availability matrix for [start_date, end_date], built from one
+        ledger fetch. Rows follow the order of item_ids, columns are consecutive days.
+        """
+        item_ids = list(item_ids)
+        days = (end_date - start_date).days + 1
+        matrix = np.zeros((len(item_ids), days), dtype=np.int64)
+
+        if not item_ids or days <= 0:
+            return matrix
+
+        rows = list(
+            ItemStateChangeHistory.objects
+            .filter(item__in=item_ids, target_date__lte=end_date)
+            .values('item', 'target_date')
+            .annotate(delta=Sum(AVAILABILITY_DELTA))
+            .order_by()
+            .values_list('item', 'target_date', 'delta')
+        )
+
+        if not rows:
+            return matrix
+
+        row_index = {item_id: index for index, item_id in enumerate(item_ids)}
+        ledger_items, ledger_dates, deltas = zip(*rows)
+
+        # Everything before the window collapses into the opening column.
+        columns = np.clip([(target_date - start_date).days for target_date in ledger_dates], 0, None)
+        np.add.at(matrix, ([row_index[item_id] for item_id in ledger_items], columns), deltas)
+
+        return np.cumsum(matrix, axis=1)
+
+    @classmethod
+    @transaction.atomic
+    def reserve_items(cls, order: Order, lines) -> dict:
+        """
+        Reserves many (item_id, units) pairs for the order's date range at once.
+        Items are locked in primary key order so concurrent orders cannot deadlock.
+        Returns the locked items keyed by primary key.
+        """
+        requested = {}
+        for item_id, units in lines:
+            requested[item_id] = requested.get(item_id, 0) + units
+
+        if not requested:
+            return {}
+
+        items = {
+            item.pk: item
+            for item in Item.objects.select_for_update().filter(pk__in=requested).order_by('pk')
+        }
+
+        missing = set(requested) - set(items)
+        if missing:
+            raise ValidationError(f"Items not found: {sorted(missing)}")
+
+        start_date = order.start_date.date()
+        end_date = order.end_date.date()
+        available = cls.available_units_for_items(items.keys(), start_date, end_date)
+
+        errors = [
+            f"Only {available[pk]} units of {items[pk]} available for selected dates"
+            for pk, units in requested.items()
+            if available[pk] < units
+        ]
+        if errors:
+            raise ValidationError(errors)
+
+        state = item_states.get(ItemStateChoices.RESERVED)
+
+        ItemStateChangeHistory.objects.bulk_create([
+            ItemStateChangeHistory(
+                item=items[pk],
+                order=order,
+                state=state,
+                quantity=units,
+                target_date=start_date,
+            )
+            for pk, units in requested.items()
+        ])
+
+        cls._apply_deltas(
+            {pk: -units for pk, units in requested.items()},
+            target_date=start_date,
+        )
+
+        return items
+
+    @staticmethod
+    def _apply_deltas(deltas: dict, target_date):
+        """
+        Batched form of _apply_delta for many items sharing one target_date.
+        """
+        levels = dict(
+            Item.objects
+            .filter(pk__in=deltas)
             .annotate(
-                running_total=Window(
-                    expression=Sum('delta'),
-                    order_by=F('target_date').asc(),
+                level=Coalesce(
+                    Subquery(
+                        ItemAvailability.objects
+                        .filter(item=OuterRef('pk'), target_date__lte=target_date)
+                        .order_by('-target_date')
+                        .values('available')[:1]
+                    ),
+                    Value(0),
                 )
             )
-            .filter(running_total__isnull=False)
-            .aggregate(
-                min_available=Coalesce(Min('running_total'), 0)
+            .values_list('pk', 'level')
+        )
+
+        ItemAvailability.objects.bulk_create(
+            [
+                ItemAvailability(item_id=pk, target_date=target_date, available=levels[pk])
+                for pk in deltas
+            ],
+            ignore_conflicts=True,
+        )
+
+        (
+            ItemAvailability.objects
+            .filter(item__in=deltas, target_date__gte=target_date)
+            .update(
+                available=F('available') + Case(
+                    *[When(item_id=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
             )
         )
 
-        return qs['min_available']
+    def ledger_availability(self) -> dict:
+        """
+        Recomputes the projection from the raw ledger as {target_date: available}.
+        """
+        rows = (
+            ItemStateChangeHistory.objects
+            .filter(item=self.item)
+            .values('target_date')
+            .annotate(delta=Sum(AVAILABILITY_DELTA))
+            .order_by('target_date')
+        )
+
+        projection = {}
+        running_total = 0
+        for row in rows:
+            running_total += row['delta'] or 0
+            projection[row['target_date']] = running_total
 
+        return projection
+
+    def stored_availability(self) -> dict:
+        return dict(
+            ItemAvailability.objects
+            .filter(item=self.item)
+            .order_by('target_date')
+            .values_list('target_date', 'available')
+        )
+
+    @transaction.atomic
+    def rebuild_availability(self):
+        self._lock()
+
+        ItemAvailability.objects.filter(item=self.item).delete()
+        ItemAvailability.objects.bulk_create([
+            ItemAvailability(item=self.item, target_date=target_date, available=available)
+            for target_date, available in self.ledger_availability().items()
+        ])
     
     @transaction.atomic
     def reserve_item(self, order: Order):
-        Item.objects.select_for_update().get(pk=self.item.pk)
+        self._lock()
         booked_item = order.items.filter(item=self.item).first()
         if not booked_item:
             raise ValidationError("Item not found on order")
@@ -71,34 +298,30 @@ class ItemInventoryManager:
                 f"Only {available} units available for selected dates"
             )
 
-        state = ItemState.objects.get(state=ItemStateChoices.RESERVED)
-
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            order=order,
-            state=state,
+        self._record(
+            ItemStateChoices.RESERVED,
             quantity=booked_item.units,
             target_date=order.start_date.date(),
+            order=order,
         )
     
     @transaction.atomic
     def return_items(self, order: Order, target_date):
-        Item.objects.select_for_update().get(pk=self.item.pk)
+        self._lock()
         booked_item = order.items.filter(item=self.item).first()
         if not booked_item:
             raise ValidationError("Item not found on order")
-        state = ItemState.objects.get(state=ItemStateChoices.RETURNED)
 
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            order=order,
-            state=state,
+        self._record(
+            ItemStateChoices.RETURNED,
             quantity=booked_item.units,
             target_date=target_date,
+            order=order,
         )
     
     @transaction.atomic
     def cancel_reservation(self, order: Order):
+        self._lock()
         reservation = (
             ItemStateChangeHistory.objects
             .select_for_update()
@@ -109,40 +332,34 @@ class ItemInventoryManager:
             )
         )
 
-        state = ItemState.objects.get(state=ItemStateChoices.RETURNED)
-
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            order=order,
-            state=state,
+        self._record(
+            ItemStateChoices.RETURNED,
             quantity=reservation.quantity,
             target_date=reservation.target_date,
+            order=order,
         )
     
     @transaction.atomic
     def purchase(self, quantity: int, target_date):
-        state = ItemState.objects.get(state=ItemStateChoices.PURCHASED)
-
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            state=state,
+        self._lock()
+        self._record(
+            ItemStateChoices.PURCHASED,
             quantity=quantity,
             target_date=target_date,
         )
     
     @transaction.atomic
     def decommission(self, quantity: int, target_date):
-        state = ItemState.objects.get(state=ItemStateChoices.DECOMMISSIONED)
-
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            state=state,
+        self._lock()
+        self._record(
+            ItemStateChoices.DECOMMISSIONED,
             quantity=quantity,
             target_date=target_date,
         )
     
     @transaction.atomic
     def reserve_additional_units(self, order: Order, quantity: int):
+        self._lock()
         available = self.available_units_for_range(
             order.start_date.date(),
             order.end_date.date(),
@@ -153,24 +370,55 @@ class ItemInventoryManager:
                 f"Only {available} additional units available"
             )
 
-        state = ItemState.objects.get(state=ItemStateChoices.RESERVED)
-
-        ItemStateChangeHistory.objects.create(
-            item=self.item,
-            order=order,
-            state=state,
+        self._record(
+            ItemStateChoices.RESERVED,
             quantity=quantity,
             target_date=order.start_date.date(),
+            order=order,
         )
     
     @transaction.atomic
     def release_units(self, order: Order, quantity: int):
-        state = ItemState.objects.get(state=ItemStateChoices.RETURNED)
+        self._lock()
+        self._record(
+            ItemStateChoices.RETURNED,
+            quantity=quantity,
+            target_date=timezone.now().date(),
+            order=order,
+        )
+
+    def _lock(self):
+        Item.objects.select_for_update().get(pk=self.item.pk)
+
+    def _record(self, state_choice: str, quantity: int, target_date, order: Order | None = None):
+        state = item_states.get(state_choice)
 
-        ItemStateChangeHistory.objects.create(
+        entry = ItemStateChangeHistory.objects.create(
             item=self.item,
             order=order,
             state=state,
             quantity=quantity,
-            target_date=timezone.now().date(),
-        )
\ No newline at end of file
+            target_date=target_date,
+        )
+
+        self._apply_delta(target_date, availability_delta(state_choice, quantity))
+
+        return entry
+
+    def _apply_delta(self, target_date, delta: int):
+        if delta == 0:
+            return
+
+        # Open a row at target_date carrying the level in effect before this write,
+        # then shift it and every later row by the delta.
+        ItemAvailability.objects.get_or_create(
+            item=self.item,
+            target_date=target_date,
+            defaults={'available': self.available_units_on_date(target_date)},
+        )
+
+        (
+            ItemAvailability.objects
+            .filter(item=self.item, target_date__gte=target_date)
+            .update(available=F('available') + delta)
+        )
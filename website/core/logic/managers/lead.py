@@ -8,12 +8,13 @@ from dataclasses import dataclass
 from typing import Optional
 from django.core.exceptions import ValidationError
 
-from core.models import Ad, AdCampaign, AdGroup, AdPlatform, AdPlatformChoices, ConversionTypeChoices, Event, LandingPage, LandingPageConversion, LeadMarketing, LeadMarketingMetadata, LeadStatus, LeadStatusChoices, Lead, LeadStatusHistory, Message, SessionMapping, TrackingPhoneCall, TrackingPhoneCallMetadata, TrackingTextMessage, TrackingTextMessageMetadata, User
-from core.services.conversions import conversion_service
-from core.utils import create_ad_from_params, format_text_message, get_session_data, is_google_ads_call_asset, parse_google_ads_cookie
-from core.services.messaging import messaging_service
+from core.models import Ad, AdCampaign, AdGroup, AdPlatform, AdPlatformChoices, ConversionTypeChoices, Event, LandingPage, LandingPageConversion, LeadMarketing, LeadMarketingMetadata, LeadStatusChoices, Lead, LeadStatusHistory, Message, SessionMapping, TrackingPhoneCall, TrackingPhoneCallMetadata, TrackingTextMessage, TrackingTextMessageMetadata, User
+from core.utils import create_ad_from_params, format_text_message, get_session_data, is_google_ads_call_asset
 from website import settings
 from core.logic.helpers.marketing import MarketingHelper
+from core.logic.cache.lookups import lead_statuses
+from core.logic.outbox.publisher import outbox
+from core.logic.tracking.attribution import batched_refresh, get_attribution
 from core.enums import LeadEngagementAction
 
 @dataclass
@@ -79,7 +80,7 @@ class LeadStateManager:
                 f"Cannot transition lead from '{self.current_status}' to '{status}'"
             )
 
-        lead_status = LeadStatus.objects.get(status=status)
+        lead_status = lead_statuses.get(status)
 
         LeadStatusHistory.objects.create(lead=self.lead, lead_status=lead_status)
 
@@ -104,187 +105,191 @@ class LeadStateManager:
         self.transition_to(LeadStatusChoices.EVENT_BOOKED, context=context)
     
     def handle_lead_creation_via_instant_form(self, data, entry):
-        marketing, _ = LeadMarketing.objects.get_or_create(
-                instant_form_lead_id=entry.get('leadgen_id'),
-                defaults={
-                    'lead': self.lead,
-                    'instant_form_id': data.get('form_id'),
-                }
-            )
+        with batched_refresh():
+            marketing, _ = LeadMarketing.objects.get_or_create(
+                    instant_form_lead_id=entry.get('leadgen_id'),
+                    defaults={
+                        'lead': self.lead,
+                        'instant_form_id': data.get('form_id'),
+                    }
+                )
 
-        if not data.get('is_organic'):
-            ad_platform = AdPlatform.objects.get(platform=AdPlatformChoices.FACEBOOK)
-            ad_campaign, _ = AdCampaign.objects.get_or_create(
-                ad_campaign_id=data.get('campaign_id'),
-                defaults={
-                    'name': data.get('campaign_name'),
-                    'ad_platform': ad_platform,
-                }
-            )
-            ad_group, _ = AdGroup.objects.get_or_create(
-                ad_group_id=data.get('adset_id'),
-                defaults={
-                    'name': data.get('adset_name'),
-                    'ad_campaign': ad_campaign,
-                }
-            )
-            ad, _ = Ad.objects.get_or_create(
-                ad_id=data.get('ad_id'),
-                defaults={
-                    'name': data.get('ad_name'),
-                    'ad_group': ad_group,
-                }
-            )
+            if not data.get('is_organic'):
+                ad_platform = AdPlatform.objects.get(platform=AdPlatformChoices.FACEBOOK)
+                ad_campaign, _ = AdCampaign.objects.get_or_create(
+                    ad_campaign_id=data.get('campaign_id'),
+                    defaults={
+                        'name': data.get('campaign_name'),
+                        'ad_platform': ad_platform,
+                    }
+                )
+                ad_group, _ = AdGroup.objects.get_or_create(
+                    ad_group_id=data.get('adset_id'),
+                    defaults={
+                        'name': data.get('adset_name'),
+                        'ad_campaign': ad_campaign,
+                    }
+                )
+                ad, _ = Ad.objects.get_or_create(
+                    ad_id=data.get('ad_id'),
+                    defaults={
+                        'name': data.get('ad_name'),
+                        'ad_group': ad_group,
+                    }
+                )
             
-            marketing.ad = ad
-            marketing.save()
-
-        metadata = [
-            {
-                'key': 'source',
-                'value': data.get('platform'),
-            },
-            {
-                'key': 'medium',
-                'value': 'paid',
-            },
-            {
-                'key': 'channel',
-                'value': 'social',
-            }
-        ]
-
-        for data in metadata:
-            entry = LeadMarketingMetadata(
-                key=data.get('key'),
-                value=data.get('value'),
-                lead_marketing=marketing,
-            )
-            entry.save()
+                marketing.ad = ad
+                marketing.save()
+
+            metadata = [
+                {
+                    'key': 'source',
+                    'value': data.get('platform'),
+                },
+                {
+                    'key': 'medium',
+                    'value': 'paid',
+                },
+                {
+                    'key': 'channel',
+                    'value': 'social',
+                }
+            ]
+
+            for data in metadata:
+                entry = LeadMarketingMetadata(
+                    key=data.get('key'),
+                    value=data.get('value'),
+                    lead_marketing=marketing,
+                )
+                entry.save()
         
         self.transition_to(LeadStatusChoices.LEAD_CREATED)
     
     def handle_lead_creation_via_form(self, request: HttpRequest):
-        marketing_helper = MarketingHelper(request=request)
-        lead_marketing = LeadMarketing.objects.create(lead=self.lead)
-        if not request.user.is_authenticated:
-            marketing_helper = MarketingHelper(request)
-            lead_marketing.ip = marketing_helper.ip
-            lead_marketing.external_id = marketing_helper.external_id
-            lead_marketing.user_agent = marketing_helper.user_agent
-            lead_marketing.ad = marketing_helper.ad
-            lead_marketing.save()
+        with batched_refresh():
+            marketing_helper = MarketingHelper(request=request)
+            lead_marketing = LeadMarketing.objects.create(lead=self.lead)
+            if not request.user.is_authenticated:
+                marketing_helper = MarketingHelper(request)
+                lead_marketing.ip = marketing_helper.ip
+                lead_marketing.external_id = marketing_helper.external_id
+                lead_marketing.user_agent = marketing_helper.user_agent
+                lead_marketing.ad = marketing_helper.ad
+                lead_marketing.save()
             
-            for key, value in marketing_helper.metadata.items():
-                LeadMarketingMetadata.objects.create(
-                    key=key,
-                    value=value,
-                    lead_marketing=self.lead.lead_marketing,
-                )
-            
-            lp = self.request.session.get("landing_page_id")
-            if lp:
-                landing_page = LandingPage.objects.filter(pk=lp).first()
-                if landing_page:
-                    conversion = LandingPageConversion(
-                        lead=self.lead,
-                        landing_page=landing_page,
-                    )
-                    conversion.save()
-        
-        self.transition_to(LeadStatusChoices.LEAD_CREATED)
-    
-    def handle_lead_creation_via_tracking_message(self, tracking_message: TrackingPhoneCall):
-        message_metadata = TrackingTextMessageMetadata.objects.filter(tracking_message=tracking_message)
-        metadata = message_metadata.filter(key="custom").first()
-
-        if metadata:
-            try:
-                params = json.loads(metadata.value) or {}
-
-                lp = params.get("calltrk_landing")
-                if lp:
-                    params |= dict(parse_qsl(urlparse(self.landing_page).query))(lp)
-
-                external_id = params.get(settings.TRACKING_COOKIE_NAME)
-                if external_id:
-                    session_mapping = SessionMapping.objects.filter(external_id=external_id).first()
-                    if session_mapping:
-                        session = get_session_data(session_key=session_mapping.session_key)
-
-                        self.lead.lead_marketing.ip = session.get('ip')
-                        self.lead.lead_marketing.user_agent = session.get('user_agent')
-                        self.lead.lead_marketing.external_id = external_id
-                        self.lead.lead_marketing.ad = create_ad_from_params(params=params)
-                        self.lead.lead_marketing.save()
-                        self.lead.lead_marketing.assign_visits()
-
-                        landing_page_id = session.get('landing_page_id')
-                        if landing_page_id:
-                            landing_page = LandingPage.objects.filter(pk=landing_page_id).first()
-                            if landing_page:
-                                conversion = LandingPageConversion(
-                                    lead=self.lead,
-                                    landing_page=landing_page,
-                                    conversion_type=ConversionTypeChoices.TEXT_MESSAGE
-                                )
-                                conversion.save()
-
-                for key, value in params.items():
+                for key, value in marketing_helper.metadata.items():
                     LeadMarketingMetadata.objects.create(
                         key=key,
                         value=value,
                         lead_marketing=self.lead.lead_marketing,
                     )
-            except (TypeError, json.JSONDecodeError):
-                print("Failed to load params")
+            
+                lp = self.request.session.get("landing_page_id")
+                if lp:
+                    landing_page = LandingPage.objects.filter(pk=lp).first()
+                    if landing_page:
+                        conversion = LandingPageConversion(
+                            lead=self.lead,
+                            landing_page=landing_page,
+                        )
+                        conversion.save()
+        
+        self.transition_to(LeadStatusChoices.LEAD_CREATED)
+    
+    def handle_lead_creation_via_tracking_message(self, tracking_message: TrackingPhoneCall):
+        with batched_refresh():
+            message_metadata = TrackingTextMessageMetadata.objects.filter(tracking_message=tracking_message)
+            metadata = message_metadata.filter(key="custom").first()
+
+            if metadata:
+                try:
+                    params = json.loads(metadata.value) or {}
+
+                    lp = params.get("calltrk_landing")
+                    if lp:
+                        params |= dict(parse_qsl(urlparse(self.landing_page).query))(lp)
+
+                    external_id = params.get(settings.TRACKING_COOKIE_NAME)
+                    if external_id:
+                        session_mapping = SessionMapping.objects.filter(external_id=external_id).first()
+                        if session_mapping:
+                            session = get_session_data(session_key=session_mapping.session_key)
+
+                            self.lead.lead_marketing.ip = session.get('ip')
+                            self.lead.lead_marketing.user_agent = session.get('user_agent')
+                            self.lead.lead_marketing.external_id = external_id
+                            self.lead.lead_marketing.ad = create_ad_from_params(params=params)
+                            self.lead.lead_marketing.save()
+                            self.lead.lead_marketing.assign_visits()
+
+                            landing_page_id = session.get('landing_page_id')
+                            if landing_page_id:
+                                landing_page = LandingPage.objects.filter(pk=landing_page_id).first()
+                                if landing_page:
+                                    conversion = LandingPageConversion(
+                                        lead=self.lead,
+                                        landing_page=landing_page,
+                                        conversion_type=ConversionTypeChoices.TEXT_MESSAGE
+                                    )
+                                    conversion.save()
+
+                    for key, value in params.items():
+                        LeadMarketingMetadata.objects.create(
+                            key=key,
+                            value=value,
+                            lead_marketing=self.lead.lead_marketing,
+                        )
+                except (TypeError, json.JSONDecodeError):
+                    print("Failed to load params")
 
         self.transition_to(LeadStatusChoices.LEAD_CREATED)
 
     def handle_lead_creation_via_tracking_call(self, tracking_message: TrackingTextMessage):
-        phone_call_metadata = TrackingPhoneCallMetadata.objects.filter(tracking_message=tracking_message)
-        metadata = phone_call_metadata.filter(key="custom").first()
-
-        if metadata:
-            try:
-                params = json.loads(metadata.value) or {}
-
-                lp = params.get("calltrk_landing")
-                if lp:
-                    params |= dict(parse_qsl(urlparse(self.landing_page).query))(lp)
-
-                external_id = params.get(settings.TRACKING_COOKIE_NAME)
-                if external_id:
-                    session_mapping = SessionMapping.objects.filter(external_id=external_id).first()
-                    if session_mapping:
-                        session = get_session_data(session_key=session_mapping.session_key)
-
-                        self.lead.lead_marketing.ip = session.get('ip')
-                        self.lead.lead_marketing.user_agent = session.get('user_agent')
-                        self.lead.lead_marketing.external_id = external_id
-                        self.lead.lead_marketing.ad = create_ad_from_params(params=params)
-                        self.lead.lead_marketing.save()
-                        self.lead.lead_marketing.assign_visits()
-
-                        landing_page_id = session.get('landing_page_id')
-                        if landing_page_id:
-                            landing_page = LandingPage.objects.filter(pk=landing_page_id).first()
-                            if landing_page:
-                                conversion = LandingPageConversion(
-                                    lead=self.lead,
-                                    landing_page=landing_page,
-                                    conversion_type=ConversionTypeChoices.PHONE_CALL
-                                )
-                                conversion.save()
-
-                for key, value in params.items():
-                    LeadMarketingMetadata.objects.create(
-                        key=key,
-                        value=value,
-                        lead_marketing=self.lead.lead_marketing,
-                    )
-            except (TypeError, json.JSONDecodeError):
-                print("Failed to load params")
+        with batched_refresh():
+            phone_call_metadata = TrackingPhoneCallMetadata.objects.filter(tracking_message=tracking_message)
+            metadata = phone_call_metadata.filter(key="custom").first()
+
+            if metadata:
+                try:
+                    params = json.loads(metadata.value) or {}
+
+                    lp = params.get("calltrk_landing")
+                    if lp:
+                        params |= dict(parse_qsl(urlparse(self.landing_page).query))(lp)
+
+                    external_id = params.get(settings.TRACKING_COOKIE_NAME)
+                    if external_id:
+                        session_mapping = SessionMapping.objects.filter(external_id=external_id).first()
+                        if session_mapping:
+                            session = get_session_data(session_key=session_mapping.session_key)
+
+                            self.lead.lead_marketing.ip = session.get('ip')
+                            self.lead.lead_marketing.user_agent = session.get('user_agent')
+                            self.lead.lead_marketing.external_id = external_id
+                            self.lead.lead_marketing.ad = create_ad_from_params(params=params)
+                            self.lead.lead_marketing.save()
+                            self.lead.lead_marketing.assign_visits()
+
+                            landing_page_id = session.get('landing_page_id')
+                            if landing_page_id:
+                                landing_page = LandingPage.objects.filter(pk=landing_page_id).first()
+                                if landing_page:
+                                    conversion = LandingPageConversion(
+                                        lead=self.lead,
+                                        landing_page=landing_page,
+                                        conversion_type=ConversionTypeChoices.PHONE_CALL
+                                    )
+                                    conversion.save()
+
+                    for key, value in params.items():
+                        LeadMarketingMetadata.objects.create(
+                            key=key,
+                            value=value,
+                            lead_marketing=self.lead.lead_marketing,
+                        )
+                except (TypeError, json.JSONDecodeError):
+                    print("Failed to load params")
 
         self.transition_to(LeadStatusChoices.LEAD_CREATED)
     
@@ -292,7 +297,10 @@ class LeadStateManager:
 
         self.lead.engagement_manager.initiate_contact()
         
-        self.lead.actions.send_automated_message(LeadEngagementAction.INTIATE_CONTACT)
+        self.lead.actions.queue_automated_message(
+            LeadEngagementAction.INTIATE_CONTACT,
+            idempotency_key=f"lead:{self.lead.pk}:initial-contact",
+        )
 
         if settings.DEBUG:
             return
@@ -317,10 +325,10 @@ class LeadStateManager:
                 status='sent',
                 is_read=True,
             )
-            resp = messaging_service.send_text_message(message=message)
-            message.external_id = resp.sid
-            message.status = resp.status
-            message.save()
+            outbox.send_text_message(
+                message,
+                idempotency_key=f"lead:{self.lead.pk}:created-notification:{user.pk}",
+            )
 
         # Do not report conversions for call asset calls
         phone_call = self.lead.phone_calls().filter(is_inbound=True).last()
@@ -330,28 +338,29 @@ class LeadStateManager:
         # Report Conversion
         data = self._create_data_dict(LeadStatusChoices.LEAD_CREATED)
 
-        conversion_service.send_conversion(data=data)
+        outbox.send_conversion(data, idempotency_key=f"conversion:{LeadStatusChoices.LEAD_CREATED}:{self.lead.pk}")
         
     def _on_invoice_sent(self, context: LeadTransitionContext):
         pass
 
     def _on_event_booked(self, context: LeadTransitionContext):
         data = self._create_data_dict(LeadStatusChoices.EVENT_BOOKED, event=context.event)
-        conversion_service.send_conversion(data=data)
+        outbox.send_conversion(data, idempotency_key=f"conversion:{LeadStatusChoices.EVENT_BOOKED}:{self.lead.pk}:{data.get('event_id')}")
 
     def _on_archived(self, context: LeadTransitionContext):
         pass
 
     def _create_data_dict(self, event_name=None, event=None):
+        lead_marketing = self.lead.lead_marketing
         data = {
             'event_name': event_name,
-            'ip_address': self.lead.lead_marketing.ip,
-            'user_agent': self.lead.lead_marketing.user_agent,
-            'instant_form_lead_id': self.lead.lead_marketing.instant_form_lead_id,
+            'ip_address': lead_marketing.ip,
+            'user_agent': lead_marketing.user_agent,
+            'instant_form_lead_id': lead_marketing.instant_form_lead_id,
             'event_time': int(timezone.now().timestamp()),
             'phone_number': self.lead.phone_number,
             'lead_id': self.lead.pk,
-            'external_id': str(self.lead.lead_marketing.external_id)
+            'external_id': str(lead_marketing.external_id)
         }
 
         if event_name == LeadStatusChoices.EVENT_BOOKED and event:
@@ -360,26 +369,7 @@ class LeadStateManager:
                 'value': event.amount,
             })
 
-        for metadata in self.lead.lead_marketing.metadata.all():
-            if metadata.key == '_fbc':
-                data['fbc'] = metadata.value
-            elif metadata.key == '_fbp':
-                data['fbp'] = metadata.value
-            elif metadata.key == '_ga':
-                data['ga'] = metadata.value
-            elif metadata.key == 'gclid':
-                data['gclid'] = metadata.value
-            elif metadata.key == 'gbraid':
-                data['gbraid'] = metadata.value
-            elif metadata.key == 'wbraid':
-                data['wbraid'] = metadata.value
-            elif metadata.key == '_gcl_aw':
-                if 'gclid' not in data:
-                    cookie_click_id = parse_google_ads_cookie(metadata.value)
-                    if cookie_click_id:
-                        data['gclid'] = cookie_click_id
-            else:
-                data[metadata.key] = metadata.value
+        data.update(get_attribution(lead_marketing).conversion_data())
             
         return data
     
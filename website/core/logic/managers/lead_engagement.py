@@ -10,7 +10,7 @@ from core.models import (
     LeadEngagementHistory,
     LeadEngagementStateChoices,
 )
-from core.enums import EngagementAction, FollowUpVariant
+from core.enums import LeadEngagementAction, FollowUpVariant
 
 ENGAGEMENT_TIMEOUTS = {
     LeadEngagementStateChoices.FIRST_CONTACT: timedelta(hours=24),
@@ -38,6 +38,7 @@ class LeadEngagementManager:
             LeadEngagementStateChoices.RESPONDED,
         },
         LeadEngagementStateChoices.FOLLOW_UP_2: {
+            LeadEngagementStateChoices.FIRST_CONTACT,
             LeadEngagementStateChoices.RESPONDED,
             LeadEngagementStateChoices.NO_RESPONSE,
         },
@@ -51,8 +52,11 @@ class LeadEngagementManager:
         LeadEngagementStateChoices.NO_RESPONSE,
     }
 
-    def __init__(self, lead: Lead):
+    def __init__(self, lead: Lead, engagement: LeadEngagementState | None = None, locked: bool = False):
         self.lead = lead
+        self._engagement = engagement
+        self._locked = locked and engagement is not None
+        self.last_history: LeadEngagementHistory | None = None
 
     def _get_or_create_state(self) -> LeadEngagementState:
         state, _ = LeadEngagementState.objects.get_or_create(
@@ -61,9 +65,29 @@ class LeadEngagementManager:
         )
         return state
 
+    def _lock_engagement(self) -> LeadEngagementState:
+        """
+        Re-reads the engagement row with a row lock, once per manager. Must be called inside
+        the operation's transaction; every later read in that operation uses the cached row.
+        """
+        if self._locked:
+            return self._engagement
+
+        if self._engagement is None:
+            self._engagement = self._get_or_create_state()
+
+        self._engagement = LeadEngagementState.objects.select_for_update().get(pk=self._engagement.pk)
+        self._locked = True
+        return self._engagement
+
+    def _save(self, *fields: str):
+        self.engagement.save(update_fields=["state", "date_updated", *fields])
+
     @property
     def engagement(self) -> LeadEngagementState:
-        return self._get_or_create_state()
+        if self._engagement is None:
+            self._engagement = self._get_or_create_state()
+        return self._engagement
 
     @property
     def current_state(self) -> LeadEngagementStateChoices:
@@ -84,7 +108,7 @@ class LeadEngagementManager:
             )
 
     def _record_history(self, from_state, to_state, triggered_by):
-        LeadEngagementHistory.objects.create(
+        self.last_history = LeadEngagementHistory.objects.create(
             lead=self.lead,
             from_state=from_state,
             to_state=to_state,
@@ -110,6 +134,8 @@ class LeadEngagementManager:
     
     @transaction.atomic
     def initiate_contact(self, triggered_by="system"):
+        self._lock_engagement()
+
         if self.current_state != LeadEngagementStateChoices.IDLE:
             raise InvalidEngagementTransition(
                 f"Cannot start contact from {self.current_state}"
@@ -117,10 +143,12 @@ class LeadEngagementManager:
         self.engagement.last_contacted_at = timezone.now()
         self.engagement.follow_up_attempts = 0
         self._transition_to(LeadEngagementStateChoices.FIRST_CONTACT, triggered_by=triggered_by)
-        self.engagement.save()
+        self._save("last_contacted_at", "follow_up_attempts")
     
     @transaction.atomic
     def send_follow_up(self, triggered_by="system"):
+        self._lock_engagement()
+
         if self.current_state not in (
             LeadEngagementStateChoices.FIRST_CONTACT,
             LeadEngagementStateChoices.FOLLOW_UP_1,
@@ -142,10 +170,12 @@ class LeadEngagementManager:
         )
 
         self._transition_to(next_state, triggered_by=triggered_by)
-        self.engagement.save()
+        self._save("last_contacted_at", "follow_up_attempts")
     
     @transaction.atomic
     def record_response(self, source="unknown"):
+        self._lock_engagement()
+
         if self.current_state == LeadEngagementStateChoices.RESPONDED:
             return
 
@@ -153,10 +183,12 @@ class LeadEngagementManager:
         self.engagement.follow_up_attempts = 0
         self.engagement.retry_cycles = 0
         self._transition_to(LeadEngagementStateChoices.RESPONDED, triggered_by=source)
-        self.engagement.save()
+        self._save("last_responded_at", "follow_up_attempts", "retry_cycles")
     
     @transaction.atomic
     def mark_no_response(self, triggered_by="system"):
+        self._lock_engagement()
+
         if self.current_state != LeadEngagementStateChoices.FOLLOW_UP_2:
             raise InvalidEngagementTransition(
                 "No-response only valid after second follow-up"
@@ -167,54 +199,56 @@ class LeadEngagementManager:
 
         if self.engagement.retry_cycles >= MAX_RETRIES:
             self._transition_to(LeadEngagementStateChoices.NO_RESPONSE, triggered_by=triggered_by)
-            self.engagement.save()
+            self._save("retry_cycles", "follow_up_attempts")
             self.lead.manager.archive(source="engagement_timeout")
             return
 
         self.engagement.last_contacted_at = timezone.now()
         self._transition_to(LeadEngagementStateChoices.FIRST_CONTACT, triggered_by=triggered_by)
-        self.engagement.save()
+        self._save("retry_cycles", "follow_up_attempts", "last_contacted_at")
     
     def is_paused(self) -> bool:
         paused_until = self.engagement.paused_until
-        return paused_until is None or paused_until > timezone.now()
+        return paused_until is not None and paused_until > timezone.now()
     
-    def evaluate_time_based_transitions(self) -> EngagementAction:
+    def evaluate_time_based_transitions(self) -> tuple[LeadEngagementAction, FollowUpVariant | None]:
         now = timezone.now()
         state = self.current_state
 
         if self.is_paused():
-            return EngagementAction.NONE
+            return LeadEngagementAction.NONE, None
 
         if state in self.TERMINAL_STATES:
-            return EngagementAction.NONE
+            return LeadEngagementAction.NONE, None
 
         timeout = ENGAGEMENT_TIMEOUTS.get(state)
         if not timeout:
-            return EngagementAction.NONE
+            return LeadEngagementAction.NONE, None
 
         last_contact = self.engagement.last_contacted_at
         if not last_contact:
-            return EngagementAction.NONE
+            return LeadEngagementAction.NONE, None
 
         if now - last_contact < timeout:
-            return EngagementAction.NONE
+            return LeadEngagementAction.NONE, None
 
-        if state in (
-            LeadEngagementStateChoices.FIRST_CONTACT,
-            LeadEngagementStateChoices.FOLLOW_UP_1,
-        ):
+        if state == LeadEngagementStateChoices.FIRST_CONTACT:
+            self.send_follow_up(triggered_by="timeout")
+            return LeadEngagementAction.SEND_FOLLOW_UP, FollowUpVariant.FIRST
+
+        elif state == LeadEngagementStateChoices.FOLLOW_UP_1:
             self.send_follow_up(triggered_by="timeout")
-            return EngagementAction.SEND_FOLLOW_UP, FollowUpVariant.FIRST
+            return LeadEngagementAction.SEND_FOLLOW_UP, FollowUpVariant.SECOND
 
         elif state == LeadEngagementStateChoices.FOLLOW_UP_2:
             self.mark_no_response(triggered_by="timeout")
-            return EngagementAction.SEND_FOLLOW_UP, FollowUpVariant.SECOND
+            return LeadEngagementAction.MARK_NO_RESPONSE, None
 
-        return EngagementAction.NONE
+        return LeadEngagementAction.NONE, None
     
     @transaction.atomic
     def pause_on_inbound(self, source="inbound"):
+        self._lock_engagement()
         self.engagement.paused_until = None
         self.engagement.save(update_fields=["paused_until"])
         self.record_response(source=source)
\ No newline at end of file
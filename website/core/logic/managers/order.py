@@ -8,12 +8,14 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 from website import settings
 
-from core.email import email_service
-from core.models import AddedOrRemoveActionChoices, DriverRoute, DriverStop, DriverStopStatus, DriverStopStatusChangeHistory, DriverStopStatusChoices, Item, Lead, LeadStatusEnum, Message, OrderAddressTypeChoices, OrderItem, OrderItemChangeHistory, OrderService, OrderServiceChangeHistory, OrderStatus, OrderStatusChangeHistory, OrderStatusChoices, OrderTask, OrderTaskChoice, OrderTaskChoices, OrderTaskStatusChangeHistory, OrderTaskStatus, OrderTaskStatusChoices, PhoneCallTranscription, RouteZone, Service, User, UserRoleChoices
+from core.models import AddedOrRemoveActionChoices, DriverRoute, DriverStop, DriverStopStatusChangeHistory, DriverStopStatusChoices, Item, Lead, LeadStatusEnum, Message, OrderAddressTypeChoices, Order, OrderItem, OrderItemChangeHistory, OrderService, OrderServiceChangeHistory, OrderStatusChangeHistory, OrderStatusChoices, OrderTask, OrderTaskChoices, OrderTaskStatusChangeHistory, OrderTaskStatus, OrderTaskStatusChoices, PhoneCallTranscription, RouteZone, Service, User, UserRoleChoices
 from core.messaging import messaging_service
 from core.ai import ai_agent
 from core.delivery import delivery_service
 from core.managers.order_task import OrderTaskManager
+from core.logic.managers.item import ItemInventoryManager
+from core.logic.cache.lookups import driver_stop_statuses, order_statuses, order_task_choices
+from core.logic.outbox.publisher import outbox
 
 @dataclass
 class TransitionContext:
@@ -22,6 +24,7 @@ class TransitionContext:
     driver_stop: Optional[DriverStop] = None
     source: str = "system"
     metadata: Dict[str, Any] = field(default_factory=dict)
+    status_change: Optional[OrderStatusChangeHistory] = None
 
 class InvalidOrderTransitionError(ValidationError):
     """Raised when an invalid order state transition is attempted."""
@@ -127,36 +130,66 @@ class OrderManager:
     def transition_to(self, new_status: str, context: TransitionContext | None = None):
         context = context or TransitionContext()
 
+        self._lock_current_status()
+
         if self.order.current_status and not self.can_transition_to(new_status):
             raise InvalidOrderTransitionError(
                 f"Cannot transition order {self.order.code} "
                 f"from '{self.order.current_status}' to '{new_status}'"
             )
 
-        status = OrderStatus.objects.get(status=new_status)
+        status = order_statuses.get(new_status)
 
-        OrderStatusChangeHistory.objects.create(
+        context.status_change = OrderStatusChangeHistory.objects.create(
             order=self.order,
             status=status,
             user=context.user,
         )
 
+        self._set_current_status(new_status)
+
         self._run_hooks(new_status, context)
     
     @transaction.atomic
     def _force_transition(self, new_status: str, context: TransitionContext | None = None):
         context = context or TransitionContext()
 
-        status = OrderStatus.objects.get(status=new_status)
+        self._lock_current_status()
+
+        status = order_statuses.get(new_status)
 
-        OrderStatusChangeHistory.objects.create(
+        context.status_change = OrderStatusChangeHistory.objects.create(
             order=self.order,
             status=status,
             user=context.user,
             lead=context.lead,
         )
 
+        self._set_current_status(new_status)
+
         self._run_hooks(new_status, context)
+
+    def _idempotency_key(self, context: TransitionContext, side_effect: str) -> str:
+        """
+        Keys a side effect to the status change that caused it, so an order entering the same
+        status again (e.g. READY_FOR_DISPATCH after a failed delivery) sends it again.
+        """
+        return f"order:{self.order.pk}:status-change:{context.status_change.pk}:{side_effect}"
+
+    def _lock_current_status(self):
+        """
+        Locks the order row and re-reads its stored status, so concurrent transitions are serialized.
+        """
+        self.order.current_status = (
+            Order.objects
+            .select_for_update()
+            .values_list("current_status", flat=True)
+            .get(pk=self.order.pk)
+        )
+
+    def _set_current_status(self, new_status: str):
+        self.order.current_status = new_status
+        self.order.save(update_fields=["current_status"])
     
     @transaction.atomic
     def update_order_items(self, updated_items: list[dict], user: User):
@@ -188,14 +221,10 @@ class OrderManager:
         items = items or []
         services = services or []
 
-        for each in items:
-            item = each.get('item')
-            units = each.get('units')
-            self.add_item(
-                item_id=item.pk,
-                units=units,
-                user=user,
-            )
+        self._add_items(
+            [(each.get('item').pk, each.get('units')) for each in items],
+            user=user,
+        )
 
         for each in services:
             service = each.get('service')
@@ -329,12 +358,12 @@ class OrderManager:
         self.order.lead.change_lead_status(LeadStatusEnum.EVENT_BOOKED, event=self.order)
         
         # Alert client
-        self._send_order_placed_confirmation_email()
+        self._send_order_placed_confirmation_email(context)
         
         # Transition to next step
         self.mark_awaiting_preparation()
 
-    def _send_order_placed_confirmation_email(self):
+    def _send_order_placed_confirmation_email(self, context: TransitionContext):
         html = render_to_string(
             "emails/order_placed_confirmation.html",
             {
@@ -346,10 +375,11 @@ class OrderManager:
             }
         )
 
-        email_service.send_html_email(
+        outbox.send_html_email(
             to=self.order.contact.email,
             subject=f"{settings.COMPANY_NAME} -  Order Confirmation Code: {self.order.code}",
             html=html,
+            idempotency_key=self._idempotency_key(context, "placed-email"),
         )
 
     def _on_cancel_order(self, context: TransitionContext):
@@ -359,9 +389,9 @@ class OrderManager:
             item.inventory.cancel_reservation(order=self.order)
 
         # Alert client
-        self._send_order_cancelled_confirmation_email()
+        self._send_order_cancelled_confirmation_email(context)
         
-    def _send_order_cancelled_confirmation_email(self):
+    def _send_order_cancelled_confirmation_email(self, context: TransitionContext):
         html = render_to_string(
             "emails/order_cancelled_confirmation.html",
             {
@@ -373,16 +403,17 @@ class OrderManager:
             }
         )
 
-        email_service.send_html_email(
+        outbox.send_html_email(
             to=self.order.contact.email,
             subject=f"{settings.COMPANY_NAME} -  Order Confirmation Code: {self.order.code}",
             html=html,
+            idempotency_key=self._idempotency_key(context, "cancelled-email"),
         )
-    
+
     def _on_awaiting_preparation(self, context: TransitionContext):
         user = self._find_warehouse_user_for_task()
 
-        task = OrderTaskChoice.objects.get(task=OrderTaskChoices.LOAD_ORDER_ITEMS)
+        task = order_task_choices.get(OrderTaskChoices.LOAD_ORDER_ITEMS)
 
         order_task = OrderTask.objects.create(
             task=task,
@@ -398,7 +429,7 @@ class OrderManager:
             # self._add_driver_stop_to_route(OrderAddressTypeChoices.DELIVERY)
 
             # notify user that truck will be arriving at X - Y time window
-            self._send_order_ready_for_dispatch_email()
+            self._send_order_ready_for_dispatch_email(context)
         else:
             self._send_order_ready_for_pickup_email()
 
@@ -409,7 +440,7 @@ class OrderManager:
 
         self._send_user_dispatch_with_live_tracking_link()
 
-        driver_stop_status = DriverStopStatus.objects.get(status=DriverStopStatusChoices.OUT_FOR_DELIVERY)
+        driver_stop_status = driver_stop_statuses.get(DriverStopStatusChoices.OUT_FOR_DELIVERY)
 
         DriverStopStatusChangeHistory.objects.create(
             driver_stop=driver_stop,
@@ -423,7 +454,7 @@ class OrderManager:
 
         self._send_delivery_failed_notification_email()
 
-        driver_stop_status = DriverStopStatus.objects.get(status=DriverStopStatusChoices.DELIVERY_FAILED)
+        driver_stop_status = driver_stop_statuses.get(DriverStopStatusChoices.DELIVERY_FAILED)
 
         DriverStopStatusChangeHistory.objects.create(
             driver_stop=driver_stop,
@@ -444,7 +475,7 @@ class OrderManager:
 
         self._send_user_delivery_confirmation()
 
-        status = DriverStopStatus.objects.get(status=DriverStopStatusChoices.COMPLETED)
+        status = driver_stop_statuses.get(DriverStopStatusChoices.COMPLETED)
 
         DriverStopStatusChangeHistory.objects.create(
             driver_stop=driver_stop,
@@ -458,9 +489,7 @@ class OrderManager:
 
         self._send_user_pick_up_confirmation()
 
-        status = DriverStopStatus.objects.get(
-            status=DriverStopStatusChoices.COMPLETED
-        )
+        status = driver_stop_statuses.get(DriverStopStatusChoices.COMPLETED)
 
         DriverStopStatusChangeHistory.objects.create(
             driver_stop=driver_stop,
@@ -500,7 +529,11 @@ class OrderManager:
                 target_date=timezone.now().date(),
             )
 
-        self._send_review_request()
+        outbox.enqueue(
+            'order.send_review_request',
+            {'order_id': self.order.pk},
+            idempotency_key=self._idempotency_key(context, "review-request"),
+        )
 
     def _send_review_request(self):
         review_link = "https://g.page/r/CQaxh0zJ4KNwEAE/review"
@@ -610,6 +643,36 @@ class OrderManager:
 
         return order_item
     
+    def _add_items(self, lines: list[tuple[int, int]], user: User):
+        """
+        Bulk form of _add_item: reserves every (item_id, units) line with a fixed number of queries.
+        """
+        items = ItemInventoryManager.reserve_items(order=self.order, lines=lines)
+
+        order_items = OrderItem.objects.bulk_create([
+            OrderItem(
+                order=self.order,
+                item=items[item_id],
+                units=units,
+                price_per_unit=items[item_id].price,
+            )
+            for item_id, units in lines
+        ])
+
+        OrderItemChangeHistory.objects.bulk_create([
+            OrderItemChangeHistory(
+                user=user,
+                order=self.order,
+                item=items[item_id],
+                action=AddedOrRemoveActionChoices.ADDED,
+                units=units,
+                price_per_unit=items[item_id].price,
+            )
+            for item_id, units in lines
+        ])
+
+        return order_items
+
     def _sync_order_items(self, updated_items: list[dict], user: User):
         """
         updated_items = [{"item_id": int, "units": int}]
@@ -846,7 +909,7 @@ class OrderManager:
 
         return qs.values_list("pk", flat=True).first()
     
-    def _send_order_ready_for_dispatch_email(self):
+    def _send_order_ready_for_dispatch_email(self, context: TransitionContext):
         eta = self._get_delivery_eta()
         html = render_to_string(
             "emails/order_placed_confirmation.html",
@@ -861,10 +924,11 @@ class OrderManager:
             }
         )
 
-        email_service.send_html_email(
+        outbox.send_html_email(
             to=self.order.contact.email,
             subject=f"{settings.COMPANY_NAME} – Your Order Is Scheduled for Delivery ({self.order.code})",
             html=html,
+            idempotency_key=self._idempotency_key(context, "ready-for-dispatch-email"),
         )
     
     def _get_delivery_eta(self):
@@ -4,8 +4,9 @@ from dataclasses import dataclass
 from django.db import transaction
 from django.template.loader import render_to_string
 
-from core.models import OrderTask, OrderTaskChoices, OrderTaskStatus, OrderTaskStatusChoices, User, Order, OrderTaskStatusChangeHistory
-from core.email import email_service
+from core.models import OrderTask, OrderTaskChoices, OrderTaskStatusChoices, User, Order, OrderTaskStatusChangeHistory
+from core.logic.cache.lookups import order_task_statuses
+from core.logic.outbox.publisher import outbox
 from website import settings
 
 class InvalidTaskTransitionError(ValidationError):
@@ -78,7 +79,7 @@ class OrderTaskManager:
                 f"Cannot transition task from '{self.current_status}' to '{new_status}'"
             )
 
-        status = OrderTaskStatus.objects.get(status=new_status)
+        status = order_task_statuses.get(new_status)
 
         log = OrderTaskStatusChangeHistory.objects.create(
             order_task=self.order_task,
@@ -111,7 +112,7 @@ class OrderTaskManager:
             case OrderTaskChoices.LOAD_ORDER_ITEMS:
                 self.order_task.order.manager.mark_ready_for_dispatch(context.user)
             case OrderTaskChoices.PREPARE_PICKUP_ORDER_ITEMS:
-                
+                pass
             case OrderTaskChoices.UNLOAD_ORDER_ITEMS:
                 self.order_task.order.manager.finalize()
 
@@ -144,7 +145,7 @@ class OrderTaskManager:
             }
         )
 
-        email_service.send_html_email(
+        outbox.send_html_email(
             to=self.order_task.user.email,
             subject=f"Tasked Assigned for Order: {self.order_task.order.code}",
             html=html,
@@ -0,0 +1,132 @@
+import mimetypes
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+from django.core.files import File
+from website import settings
+
+from core.models import Message, MessageMedia
+from core.services.messaging.utils import MIME_EXTENSION_MAP
+from core.utils import create_generic_file_name
+from core.logic.media.sources import MediaSource
+from core.logic.http.sessions import get_session
+
+class InboundMediaPipeline:
+    """
+    Stores inbound MMS attachments on MessageMedia.
+
+    Images and other passthrough types are streamed from the provider straight into a multipart
+    S3 upload. Audio and video are downloaded into a per-job temp directory and transcoded on a
+    shared process pool capped at MEDIA_TRANSCODE_WORKERS, then streamed from disk to S3.
+    """
+
+    def __init__(self):
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def process(self, message: Message, media_url: str, content_type: str | None, source: str) -> MessageMedia:
+        from core.logic.media.transcode import transcode_audio, transcode_video
+
+        if not content_type:
+            content_type = self._head_content_type(media_url, source)
+
+        if content_type.startswith("audio/"):
+            return self._transcode(message, media_url, content_type, source, transcode_audio, ".mp3", "audio/mpeg")
+
+        if content_type.startswith("video/"):
+            return self._transcode(message, media_url, content_type, source, transcode_video, ".mp4", "video/mp4", preset=settings.MEDIA_VIDEO_PRESET)
+
+        return self._passthrough(message, media_url, content_type, source)
+
+    def _passthrough(self, message, media_url, content_type, source) -> MessageMedia:
+        file_name = create_generic_file_name(content_type, self._extension(content_type))
+
+        with self._open_stream(media_url, source) as response:
+            response.raw.decode_content = True
+            media = MessageMedia(message=message, content_type=content_type)
+            media.file.save(file_name, File(response.raw, name=file_name))
+
+        return media
+
+    def _transcode(self, message, media_url, content_type, source, transcoder, target_ext, target_content_type, **options) -> MessageMedia:
+        os.makedirs(settings.UPLOADS_URL, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=settings.UPLOADS_URL, prefix="media-") as job_dir:
+            source_path = os.path.join(job_dir, "source" + self._extension(content_type))
+            target_name = create_generic_file_name(content_type, target_ext)
+            target_path = os.path.join(job_dir, target_name)
+
+            with self._open_stream(media_url, source) as response, open(source_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+
+            pool = self._get_pool()
+            future = pool.submit(transcoder, source_path, target_path, **options)
+
+            try:
+                future.result(timeout=settings.MEDIA_TRANSCODE_TIMEOUT)
+            except TimeoutError:
+                self._discard_pool(pool)
+                raise
+
+            with open(target_path, "rb") as f:
+                media = MessageMedia(message=message, content_type=target_content_type)
+                media.file.save(target_name, File(f, name=target_name))
+
+        return media
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers only import the Django-free transcode module.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=settings.MEDIA_TRANSCODE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """
+        Kills a pool whose job overran MEDIA_TRANSCODE_TIMEOUT. A running job can't be cancelled, so its
+        worker is killed before the caller's temp directory is removed; other jobs on the pool fail with
+        BrokenProcessPool and are retried by the outbox. The next job starts a fresh pool.
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+
+        processes = list((pool._processes or {}).values())
+        for process in processes:
+            process.kill()
+        for process in processes:
+            process.join()
+
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _open_stream(self, media_url: str, source: str) -> requests.Response:
+        response = get_session(source).get(media_url, stream=True, timeout=30, **self._credentials(source))
+        response.raise_for_status()
+        return response
+
+    def _head_content_type(self, media_url: str, source: str) -> str:
+        response = get_session(source).head(media_url, allow_redirects=True, timeout=30, **self._credentials(source))
+        return response.headers.get("Content-Type", "application/octet-stream").split(";")[0]
+
+    def _credentials(self, source: str) -> dict:
+        if source == MediaSource.TWILIO:
+            return {"auth": (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)}
+
+        if source == MediaSource.CALLRAIL:
+            return {"headers": {"Authorization": f"Token token={settings.CALL_RAIL_API_KEY}"}}
+
+        return {}
+
+    @staticmethod
+    def _extension(content_type: str) -> str:
+        return mimetypes.guess_extension(content_type) or MIME_EXTENSION_MAP.get(content_type, ".bin")
+
+inbound_media_pipeline = InboundMediaPipeline()
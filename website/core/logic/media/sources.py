@@ -0,0 +1,4 @@
+class MediaSource:
+    """Providers inbound media is downloaded from; each needs its own credentials."""
+    TWILIO = 'twilio'
+    CALLRAIL = 'callrail'
@@ -0,0 +1,24 @@
+"""
+Transcoding entry points for the media pipeline's process pool. Kept free of Django imports so
+spawned worker processes can load them without configuring settings.
+"""
+
+# pydub and moviepy (which drags in IPython) are imported inside the transcoders so only the
+# pool's worker processes pay for them.
+
+def transcode_audio(source_path: str, target_path: str, to_format: str = "mp3", bitrate: str = "192k") -> str:
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(source_path)
+    audio.export(target_path, format=to_format, bitrate=bitrate)
+    return target_path
+
+def transcode_video(source_path: str, target_path: str, preset: str = "veryfast", threads: int = 2) -> str:
+    from moviepy import VideoFileClip
+
+    clip = VideoFileClip(source_path)
+    try:
+        clip.write_videofile(target_path, codec="libx264", audio_codec="aac", preset=preset, threads=threads, logger=None)
+    finally:
+        clip.close()
+    return target_path
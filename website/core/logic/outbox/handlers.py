@@ -0,0 +1,71 @@
+from typing import Callable
+
+from core.models import Event, Message, Order
+from core.services.email import email_service
+from core.services.messaging import messaging_service
+
+OutboxHandler = Callable[[dict], None]
+
+registry: dict[str, OutboxHandler] = {}
+
+def register(action: str):
+    def decorator(func: OutboxHandler) -> OutboxHandler:
+        registry[action] = func
+        return func
+    return decorator
+
+@register('email.send_html')
+def send_html_email(payload: dict):
+    email_service.send_html_email(
+        to=payload['to'],
+        subject=payload['subject'],
+        html=payload['html'],
+    )
+
+@register('messaging.send_text')
+def send_text_message(payload: dict):
+    message = Message(**payload)
+    response = messaging_service.send_text_message(message)
+    message.external_id = response.sid
+    message.status = getattr(response, 'status', None) or message.status
+    message.save()
+
+@register('conversions.send')
+def send_conversion(payload: dict):
+    # Messages recorded before conversions moved to their own queue.
+    from core.logic.conversions.queue import conversion_queue
+
+    conversion_queue.enqueue(payload)
+
+@register('media.process_inbound')
+def process_inbound_media(payload: dict):
+    from core.logic.media.pipeline import inbound_media_pipeline
+
+    message = Message.objects.get(pk=payload['message_id'])
+    inbound_media_pipeline.process(
+        message,
+        media_url=payload['media_url'],
+        content_type=payload['content_type'],
+        source=payload['source'],
+    )
+
+@register('order.send_review_request')
+def send_order_review_request(payload: dict):
+    from core.logic.managers.order import OrderManager
+
+    order = Order.objects.get(pk=payload['order_id'])
+    OrderManager(order)._send_review_request()
+
+@register('event.send_confirmation_notification')
+def send_event_confirmation_notification(payload: dict):
+    from core.logic.managers.event import EventManager
+
+    event = Event.objects.get(pk=payload['event_id'])
+    EventManager(event)._send_event_confirmation_notification()
+
+@register('event.create_calendar_event')
+def create_event_calendar_event(payload: dict):
+    from core.logic.managers.event import EventManager
+
+    event = Event.objects.get(pk=payload['event_id'])
+    EventManager(event)._create_google_calendar_event()
@@ -0,0 +1,65 @@
+import uuid
+
+from core.models import Message, OutboxMessage
+
+class OutboxPublisher:
+    """
+    Records side effects in the outbox so they commit (or roll back) with the caller's transaction.
+    Delivery happens later in `process_outbox`, which is at-least-once; the idempotency key
+    keeps the same side effect from being enqueued twice.
+    """
+
+    def enqueue(self, action: str, payload: dict, idempotency_key: str | None = None) -> OutboxMessage:
+        message, _ = OutboxMessage.objects.get_or_create(
+            idempotency_key=idempotency_key or uuid.uuid4().hex,
+            defaults={
+                'action': action,
+                'payload': payload,
+            },
+        )
+        return message
+
+    def send_html_email(self, to: str, subject: str, html: str, idempotency_key: str | None = None):
+        return self.enqueue(
+            'email.send_html',
+            {
+                'to': to,
+                'subject': subject,
+                'html': html,
+            },
+            idempotency_key=idempotency_key,
+        )
+
+    def send_text_message(self, message: Message, idempotency_key: str | None = None):
+        return self.enqueue(
+            'messaging.send_text',
+            {
+                'text': message.text,
+                'text_from': message.text_from,
+                'text_to': message.text_to,
+                'is_inbound': message.is_inbound,
+                'status': message.status,
+                'is_read': message.is_read,
+            },
+            idempotency_key=idempotency_key,
+        )
+
+    def send_conversion(self, data: dict, idempotency_key: str | None = None):
+        # Conversions have their own queue so each platform gets batched uploads.
+        from core.logic.conversions.queue import conversion_queue
+
+        return conversion_queue.enqueue(data, idempotency_key=idempotency_key)
+
+    def process_inbound_media(self, message: Message, media_url: str, content_type: str | None, source: str, idempotency_key: str | None = None):
+        return self.enqueue(
+            'media.process_inbound',
+            {
+                'message_id': message.pk,
+                'media_url': media_url,
+                'content_type': content_type,
+                'source': source,
+            },
+            idempotency_key=idempotency_key,
+        )
+
+outbox = OutboxPublisher()
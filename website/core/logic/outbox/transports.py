@@ -0,0 +1,42 @@
+import logging
+
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+from website import settings
+
+from core.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+class OutboxTransport:
+    def deliver(self, message: OutboxMessage) -> None:
+        raise NotImplementedError("Subclasses must implement deliver method")
+
+class HandlerTransport(OutboxTransport):
+    """Delivers each message through the handler registered for its action."""
+
+    def deliver(self, message: OutboxMessage) -> None:
+        from core.logic.outbox.handlers import registry
+
+        handler = registry.get(message.action)
+        if handler is None:
+            raise ValueError(f"No outbox handler registered for '{message.action}'.")
+
+        handler(message.payload)
+
+class LocalTransport(OutboxTransport):
+    """Offline stand-in that records messages instead of calling external services."""
+
+    def __init__(self):
+        self.delivered: list[OutboxMessage] = []
+
+    def deliver(self, message: OutboxMessage) -> None:
+        logger.info("Outbox %s delivered locally: %s", message.action, message.payload)
+        self.delivered.append(message)
+
+class OutboxTransportService(LazyObject):
+    def _setup(self):
+        cls = import_string(settings.OUTBOX_TRANSPORT)
+        self._wrapped = cls()
+
+outbox_transport = OutboxTransportService()
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.utils import timezone
+
+from core.models import OutboxMessage, OutboxStatusChoices
+from core.logic.outbox.transports import OutboxTransport, outbox_transport
+from core.logic.queues.lease import LeasedQueue
+
+class OutboxWorker:
+    """
+    Leases due outbox rows so several workers can drain the table concurrently, and delivers them
+    with no transaction open: handlers such as media processing can run for minutes. Failed
+    deliveries are retried with jittered exponential backoff until OUTBOX_MAX_ATTEMPTS.
+    """
+
+    queue = LeasedQueue(
+        OutboxMessage,
+        pending=OutboxStatusChoices.PENDING,
+        in_progress=OutboxStatusChoices.IN_PROGRESS,
+        failed=OutboxStatusChoices.FAILED,
+        settings_prefix='OUTBOX',
+    )
+
+    def __init__(self, transport: OutboxTransport | None = None):
+        self.transport = transport or outbox_transport
+
+    def process_next(self) -> OutboxMessage | None:
+        messages = self.queue.claim()
+        if not messages:
+            return None
+
+        message = messages[0]
+
+        try:
+            self.transport.deliver(message)
+        except Exception as e:
+            self.queue.mark_failed_attempt(message, str(e))
+        else:
+            message.status = OutboxStatusChoices.DELIVERED
+            message.date_delivered = timezone.now()
+            message.last_error = None
+
+        self.queue.release([message], ['date_delivered'])
+        return message
+
+    def process_batch(self, batch_size: int) -> int:
+        processed = 0
+
+        try:
+            while processed < batch_size and self.process_next() is not None:
+                processed += 1
+        finally:
+            # Worker threads each hold their own connection.
+            connection.close()
+
+        return processed
+
+    def run(self, workers: int = 1, batch_size: int = 100) -> int:
+        if workers <= 1:
+            return self.process_batch(batch_size)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda _: self.process_batch(batch_size), range(workers))
+            return sum(results)
@@ -1,38 +1,62 @@
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
-from core.models import Lead, LeadEngagementStateChoices, Message
-from core.services.messaging import messaging_service
-from core.enums import EngagementAction, FollowUpVariant
-from core.utils import format_text_message, get_most_frequent_communication_user
+from core.models import LeadEngagementState
+from core.enums import LeadEngagementAction
+from core.logger import logger
+from core.logic.managers.lead_engagement import ENGAGEMENT_TIMEOUTS, LeadEngagementManager
 
 class LeadEngagementProcessor:
+    """
+    Advances leads whose engagement timeout has elapsed and queues their follow-ups.
+    Due rows are claimed with SKIP LOCKED, so several processors can run at once without
+    picking up the same lead. Each follow-up is written to the outbox in the same savepoint
+    as its state change, so it is sent (and retried) only if that change commits.
+    """
 
     def run(self, *, limit=500):
-        leads = self._get_candidates(limit=limit)
-
-        for lead in leads:
-            self._process_lead(lead)
-
-    def _get_candidates(self, limit):
-        return (
-            Lead.objects
-            .select_related("engagement")
-            .filter(
-                engagement__state__in=[
-                    LeadEngagementStateChoices.FIRST_CONTACT,
-                    LeadEngagementStateChoices.FOLLOW_UP_1,
-                    LeadEngagementStateChoices.FOLLOW_UP_2,
-                ],
-            )
-            .order_by("engagement__last_contacted_at")[:limit]
-        )
+        queued = 0
+
+        with transaction.atomic():
+            for engagement in self._claim_due_engagements(limit=limit):
+                action = self._process_engagement(engagement)
+
+                if action == LeadEngagementAction.SEND_FOLLOW_UP:
+                    queued += 1
 
-    @transaction.atomic
-    def _process_lead(self, lead: Lead):
-        action, variant = lead.engagement_manager.evaluate_time_based_transitions()
+        return queued
 
-        if action == EngagementAction.NONE:
-            return
+    def _due_filter(self, now):
+        due = Q()
+        for state, timeout in ENGAGEMENT_TIMEOUTS.items():
+            due |= Q(state=state, last_contacted_at__lte=now - timeout)
+
+        return due & (Q(paused_until__isnull=True) | Q(paused_until__lte=now))
+
+    def _claim_due_engagements(self, limit):
+        return list(
+            LeadEngagementState.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("lead")
+            .filter(self._due_filter(timezone.now()))
+            .order_by("last_contacted_at")[:limit]
+        )
 
-        if action == EngagementAction.SEND_FOLLOW_UP:
-            self.lead.actions.send_follow_up(variant=variant)
\ No newline at end of file
+    def _process_engagement(self, engagement: LeadEngagementState) -> LeadEngagementAction:
+        try:
+            with transaction.atomic():
+                manager = LeadEngagementManager(engagement.lead, engagement=engagement, locked=True)
+                action, variant = manager.evaluate_time_based_transitions()
+
+                if action == LeadEngagementAction.SEND_FOLLOW_UP:
+                    engagement.lead.actions.queue_automated_message(
+                        LeadEngagementAction.SEND_FOLLOW_UP,
+                        variant=variant,
+                        idempotency_key=f"lead-engagement-history:{manager.last_history.pk}:follow-up",
+                    )
+
+                return action
+        except Exception:
+            logger.error(f'Error while processing engagement for lead {engagement.lead_id}.', exc_info=True)
+            return LeadEngagementAction.NONE
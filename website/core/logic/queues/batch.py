@@ -0,0 +1,125 @@
+import atexit
+import os
+import queue
+import threading
+
+from core.logger import logger
+
+class BackgroundBatchWriter:
+    """
+    Write-behind buffer: callers queue items without touching the database, and a daemon thread
+    passes everything waiting to `write()` every `flush_interval` seconds, or sooner once
+    `batch_size` items are queued.
+
+    The queue holds at most `capacity` items. By default new items are dropped and counted when it
+    is full, and the count is handed to the next `write()`. stop(), registered to run at interpreter
+    exit, waits for the thread and writes what is left. A forked process starts with a fresh queue
+    and thread, since neither survives the fork.
+
+    Subclasses implement `write(items, dropped)` and may override `on_full` and `report_error`.
+    Django is imported lazily so the logging configuration can load a subclass before apps are ready.
+    """
+
+    thread_name = 'batch-writer'
+
+    def __init__(self, capacity: int, flush_interval: float, batch_size: int):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._queue: queue.Queue = queue.Queue(maxsize=self.capacity)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def put(self, item):
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.on_full(item)
+            return
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def on_full(self, item):
+        self.dropped += 1
+
+    def write(self, items: list, dropped: int):
+        raise NotImplementedError("Subclasses must implement write method")
+
+    def report_error(self, message: str):
+        logger.error(message, exc_info=True)
+
+    def flush(self):
+        with self._flush_lock:
+            items = self._drain()
+            dropped, self.dropped = self.dropped, 0
+
+            if not items and not dropped:
+                return
+
+            try:
+                self.write(items, dropped)
+            except Exception as e:
+                self.report_error(f'{type(self).__name__} failed to write {len(items)} item(s): {e}')
+            finally:
+                if self.in_writer_thread:
+                    from django.db import connection
+                    connection.close()
+
+    def stop(self):
+        if self._stopped.is_set():
+            return
+
+        self._stopped.set()
+        self._wake.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval * 2)
+
+        self.flush()
+
+    @property
+    def in_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _drain(self) -> list:
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+        if self._thread is not None:
+            return
+
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+
+            # An escaped error would end the thread and leave request threads flushing synchronously.
+            try:
+                self.flush()
+            except Exception as e:
+                self.report_error(f'{self.thread_name} flush failed: {e}')
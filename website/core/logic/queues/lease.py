@@ -0,0 +1,102 @@
+import random
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from website import settings
+
+from core.logger import logger
+
+class LeasedQueue:
+    """
+    Hands out due rows of a queue table (status, attempts, available_at, last_error) to workers.
+
+    `claim` is one short transaction: SKIP LOCKED picks due rows, marks them in progress and moves
+    available_at to the end of a lease, so no lock or transaction is held while the work runs.
+    `release` records the outcome in a second transaction, but only for rows whose lease the caller
+    still holds. A row whose worker died is claimed again once its lease runs out.
+
+    Attempts, backoff and lease length come from the `<settings_prefix>_MAX_ATTEMPTS`,
+    `_BACKOFF_SECONDS`, `_MAX_BACKOFF_SECONDS` and `_LEASE_SECONDS` settings.
+    """
+
+    def __init__(self, model: type[models.Model], *, pending: str, in_progress: str, failed: str, settings_prefix: str):
+        self.model = model
+        self.pending = pending
+        self.in_progress = in_progress
+        self.failed = failed
+        self.settings_prefix = settings_prefix
+
+    def setting(self, name: str):
+        return getattr(settings, f'{self.settings_prefix}_{name}')
+
+    def claim(self, limit: int = 1, **filters) -> list[models.Model]:
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=self.setting('LEASE_SECONDS'))
+
+        with transaction.atomic():
+            rows = list(
+                self.model.objects
+                .select_for_update(skip_locked=True)
+                .filter(Q(status=self.pending) | Q(status=self.in_progress), available_at__lte=now, **filters)
+                .order_by('available_at', 'pk')[:limit]
+            )
+
+            claimed, abandoned = [], []
+            for row in rows:
+                # Its worker died on the last allowed attempt.
+                if row.status == self.in_progress and row.attempts >= self.setting('MAX_ATTEMPTS'):
+                    row.status = self.failed
+                    row.last_error = f'Lease expired after {row.attempts} attempt(s).'
+                    abandoned.append(row)
+                    continue
+
+                row.status = self.in_progress
+                row.attempts += 1
+                row.available_at = lease_until
+                row.lease_until = lease_until
+                claimed.append(row)
+
+            self.model.objects.bulk_update(claimed + abandoned, ['status', 'attempts', 'available_at', 'last_error'])
+
+        return claimed
+
+    def mark_failed_attempt(self, row: models.Model, error: str, retryable: bool = True):
+        row.last_error = error
+
+        if not retryable or row.attempts >= self.setting('MAX_ATTEMPTS'):
+            row.status = self.failed
+            return
+
+        delay = min(
+            self.setting('MAX_BACKOFF_SECONDS'),
+            self.setting('BACKOFF_SECONDS') * 2 ** (row.attempts - 1),
+        )
+        row.status = self.pending
+        row.available_at = timezone.now() + timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+    def release(self, rows: list[models.Model], fields: list[str]) -> list[models.Model]:
+        """Saves `fields` plus the queue columns of the rows still leased to the caller."""
+        if not rows:
+            return []
+
+        with transaction.atomic():
+            held = set(
+                self.model.objects
+                .select_for_update()
+                .filter(
+                    pk__in=[row.pk for row in rows],
+                    status=self.in_progress,
+                    available_at__in={row.lease_until for row in rows},
+                )
+                .values_list('pk', flat=True)
+            )
+
+            kept = [row for row in rows if row.pk in held]
+            self.model.objects.bulk_update(kept, ['status', 'attempts', 'available_at', 'last_error', *fields])
+
+        if len(kept) < len(rows):
+            logger.warning(f'Discarded the results of {len(rows) - len(kept)} {self.model.__name__} row(s) whose lease had expired.')
+
+        return kept
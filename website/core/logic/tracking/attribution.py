@@ -0,0 +1,115 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from core.models import Ad, LeadAttribution, LeadMarketing, LeadMarketingMetadata
+from core.utils import parse_google_ads_cookie
+
+# Metadata keys stored in their own LeadAttribution column.
+COLUMN_KEYS = {
+    'gclid': 'gclid',
+    'gbraid': 'gbraid',
+    'wbraid': 'wbraid',
+    '_fbc': 'fbc',
+    '_fbp': 'fbp',
+    'fbclid': 'fbclid',
+    '_ga': 'ga',
+}
+
+GOOGLE_CLICK_KEYS = {'gclid', '_gcl_aw', 'gbraid', 'wbraid'}
+FACEBOOK_CLICK_KEYS = {'_fbc', 'fbclid'}
+
+# Keys the conversion payload reads from the columns instead of passing through as-is.
+NORMALIZED_KEYS = {'gclid', 'gbraid', 'wbraid', '_fbc', '_fbp', '_ga', '_gcl_aw'}
+
+def refresh_attribution(lead_marketing: LeadMarketing) -> LeadAttribution:
+    metadata = dict(
+        LeadMarketingMetadata.objects
+        .filter(lead_marketing=lead_marketing)
+        .values_list('key', 'value')
+    )
+
+    fields = {column: metadata.get(key) for key, column in COLUMN_KEYS.items()}
+    if not fields['gclid']:
+        fields['gclid'] = parse_google_ads_cookie(metadata.get('_gcl_aw'))
+
+    ad = None
+    if lead_marketing.ad_id:
+        ad = Ad.objects.select_related('ad_group__ad_campaign').filter(pk=lead_marketing.ad_id).first()
+
+    attribution, _ = LeadAttribution.objects.update_or_create(
+        lead_marketing=lead_marketing,
+        defaults={
+            **fields,
+            'has_google_click': bool(GOOGLE_CLICK_KEYS & metadata.keys()),
+            'has_facebook_click': bool(FACEBOOK_CLICK_KEYS & metadata.keys()) or bool(lead_marketing.instant_form_lead_id),
+            'ad': ad,
+            'ad_group': ad.ad_group if ad else None,
+            'ad_campaign': ad.ad_group.ad_campaign if ad else None,
+            'ad_platform_id': ad.ad_group.ad_campaign.ad_platform_id if ad else None,
+            'params': {key: value for key, value in metadata.items() if key not in NORMALIZED_KEYS},
+        },
+    )
+    return attribution
+
+def get_attribution(lead_marketing: LeadMarketing) -> LeadAttribution:
+    try:
+        return lead_marketing.attribution
+    except LeadAttribution.DoesNotExist:
+        return refresh_attribution(lead_marketing)
+
+_batch = threading.local()
+
+@contextmanager
+def batched_refresh():
+    """
+    Refreshes each lead touched inside the block once, when the block exits, instead of on every
+    LeadMarketing and metadata save. Nested blocks join the outermost one. Nothing is refreshed if
+    the block raises.
+    """
+    if getattr(_batch, 'ids', None) is not None:
+        yield
+        return
+
+    _batch.ids = set()
+    try:
+        yield
+        ids = _batch.ids
+    finally:
+        _batch.ids = None
+
+    for lead_marketing_id in sorted(ids):
+        _refresh_if_exists(lead_marketing_id)
+
+def _refresh_if_exists(lead_marketing_id: int):
+    lead_marketing = LeadMarketing.objects.filter(pk=lead_marketing_id).first()
+    if lead_marketing is not None:
+        refresh_attribution(lead_marketing)
+
+def _add_to_batch(lead_marketing_id: int) -> bool:
+    ids = getattr(_batch, 'ids', None)
+    if ids is None:
+        return False
+
+    ids.add(lead_marketing_id)
+    return True
+
+# Saves outside a batch refresh right away so a conversion built later in the same transaction sees them.
+def _on_metadata_saved(sender, instance: LeadMarketingMetadata, **kwargs):
+    if not _add_to_batch(instance.lead_marketing_id):
+        refresh_attribution(instance.lead_marketing)
+
+def _on_marketing_saved(sender, instance: LeadMarketing, **kwargs):
+    if not _add_to_batch(instance.pk):
+        refresh_attribution(instance)
+
+# Deletes wait for commit: when the lead itself is being deleted there is nothing left to refresh.
+def _on_metadata_deleted(sender, instance: LeadMarketingMetadata, **kwargs):
+    lead_marketing_id = instance.lead_marketing_id
+    transaction.on_commit(lambda: _refresh_if_exists(lead_marketing_id))
+
+post_save.connect(_on_metadata_saved, sender=LeadMarketingMetadata, weak=False, dispatch_uid='attribution_metadata_save')
+post_save.connect(_on_marketing_saved, sender=LeadMarketing, weak=False, dispatch_uid='attribution_marketing_save')
+post_delete.connect(_on_metadata_deleted, sender=LeadMarketingMetadata, weak=False, dispatch_uid='attribution_metadata_delete')
@@ -0,0 +1,180 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from django.db import InterfaceError, OperationalError, connection, transaction
+
+from core.logger import logger
+from core.models import LandingPage, LeadMarketing, Visit
+from core.logic.queues.batch import BackgroundBatchWriter
+from website import settings
+
+class VisitIdAllocator:
+    """
+    Hands out visit primary keys from the table's own sequence, reserving them in blocks so the
+    page can be given its visit ID before the row exists. Unused IDs are simply skipped.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._ids: deque[int] = deque()
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            if not self._ids:
+                self._ids.extend(self._reserve())
+            return self._ids.popleft()
+
+    def _reserve(self) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                [Visit._meta.db_table, Visit._meta.pk.column, self.block_size],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+@dataclass
+class PendingVisitUpdate:
+    visit_id: int
+    session_duration: float
+    cookies: dict
+    attempts: int = 0
+
+@dataclass
+class VisitBuffer:
+    visits: list[Visit] = field(default_factory=list)
+    updates: list[PendingVisitUpdate] = field(default_factory=list)
+
+class VisitTracker(BackgroundBatchWriter):
+    """
+    Buffers anonymous page views in process and writes them with bulk_create from a background thread,
+    every VISIT_FLUSH_INTERVAL seconds or once VISIT_FLUSH_BATCH_SIZE visits are waiting. LeadMarketing
+    and LandingPage references are resolved per batch instead of per request.
+
+    The queue is bounded: when it is full the request thread flushes instead of dropping visits, and
+    stop() (run from gunicorn's worker_exit hook and at interpreter exit) drains whatever is left.
+    Rows kept back while the database is unreachable are capped at VISIT_BUFFER_SIZE as well.
+    """
+
+    thread_name = 'visit-tracker'
+
+    def __init__(self):
+        super().__init__(
+            capacity=settings.VISIT_BUFFER_SIZE,
+            flush_interval=settings.VISIT_FLUSH_INTERVAL,
+            batch_size=settings.VISIT_FLUSH_BATCH_SIZE,
+        )
+        self.ids = VisitIdAllocator(block_size=settings.VISIT_ID_BLOCK_SIZE)
+        self._retry: list = []
+
+    def record(self, external_id: str, url: str, referrer: str | None, cookies: dict, landing_page_id: int | None = None) -> int:
+        visit = Visit(
+            visit_id=self.ids.next(),
+            external_id=external_id,
+            referrer=referrer,
+            url=url,
+            cookies=cookies,
+            landing_page_id=landing_page_id,
+        )
+
+        self.put(visit)
+        return visit.visit_id
+
+    def update(self, visit_id: int, session_duration: float, cookies: dict):
+        """Applies the page's exit beacon, deferring it while the visit is still waiting to be written."""
+        if self._apply(PendingVisitUpdate(visit_id=visit_id, session_duration=session_duration, cookies=cookies)):
+            return
+
+        self.put(PendingVisitUpdate(visit_id=visit_id, session_duration=session_duration, cookies=cookies))
+
+    def on_full(self, item):
+        self.flush()
+        self._queue.put(item)
+
+    def write(self, items: list, dropped: int):
+        if dropped:
+            logger.warning(f'Dropped {dropped} buffered visit row(s) while the database was unreachable.')
+
+        buffer = VisitBuffer()
+        for item in items:
+            if isinstance(item, Visit):
+                buffer.visits.append(item)
+            else:
+                buffer.updates.append(item)
+
+        try:
+            self._write(buffer)
+        except (InterfaceError, OperationalError) as e:
+            logger.error(f'Failed to write {len(buffer.visits)} buffered visits: {e}', exc_info=True)
+            # The database is unreachable; keep everything for the next flush.
+            self._keep_for_retry(items)
+        except Exception as e:
+            logger.error(f'Batch of {len(buffer.visits)} visits rejected, writing them one by one: {e}', exc_info=True)
+            self._write_individually(buffer)
+
+    def _drain(self) -> list:
+        items, self._retry = self._retry, []
+        return items + super()._drain()
+
+    def _keep_for_retry(self, items: list):
+        room = max(0, self.capacity - len(self._retry))
+        self._retry.extend(items[:room])
+        self.dropped += len(items) - len(items[:room])
+
+    def _write(self, buffer: VisitBuffer):
+        with transaction.atomic():
+            if buffer.visits:
+                self._resolve_references(buffer.visits)
+                Visit.objects.bulk_create(buffer.visits, batch_size=settings.VISIT_FLUSH_BATCH_SIZE)
+
+            unmatched = [pending for pending in buffer.updates if not self._apply(pending)]
+
+        # The visit may sit in another worker's buffer; give it a few flushes to appear.
+        for pending in unmatched:
+            pending.attempts += 1
+            if pending.attempts < settings.VISIT_UPDATE_MAX_ATTEMPTS:
+                self._keep_for_retry([pending])
+
+    def _write_individually(self, buffer: VisitBuffer):
+        for visit in buffer.visits:
+            try:
+                with transaction.atomic():
+                    visit.save(force_insert=True)
+            except (InterfaceError, OperationalError):
+                self._keep_for_retry([visit])
+            except Exception as e:
+                logger.error(f'Dropping visit {visit.visit_id}: {e}', exc_info=True)
+
+        try:
+            self._write(VisitBuffer(updates=buffer.updates))
+        except (InterfaceError, OperationalError):
+            self._keep_for_retry(buffer.updates)
+
+    def _apply(self, pending: PendingVisitUpdate) -> bool:
+        visits = Visit.objects.filter(pk=pending.visit_id)
+        if not visits.update(session_duration=pending.session_duration):
+            return False
+
+        # Cookies set by the page's own scripts (e.g. _fbp, _gcl_au) only arrive with the beacon.
+        if pending.cookies:
+            visits.filter(cookies={}).update(cookies=pending.cookies)
+
+        return True
+
+    def _resolve_references(self, visits: list[Visit]):
+        external_ids = {str(visit.external_id) for visit in visits if visit.external_id}
+        lead_marketing = {
+            str(lm.external_id): lm.pk
+            for lm in LeadMarketing.objects.filter(external_id__in=external_ids).only('pk', 'external_id')
+        }
+
+        landing_page_ids = {visit.landing_page_id for visit in visits if visit.landing_page_id}
+        existing_pages = set(LandingPage.objects.filter(pk__in=landing_page_ids).values_list('pk', flat=True))
+
+        for visit in visits:
+            visit.lead_marketing_id = lead_marketing.get(str(visit.external_id))
+            if visit.landing_page_id not in existing_pages:
+                visit.landing_page_id = None
+
+visit_tracker = VisitTracker()
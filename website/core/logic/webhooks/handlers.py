@@ -0,0 +1,82 @@
+import json
+from typing import Callable
+
+from django.db import transaction
+from django.http import HttpResponse, QueryDict
+
+from core.models import Lead, WebhookEvent
+from core.services.billing import billing_service
+from core.services.call_tracking import call_tracking_service
+from core.services.facebook.api import facebook_api_service
+from core.services.messaging import messaging_service
+
+WebhookHandler = Callable[[WebhookEvent], None]
+
+registry: dict[str, WebhookHandler] = {}
+
+class WebhookProcessingError(Exception):
+    pass
+
+def register(event_type: str):
+    def decorator(func: WebhookHandler) -> WebhookHandler:
+        registry[event_type] = func
+        return func
+    return decorator
+
+def _raise_for_status(event: WebhookEvent, response: HttpResponse):
+    # Service handlers swallow exceptions and answer 500; surface those so the event is retried.
+    if response.status_code >= 500:
+        raise WebhookProcessingError(f"{event.event_type} handler returned {response.status_code}: {response.content.decode('utf-8', 'ignore')}")
+
+@register('twilio.inbound_message')
+def process_twilio_inbound_message(event: WebhookEvent):
+    response = messaging_service.process_inbound_message(QueryDict(event.body))
+    _raise_for_status(event, response)
+
+@register('callrail.tracking_call_end')
+def process_callrail_tracking_call_end(event: WebhookEvent):
+    response = call_tracking_service.process_inbound_tracking_call_end(json.loads(event.body))
+    _raise_for_status(event, response)
+
+@register('stripe.payment')
+def process_stripe_payment(event: WebhookEvent):
+    response = billing_service.process_payment_event(json.loads(event.body))
+    _raise_for_status(event, response)
+
+@register('facebook.leadgen')
+def process_facebook_leadgen(event: WebhookEvent):
+    payload = json.loads(event.body)
+    entries = []
+
+    for entry in payload.get('entry', []):
+        for change in entry.get('changes', []):
+            if change.get('field') == 'leadgen':
+                value = change.get('value', {})
+                entries.append({
+                    'leadgen_id': value.get('leadgen_id'),
+                    'page_id': value.get('page_id'),
+                    'form_id': value.get('form_id'),
+                    'adgroup_id': value.get('adgroup_id'),
+                    'ad_id': value.get('ad_id'),
+                    'created_time': value.get('created_time'),
+                })
+
+    for entry in entries:
+        data = facebook_api_service.get_lead_data(lead=entry)
+        if not data.get('phone_number'):
+            continue
+
+        with transaction.atomic():
+            lead, created = Lead.objects.get_or_create(
+                phone_number=data.get('phone_number'),
+                defaults={
+                    'full_name': data.get('full_name'),
+                    'message': data.get('message'),
+                    'created_at': data.get('created_time'),
+                }
+            )
+
+            if created:
+                # LEAD_CREATED queues the initial-contact text in the outbox, so it is only sent
+                # once this event's transaction commits.
+                lead.manager.handle_lead_creation_via_instant_form(data=data, entry=entry)
@@ -0,0 +1,57 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, HttpResponse
+from django.http.request import RawPostDataException
+
+from core.models import WebhookEvent, WebhookProviderChoices
+
+class WebhookInbox:
+    """
+    Stores verified webhook payloads so the provider gets a 200 right away; `process_webhooks`
+    runs the service handlers afterwards. Payloads are deduplicated per event type on the provider's
+    event ID, falling back to a hash of the body when there is none.
+    """
+
+    def receive(self, request: HttpRequest, provider: WebhookProviderChoices, event_type: str, external_id: str | None = None) -> HttpResponse:
+        self.store(
+            provider=provider,
+            event_type=event_type,
+            body=self.read_body(request),
+            content_type=request.content_type,
+            headers=dict(request.headers),
+            external_id=external_id,
+        )
+
+        return HttpResponse("Received.", status=200)
+
+    def store(self, provider, event_type, body, content_type=None, headers=None, external_id=None) -> WebhookEvent:
+        external_id = external_id or self.body_hash(body)
+
+        try:
+            with transaction.atomic():
+                return WebhookEvent.objects.create(
+                    provider=provider,
+                    event_type=event_type,
+                    external_id=external_id,
+                    content_type=content_type,
+                    headers=headers or {},
+                    body=body,
+                )
+        except IntegrityError:
+            # Provider retried a delivery we already have.
+            return WebhookEvent.objects.get(event_type=event_type, external_id=external_id)
+
+    @staticmethod
+    def read_body(request: HttpRequest) -> str:
+        try:
+            return request.body.decode("utf-8")
+        except RawPostDataException:
+            # Signature checks that read request.POST consume the stream; re-encode the parsed form.
+            return request.POST.urlencode()
+
+    @staticmethod
+    def body_hash(body: str) -> str:
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+webhook_inbox = WebhookInbox()
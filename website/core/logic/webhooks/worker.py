@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import WebhookEvent, WebhookEventStatusChoices
+from core.logic.queues.lease import LeasedQueue
+from core.logic.webhooks.handlers import registry
+
+class WebhookWorker:
+    """
+    Runs stored webhook events through their registered handler. Events are leased so several
+    workers can drain the inbox; a handler's writes are rolled back when it fails, and the event
+    is retried with jittered backoff until WEBHOOK_MAX_ATTEMPTS.
+    """
+
+    queue = LeasedQueue(
+        WebhookEvent,
+        pending=WebhookEventStatusChoices.PENDING,
+        in_progress=WebhookEventStatusChoices.IN_PROGRESS,
+        failed=WebhookEventStatusChoices.FAILED,
+        settings_prefix='WEBHOOK',
+    )
+
+    def process_next(self) -> WebhookEvent | None:
+        events = self.queue.claim()
+        if not events:
+            return None
+
+        self.process(events[0])
+        return events[0]
+
+    def process(self, event: WebhookEvent):
+        """Runs a leased event and records the outcome."""
+        try:
+            handler = registry.get(event.event_type)
+            if handler is None:
+                raise ValueError(f"No webhook handler registered for '{event.event_type}'.")
+
+            with transaction.atomic():
+                handler(event)
+        except Exception as e:
+            self.queue.mark_failed_attempt(event, str(e))
+        else:
+            event.status = WebhookEventStatusChoices.PROCESSED
+            event.date_processed = timezone.now()
+            event.last_error = None
+
+        self.queue.release([event], ['date_processed'])
+
+    def process_batch(self, batch_size: int) -> int:
+        processed = 0
+
+        try:
+            while processed < batch_size and self.process_next() is not None:
+                processed += 1
+        finally:
+            connection.close()
+
+        return processed
+
+    def run(self, workers: int = 1, batch_size: int = 100) -> int:
+        if workers <= 1:
+            return self.process_batch(batch_size)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda _: self.process_batch(batch_size), range(workers))
+            return sum(results)
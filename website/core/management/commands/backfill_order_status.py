@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from core.models import Order, OrderStatusChangeHistory
+
+
+class Command(BaseCommand):
+    help = "Syncs Order.current_status with the latest entry in each order's status history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many orders are out of sync",
+        )
+
+    def handle(self, *args, **options):
+        latest_status = (
+            OrderStatusChangeHistory.objects
+            .filter(order=OuterRef('pk'))
+            .order_by('-date_created')
+            .values('status__status')[:1]
+        )
+
+        stale = [
+            pk
+            for pk, current_status, latest in (
+                Order.objects
+                .annotate(latest=Subquery(latest_status))
+                .values_list('pk', 'current_status', 'latest')
+            )
+            if current_status != latest
+        ]
+
+        count = len(stale)
+
+        if options['dry_run']:
+            self.stdout.write(f"{count} order(s) out of sync.")
+            return
+
+        Order.objects.filter(pk__in=stale).update(current_status=Subquery(latest_status))
+
+        self.stdout.write(self.style.SUCCESS(f"Synced current_status for {count} order(s)."))
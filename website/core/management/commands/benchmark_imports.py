@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from website import settings
+
+DEFAULT_MODULES = [
+    'core.utils',
+    'core.models',
+    'core.forms',
+]
+
+# django.setup() loads app and models modules with importlib.import_module, which -X importtime does not
+# report. Routing it through __import__ puts them, and everything they import, in the timed tree.
+SETUP_PRELUDE = """
+import importlib, importlib.util, sys
+
+def import_module(name, package=None):
+    name = importlib.util.resolve_name(name, package)
+    __import__(name)
+    return sys.modules[name]
+
+importlib.import_module = import_module
+"""
+
+
+class Command(BaseCommand):
+    help = "Reports per-module import cost with `python -X importtime` and fails when a budget is exceeded."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            action='append',
+            dest='modules',
+            help="Module to benchmark in a cold django.setup() (repeatable, defaults to core.utils, core.models and core.forms)",
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help="Number of most expensive transitive imports to list",
+        )
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            help="Fail when the combined import time of the benchmarked modules exceeds this many milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or DEFAULT_MODULES
+
+        # A cold django.setup() already imports core.models, core.utils and whatever the app configs pull in, so
+        # each module is timed where it is first imported in that tree, not after setup() has cached it.
+        code = "\n".join([SETUP_PRELUDE, "import django", "django.setup()", *(f"import {module}" for module in modules)])
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+
+        if result.returncode != 0:
+            raise CommandError(f"❌ Import failed:\n{result.stderr[-2000:]}")
+
+        timings, descendants = self._parse(result.stderr)
+
+        self.stdout.write(f"{'cumulative ms':>14} {'self ms':>10}  module")
+        for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda t: t[1][1], reverse=True)[:options['top']]:
+            self.stdout.write(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>10.1f}  {name}")
+
+        # A module imported by another benchmarked module is already in that module's cumulative time.
+        nested = {module: parent for parent in modules for module in modules if module in descendants.get(parent, ())}
+        total_ms = sum(timings.get(module, (0, 0))[1] for module in modules if module not in nested) / 1000
+
+        self.stdout.write("")
+        for module in modules:
+            if module not in timings:
+                self.stdout.write(f"{module}: already imported at interpreter startup")
+            elif module in nested:
+                self.stdout.write(f"{module}: {timings[module][1] / 1000:.1f} ms (included in {nested[module]})")
+            else:
+                self.stdout.write(f"{module}: {timings[module][1] / 1000:.1f} ms")
+
+        budget = options['budget_ms']
+        if budget is not None and total_ms > budget:
+            raise CommandError(f"❌ Import time {total_ms:.1f} ms exceeds budget of {budget:.1f} ms")
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Total import time: {total_ms:.1f} ms"))
+
+    def _parse(self, output: str) -> tuple[dict[str, tuple[int, int]], dict[str, set[str]]]:
+        """
+        Returns each module's (self, cumulative) time in microseconds and the modules imported beneath it.
+        importtime prints a module after everything it imports, indented one level deeper than its parent.
+        """
+        timings = {}
+        descendants = {}
+        pending: list[tuple[int, str]] = []
+
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            depth = len(name) - len(name.lstrip())
+            name = name.strip()
+
+            timings[name] = (int(self_us), int(cumulative_us))
+            descendants[name] = set()
+
+            while pending and pending[-1][0] > depth:
+                _, child = pending.pop()
+                descendants[name] |= {child} | descendants[child]
+
+            pending.append((depth, name))
+
+        return timings, descendants
@@ -0,0 +1,50 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from website import settings
+
+
+class Command(BaseCommand):
+    help = "Deletes expired sessions in small chunks instead of one long DELETE over the session table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.SESSION_CLEANUP_CHUNK_SIZE,
+            help="Number of sessions deleted per statement",
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help="Seconds to pause between chunks",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        now = timezone.now()
+        deleted = 0
+
+        while True:
+            # Cached copies expire on their own TTL, so only the table needs cleaning.
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .order_by('expire_date')
+                .values_list('session_key', flat=True)[:chunk_size]
+            )
+            if not keys:
+                break
+
+            count, _ = Session.objects.filter(session_key__in=keys).delete()
+            deleted += count
+
+            if len(keys) < chunk_size:
+                break
+
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Deleted {deleted} expired session(s)."))
@@ -5,6 +5,7 @@ from django.conf import settings
 
 from core.models import FacebookAccessToken
 from core.utils import get_facebook_token_expiry_date
+from core.logic.http.sessions import get_session
 
 class Command(BaseCommand):
     help = 'Refresh Facebook long-lived access token and save it to the database.'
@@ -32,7 +33,7 @@ class Command(BaseCommand):
         self.stdout.write('🔄 Requesting new long-lived access token...')
 
         try:
-            response = requests.get('https://graph.facebook.com/oauth/access_token', params=params)
+            response = get_session('facebook').get('https://graph.facebook.com/oauth/access_token', params=params)
             response.raise_for_status()
         except requests.RequestException as e:
             raise CommandError(f'Error while refreshing access token: {str(e)}')
@@ -4,7 +4,7 @@ from django.core.management.base import BaseCommand, CommandError
 from core.call_tracking import call_tracking_service
 from core.models import Ad, Lead, LeadMarketingMetadata, TrackingPhoneCall, TrackingPhoneCallMetadata
 from core.utils import normalize_phone_number
-from core.conversions import conversion_service
+from core.logic.conversions.queue import conversion_queue
 
 from website import settings
 
@@ -71,21 +71,19 @@ class Command(BaseCommand):
 
                     print(f"Reporting: {lead.events.count()} event(s)!")
                     for event in events:
-                        try:
-                            gads_service = conversion_service.get("gads")
-
-                            data = {
-                                'event_name': 'event_booked',
-                                'gclid': gclid,
-                                'event_time': event.date_paid.timestamp(),
-                                'value': event.amount,
-                                'order_id': event.pk,
-                            }
-
-                            gads_service.send_conversion(data=data)
-                        except Exception as e:
-                            print(f'Error trying to send Google Ads conv: {e}')
-                            continue
+                        data = {
+                            'event_name': 'event_booked',
+                            'gclid': gclid,
+                            'event_time': event.date_paid.timestamp(),
+                            'value': event.amount,
+                            'event_id': event.pk,
+                        }
+
+                        conversion_queue.enqueue(
+                            data,
+                            idempotency_key=f"conversion:call-asset:{event.pk}",
+                            services=['google'],
+                        )
                 
                 kw_marketing_metadata = lead.lead_marketing.metadata.filter(key='keyword').first()
                 if not kw_marketing_metadata and keyword:
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.logic.processors.lead import LeadEngagementProcessor
+
+
+class Command(BaseCommand):
+    help = "Advances lead engagement timeouts and queues the resulting follow-up texts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help="Maximum number of due leads to claim in this run",
+        )
+
+    def handle(self, *args, **options):
+        processor = LeadEngagementProcessor()
+        queued = processor.run(limit=options['limit'])
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Queued {queued} follow-up(s)."))
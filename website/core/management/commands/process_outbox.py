@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.logic.outbox.worker import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Delivers pending outbox messages (emails, texts, conversions) recorded by the state managers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help="Number of worker threads draining the outbox",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help="Maximum messages each worker delivers per pass",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help="Seconds to sleep when the outbox is empty",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Run a single pass and exit",
+        )
+
+    def handle(self, *args, **options):
+        worker = OutboxWorker()
+
+        while True:
+            processed = worker.run(workers=options['workers'], batch_size=options['batch_size'])
+
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✔ Processed {processed} outbox message(s)."))
+
+            if options['once']:
+                return
+
+            if not processed:
+                time.sleep(options['interval'])
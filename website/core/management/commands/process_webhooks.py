@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.logic.webhooks.worker import WebhookWorker
+
+
+class Command(BaseCommand):
+    help = "Runs stored webhook payloads (Twilio, CallRail, Stripe, Facebook) through their service handlers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help="Number of worker threads draining the webhook inbox",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help="Maximum events each worker processes per pass",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help="Seconds to sleep when the inbox is empty",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Run a single pass and exit",
+        )
+
+    def handle(self, *args, **options):
+        worker = WebhookWorker()
+
+        while True:
+            processed = worker.run(workers=options['workers'], batch_size=options['batch_size'])
+
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✔ Processed {processed} webhook event(s)."))
+
+            if options['once']:
+                return
+
+            if not processed:
+                time.sleep(options['interval'])
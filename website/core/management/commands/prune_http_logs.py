@@ -0,0 +1,59 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import HTTPLog
+from website import settings
+
+
+class Command(BaseCommand):
+    help = "Deletes HTTP logs older than the retention period in small chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.HTTP_LOG_RETENTION_DAYS,
+            help="Keep logs from the last N days",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.HTTP_LOG_CLEANUP_CHUNK_SIZE,
+            help="Number of logs deleted per statement",
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help="Seconds to pause between chunks",
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError("❌ --days must be at least 1.")
+
+        chunk_size = options['chunk_size']
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted = 0
+
+        while True:
+            ids = list(
+                HTTPLog.objects.filter(date_created__lt=cutoff)
+                .order_by('date_created')
+                .values_list('http_log_id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            count, _ = HTTPLog.objects.filter(http_log_id__in=ids).delete()
+            deleted += count
+
+            if len(ids) < chunk_size:
+                break
+
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Deleted {deleted} HTTP log(s) older than {options['days']} day(s)."))
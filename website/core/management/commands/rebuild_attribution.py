@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import LeadMarketing
+from core.logic.tracking.attribution import refresh_attribution
+
+
+class Command(BaseCommand):
+    help = "Recomputes the normalized attribution record of every lead from its marketing metadata."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help="Only build records for leads that do not have one yet",
+        )
+
+    def handle(self, *args, **options):
+        lead_marketing = LeadMarketing.objects.order_by('pk')
+        if options['missing']:
+            lead_marketing = lead_marketing.filter(attribution__isnull=True)
+
+        count = 0
+        for marketing in lead_marketing.iterator(chunk_size=500):
+            refresh_attribution(marketing)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Rebuilt attribution for {count} lead(s)."))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Item
+
+
+class Command(BaseCommand):
+    help = "Verifies the item availability projection against the inventory ledger and rebuilds drifted items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--item',
+            type=int,
+            required=False,
+            help="Only process the item with this ID",
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Report drifted items without rebuilding them",
+        )
+
+    def handle(self, *args, **options):
+        items = Item.objects.order_by('item_id')
+        if options.get('item'):
+            items = items.filter(pk=options['item'])
+
+        drifted = []
+        for item in items:
+            manager = item.inventory
+            if manager.stored_availability() == manager.ledger_availability():
+                continue
+
+            drifted.append(item)
+            self.stdout.write(self.style.WARNING(f"Projection drifted for item {item.pk} ({item})"))
+
+            if not options['check']:
+                manager.rebuild_availability()
+                self.stdout.write(f"✔ Rebuilt availability for item {item.pk}")
+
+        if options['check'] and drifted:
+            raise CommandError(f"❌ {len(drifted)} item(s) out of sync with the inventory ledger")
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {items.count()} item(s), {len(drifted)} drifted."))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.logic.analytics.prospecting import ROLLUP_START, SEGMENTS, month_start, prospecting_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored monthly prospecting rollups of recently closed months."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help="How many closed months to refresh, counting back from last month (default: 3)",
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="Refresh every closed month since rollups started",
+        )
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError("❌ --months must be at least 1.")
+
+        last = month_start(month_start(timezone.now()) - timedelta(days=1))
+
+        first = ROLLUP_START
+        if not options['all']:
+            first = last
+            for _ in range(options['months'] - 1):
+                first = month_start(first - timedelta(days=1))
+
+        count = 0
+        for segment in SEGMENTS:
+            count += prospecting_rollups.refresh(segment, first, last)
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Refreshed {count} prospecting rollup(s)."))
@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import WebhookEvent, WebhookEventStatusChoices, WebhookProviderChoices
+from core.logic.webhooks.worker import WebhookWorker
+
+
+class Command(BaseCommand):
+    help = "Re-queues stored webhook events so process_webhooks runs them again."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--id',
+            type=int,
+            nargs='+',
+            dest='ids',
+            help="Only replay the webhook events with these IDs",
+        )
+        parser.add_argument(
+            '--provider',
+            type=str,
+            choices=WebhookProviderChoices.values,
+            help="Only replay events from this provider",
+        )
+        parser.add_argument(
+            '--event-type',
+            type=str,
+            help="Only replay events of this type (e.g. twilio.inbound_message)",
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help="Only replay events received at or after this ISO datetime",
+        )
+        parser.add_argument(
+            '--include-processed',
+            action='store_true',
+            help="Also replay events that were already processed (only failed events by default)",
+        )
+        parser.add_argument(
+            '--now',
+            action='store_true',
+            help="Run the replayed events in this process instead of waiting for process_webhooks",
+        )
+
+    def handle(self, *args, **options):
+        events = WebhookEvent.objects.all()
+
+        if options['ids']:
+            events = events.filter(pk__in=options['ids'])
+        if options['provider']:
+            events = events.filter(provider=options['provider'])
+        if options['event_type']:
+            events = events.filter(event_type=options['event_type'])
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f"❌ Invalid datetime '{options['since']}'")
+            events = events.filter(date_created__gte=since)
+        if not options['include_processed']:
+            events = events.filter(status=WebhookEventStatusChoices.FAILED)
+
+        event_ids = list(events.order_by('pk').values_list('pk', flat=True))
+
+        if options['now']:
+            self._replay_now(event_ids)
+            return
+
+        WebhookEvent.objects.filter(pk__in=event_ids).exclude(status=WebhookEventStatusChoices.IN_PROGRESS).update(
+            status=WebhookEventStatusChoices.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+            last_error=None,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Re-queued {len(event_ids)} webhook event(s)."))
+
+    def _replay_now(self, event_ids):
+        worker = WebhookWorker()
+
+        for event_id in event_ids:
+            WebhookEvent.objects.filter(pk=event_id).exclude(status=WebhookEventStatusChoices.IN_PROGRESS).update(
+                status=WebhookEventStatusChoices.PENDING,
+                attempts=0,
+                available_at=timezone.now(),
+                last_error=None,
+            )
+
+            events = worker.queue.claim(pk=event_id)
+            if not events:
+                self.stdout.write(f"{event_id}: locked by a running worker, skipped")
+                continue
+
+            event = events[0]
+            worker.process(event)
+
+            self.stdout.write(f"{event.pk} {event.event_type}: {event.status}")
@@ -2,8 +2,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from core.models import Event, Lead
-from core.conversions import conversion_service
-from marketing.utils import parse_google_ads_cookie
+from core.services.conversions import conversion_service
+from core.logic.tracking.attribution import get_attribution
 
 class Command(BaseCommand):
     help = 'Report offline conversions.'
@@ -58,28 +58,14 @@ class Command(BaseCommand):
                 'event_time': event.date_created.timestamp()
             })
 
-        for metadata in lead.lead_marketing.metadata.all():
-            if metadata.key == '_fbc':
-                data['fbc'] = metadata.value
-            elif metadata.key == '_fbp':
-                data['fbp'] = metadata.value
-            elif metadata.key == '_ga':
-                data['ga'] = metadata.value
-            elif metadata.key == 'gclid':
-                data['gclid'] = metadata.value
-            elif metadata.key == 'gbraid':
-                data['gbraid'] = metadata.value
-            elif metadata.key == 'wbraid':
-                data['wbraid'] = metadata.value
-            elif metadata.key == '_gcl_aw':
-                if 'gclid' not in data:
-                    cookie_click_id = parse_google_ads_cookie(metadata.value)
-                    if cookie_click_id:
-                        data['gclid'] = cookie_click_id
-            else:
-                data[metadata.key] = metadata.value
+        data.update(get_attribution(lead.lead_marketing).conversion_data())
+
+        results = conversion_service.send_conversion(data=data)
 
-        try:
-            conversion_service.send_conversion(data=data)
-        except Exception as e:
-            print(f'Error sending conv: {e}')
\ No newline at end of file
+        for key, result in results.items():
+            if result.skipped:
+                self.stdout.write(f'{key}: skipped')
+            elif result.ok:
+                self.stdout.write(self.style.SUCCESS(f'✔ {key}: sent in {result.duration_seconds:.2f}s'))
+            else:
+                self.stderr.write(self.style.ERROR(f'❌ {key}: {result.error} ({result.duration_seconds:.2f}s)'))
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from core.models import Lead
-from core.conversions import conversion_service
+from core.services.conversions import conversion_service
 
 
 class Command(BaseCommand):
@@ -50,9 +50,14 @@ class Command(BaseCommand):
         for metadata in lead.lead_marketing.metadata.all():
             data[metadata.key] = metadata.value
 
-        try:
-            conversion_service.retract_conversion(data=data)
-        except Exception as e:
-            self.stderr.write(
-                self.style.ERROR(f'Error retracting conversion: {e}')
-            )
\ No newline at end of file
+        results = conversion_service.retract_conversion(data=data)
+
+        for key, result in results.items():
+            if result.skipped:
+                self.stdout.write(f'{key}: skipped')
+            elif result.ok:
+                self.stdout.write(self.style.SUCCESS(f'✔ {key}: retracted in {result.duration_seconds:.2f}s'))
+            else:
+                self.stderr.write(
+                    self.style.ERROR(f'Error retracting conversion for {key}: {result.error}')
+                )
\ No newline at end of file
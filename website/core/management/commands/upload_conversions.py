@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.logic.conversions.worker import ConversionUploadWorker
+from website import settings
+
+
+class Command(BaseCommand):
+    help = "Uploads pending conversions to each ad platform in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CONVERSION_UPLOAD_BATCH_SIZE,
+            help="Maximum conversions sent to a platform per upload",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10,
+            help="Seconds to sleep when nothing is pending",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Run a single pass and exit",
+        )
+
+    def handle(self, *args, **options):
+        worker = ConversionUploadWorker()
+
+        while True:
+            processed = worker.run(batch_size=options['batch_size'])
+
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✔ Uploaded {processed} conversion(s)."))
+
+            if options['once']:
+                return
+
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from collections import defaultdict
+from django.db import migrations, models
+
+INCREASING_STATES = ["Purchased", "Returned"]
+DECREASING_STATES = ["Reserved", "Sold", "Decommissioned"]
+
+def populate_item_availability(apps, schema_editor):
+    ItemStateChangeHistory = apps.get_model("core", "ItemStateChangeHistory")
+    ItemAvailability = apps.get_model("core", "ItemAvailability")
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    entries = (
+        ItemStateChangeHistory.objects
+        .values_list("item_id", "target_date", "state__state", "quantity")
+        .order_by("item_id", "target_date")
+    )
+
+    for item_id, target_date, state, quantity in entries:
+        if state in INCREASING_STATES:
+            deltas[item_id][target_date] += quantity
+        elif state in DECREASING_STATES:
+            deltas[item_id][target_date] -= quantity
+
+    rows = []
+    for item_id, by_date in deltas.items():
+        running_total = 0
+        for target_date in sorted(by_date):
+            running_total += by_date[target_date]
+            rows.append(ItemAvailability(item_id=item_id, target_date=target_date, available=running_total))
+
+    ItemAvailability.objects.bulk_create(rows, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0102_alter_deliveryvehicle_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemAvailability',
+            fields=[
+                ('item_availability_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('target_date', models.DateField()),
+                ('available', models.IntegerField()),
+                ('item', models.ForeignKey(db_column='item_id', on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='core.item')),
+            ],
+            options={
+                'db_table': 'item_availability',
+                'ordering': ['target_date'],
+                'constraints': [models.UniqueConstraint(fields=('item', 'target_date'), name='unique_item_availability_date')],
+            },
+        ),
+        migrations.RunPython(
+            populate_item_availability,
+            migrations.RunPython.noop,
+        ),
+    ]
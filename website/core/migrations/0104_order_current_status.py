@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+def populate_order_current_status(apps, schema_editor):
+    Order = apps.get_model("core", "Order")
+    OrderStatusChangeHistory = apps.get_model("core", "OrderStatusChangeHistory")
+
+    latest_status = (
+        OrderStatusChangeHistory.objects
+        .filter(order=OuterRef("pk"))
+        .order_by("-date_created")
+        .values("status__status")[:1]
+    )
+
+    Order.objects.update(current_status=Subquery(latest_status))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0103_itemavailability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='current_status',
+            field=models.CharField(choices=[('Order Placed', 'Order Placed'), ('Order Cancelled', 'Order Cancelled'), ('Awaiting Preparation', 'Awaiting Preparation'), ('Ready for Dispatch', 'Ready For Dispatch'), ('Dispatched', 'Dispatched'), ('Finalized', 'Finalized'), ('Delivery Failed', 'Delivery Failed'), ('Pending Review of Delivery', 'Pending Review Of Delivery'), ('Delivered', 'Delivered'), ('Pending Pick Up', 'Pending Pick Up'), ('Picked Up', 'Picked Up'), ('Customer Picked Up', 'Customer Picked Up'), ('Pending Customer Return', 'Pending Customer Return'), ('Customer Returned', 'Customer Returned')], db_index=True, max_length=60, null=True),
+        ),
+        migrations.RunPython(
+            populate_order_current_status,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0104_order_current_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('outbox_message_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('idempotency_key', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Delivered', 'Delivered'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_delivered', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'outbox_message',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='outbox_mess_status_81d2f3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0105_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('webhook_event_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('provider', models.CharField(choices=[('twilio', 'Twilio'), ('callrail', 'CallRail'), ('stripe', 'Stripe'), ('facebook', 'Facebook')], max_length=20)),
+                ('event_type', models.CharField(max_length=100)),
+                ('external_id', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=255, null=True)),
+                ('headers', models.JSONField(default=dict)),
+                ('body', models.TextField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Processed', 'Processed'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_processed', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'webhook_event',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='webhook_eve_status_af8963_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event_type', 'external_id'), name='unique_webhook_event_external_id')],
+            },
+        ),
+    ]
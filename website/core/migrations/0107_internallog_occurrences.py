@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0106_webhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internallog',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # http_log is written on every outbound API call, so the index is built without locking out writes.
+    atomic = False
+
+    dependencies = [
+        ('core', '0107_internallog_occurrences'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='httplog',
+            index=models.Index(fields=['date_created'], name='http_log_date_cr_d199ea_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0108_httplog_date_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversionUpload',
+            fields=[
+                ('conversion_upload_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('service', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('idempotency_key', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Uploaded', 'Uploaded'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(null=True)),
+                ('result', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_uploaded', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'conversion_upload',
+                'indexes': [models.Index(fields=['service', 'status', 'available_at'], name='conversion__service_8e31b1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.logic.tracking.attribution import COLUMN_KEYS, FACEBOOK_CLICK_KEYS, GOOGLE_CLICK_KEYS, NORMALIZED_KEYS
+from core.utils import parse_google_ads_cookie
+
+def backfill_attribution(apps, schema_editor):
+    """Builds the record of every existing lead the same way refresh_attribution does."""
+    LeadMarketing = apps.get_model('core', 'LeadMarketing')
+    LeadAttribution = apps.get_model('core', 'LeadAttribution')
+
+    lead_marketing = (
+        LeadMarketing.objects
+        .select_related('ad__ad_group__ad_campaign')
+        .prefetch_related('metadata')
+        .order_by('pk')
+    )
+
+    batch = []
+    for marketing in lead_marketing.iterator(chunk_size=500):
+        metadata = {entry.key: entry.value for entry in marketing.metadata.all()}
+
+        fields = {column: metadata.get(key) for key, column in COLUMN_KEYS.items()}
+        if not fields['gclid']:
+            fields['gclid'] = parse_google_ads_cookie(metadata.get('_gcl_aw'))
+
+        ad = marketing.ad
+        batch.append(LeadAttribution(
+            lead_marketing=marketing,
+            **fields,
+            has_google_click=bool(GOOGLE_CLICK_KEYS & metadata.keys()),
+            has_facebook_click=bool(FACEBOOK_CLICK_KEYS & metadata.keys()) or bool(marketing.instant_form_lead_id),
+            ad=ad,
+            ad_group=ad.ad_group if ad else None,
+            ad_campaign=ad.ad_group.ad_campaign if ad else None,
+            params={key: value for key, value in metadata.items() if key not in NORMALIZED_KEYS},
+        ))
+
+        if len(batch) >= 500:
+            LeadAttribution.objects.bulk_create(batch)
+            batch = []
+
+    LeadAttribution.objects.bulk_create(batch)
+
+    # ad_campaign.ad_platform_id predates the migration state, so the historical model can't read it.
+    schema_editor.execute(
+        "UPDATE lead_attribution SET ad_platform_id = ad_campaign.ad_platform_id "
+        "FROM ad_campaign WHERE ad_campaign.id = lead_attribution.ad_campaign_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0109_conversionupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadAttribution',
+            fields=[
+                ('lead_attribution_id', models.AutoField(primary_key=True, serialize=False)),
+                ('gclid', models.TextField(null=True)),
+                ('gbraid', models.TextField(null=True)),
+                ('wbraid', models.TextField(null=True)),
+                ('fbc', models.TextField(null=True)),
+                ('fbp', models.TextField(null=True)),
+                ('fbclid', models.TextField(null=True)),
+                ('ga', models.TextField(null=True)),
+                ('has_google_click', models.BooleanField(db_index=True, default=False)),
+                ('has_facebook_click', models.BooleanField(db_index=True, default=False)),
+                ('params', models.JSONField(default=dict)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('ad', models.ForeignKey(db_column='ad_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.ad')),
+                ('ad_campaign', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.adcampaign')),
+                ('ad_group', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.adgroup')),
+                ('ad_platform', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lead_attributions', to='core.adplatform')),
+                ('lead_marketing', models.OneToOneField(db_column='lead_marketing_id', on_delete=django.db.models.deletion.CASCADE, related_name='attribution', to='core.leadmarketing')),
+            ],
+            options={
+                'db_table': 'lead_attribution',
+            },
+        ),
+        migrations.RunPython(backfill_attribution, migrations.RunPython.noop),
+    ]
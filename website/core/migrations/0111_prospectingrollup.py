@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0110_leadattribution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProspectingRollup',
+            fields=[
+                ('prospecting_rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('segment', models.CharField(max_length=50)),
+                ('month', models.DateField()),
+                ('leads', models.IntegerField(default=0)),
+                ('converted_leads', models.IntegerField(default=0)),
+                ('quotes', models.IntegerField(default=0)),
+                ('booked', models.IntegerField(default=0)),
+                ('value', models.FloatField(default=0)),
+                ('date_refreshed', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'prospecting_rollup',
+                'unique_together': {('segment', 'month')},
+            },
+        ),
+    ]
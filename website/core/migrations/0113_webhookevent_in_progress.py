@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0112_outboxmessage_in_progress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='webhookevent',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Pending'), ('In Progress', 'In Progress'), ('Processed', 'Processed'), ('Failed', 'Failed')], default='Pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0113_webhookevent_in_progress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conversionupload',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Pending'), ('In Progress', 'In Progress'), ('Uploaded', 'Uploaded'), ('Failed', 'Failed')], default='Pending', max_length=20),
+        ),
+    ]
@@ -6,7 +6,8 @@ import uuid
 from django.db import IntegrityError, models
 from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest
 from django.utils import timezone
 from django.db.models import Q, Sum
@@ -130,14 +131,21 @@ class Lead(models.Model):
     def __str__(self):
         return self.full_name
     
+    @property
+    def attribution(self):
+        try:
+            return self.lead_marketing.attribution
+        except ObjectDoesNotExist:
+            return None
+
     def has_gbraid(self):
-        return self.lead_marketing.metadata.filter(key="gbraid").exists() and not self.lead_marketing.metadata.filter(key="gclid").exists()
+        return bool(self.attribution and self.attribution.gbraid and not self.attribution.gclid)
     
     def has_gclid(self):
-        return self.lead_marketing.metadata.filter(Q(key='gclid') | Q(key='_gcl_aw') | Q(key='gbraid') | Q(key='wbraid')).exists()
+        return bool(self.attribution and self.attribution.has_google_click)
     
     def has_fbc(self):
-        return self.lead_marketing.metadata.filter(key='_fbc').exists()
+        return bool(self.attribution and self.attribution.fbc)
     
     def formatted_number(self):
         return format_phone_number(self.phone_number)
@@ -847,7 +855,7 @@ class AdSpend(models.Model):
     ad_spend_id = models.AutoField(primary_key=True)
     date = models.DateField(default=date.today)
     spend = models.FloatField()
-    ad = models.ForeignKey(Ad, related_name='spend', on_delete=models.CASCADE)
+    platform_id = models.IntegerField(choices=[(1, 'Google'), (2, 'Facebook')])
 
     def __str__(self):
         return self.amount
@@ -906,6 +914,46 @@ class LeadMarketingMetadata(models.Model):
             models.UniqueConstraint(fields=['lead_marketing', 'key'], name='unique_lead_marketing_key')
         ]
 
+class LeadAttribution(models.Model):
+    """
+    Click IDs and ad hierarchy for a lead, normalized from its marketing metadata whenever that
+    metadata or the lead's ad changes (see core.logic.tracking.attribution).
+    """
+    lead_attribution_id = models.AutoField(primary_key=True)
+    lead_marketing = models.OneToOneField(LeadMarketing, related_name='attribution', db_column='lead_marketing_id', on_delete=models.CASCADE)
+    gclid = models.TextField(null=True)
+    gbraid = models.TextField(null=True)
+    wbraid = models.TextField(null=True)
+    fbc = models.TextField(null=True)
+    fbp = models.TextField(null=True)
+    fbclid = models.TextField(null=True)
+    ga = models.TextField(null=True)
+    has_google_click = models.BooleanField(default=False, db_index=True)
+    has_facebook_click = models.BooleanField(default=False, db_index=True)
+    ad = models.ForeignKey(Ad, related_name='+', null=True, db_column='ad_id', on_delete=models.SET_NULL)
+    ad_group = models.ForeignKey(AdGroup, related_name='+', null=True, on_delete=models.SET_NULL)
+    ad_campaign = models.ForeignKey(AdCampaign, related_name='+', null=True, on_delete=models.SET_NULL)
+    ad_platform = models.ForeignKey(AdPlatform, related_name='lead_attributions', null=True, on_delete=models.SET_NULL)
+    params = models.JSONField(default=dict)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Attribution for Lead Marketing {self.lead_marketing_id}"
+
+    def conversion_data(self) -> dict:
+        """Metadata in the shape the conversion services expect."""
+        data = dict(self.params)
+
+        for key in ('fbc', 'fbp', 'ga', 'gclid', 'gbraid', 'wbraid'):
+            value = getattr(self, key)
+            if value:
+                data[key] = value
+
+        return data
+
+    class Meta:
+        db_table = 'lead_attribution'
+
 class HTTPLog(models.Model):
     http_log_id = models.AutoField(primary_key=True)
     date_created = models.DateTimeField(default=timezone.now)
@@ -927,6 +975,9 @@ class HTTPLog(models.Model):
     class Meta:
         db_table = 'http_log'
         ordering = ["-date_created"]
+        indexes = [
+            models.Index(fields=["date_created"]),
+        ]
 
 class CallTrackingNumber(models.Model):
     call_tracking_number_id = models.AutoField(primary_key=True)
@@ -1373,6 +1424,7 @@ class InternalLog(models.Model):
     pathname = models.TextField(null=True)
     lineno = models.IntegerField(null=True)
     exception = models.TextField(null=True)
+    occurrences = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return f"[{self.date_created}] {self.level} - {self.message[:50]}"
@@ -1380,6 +1432,121 @@ class InternalLog(models.Model):
     class Meta:
         db_table = 'internal_log'
 
+class OutboxStatusChoices(models.TextChoices):
+    PENDING = 'Pending', 'Pending'
+    IN_PROGRESS = 'In Progress', 'In Progress'
+    DELIVERED = 'Delivered', 'Delivered'
+    FAILED = 'Failed', 'Failed'
+
+class OutboxMessage(models.Model):
+    outbox_message_id = models.BigAutoField(primary_key=True)
+    action = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=20, choices=OutboxStatusChoices, default=OutboxStatusChoices.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_delivered = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.action} ({self.status})"
+
+    class Meta:
+        db_table = 'outbox_message'
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+class ConversionUploadStatusChoices(models.TextChoices):
+    PENDING = 'Pending', 'Pending'
+    IN_PROGRESS = 'In Progress', 'In Progress'
+    UPLOADED = 'Uploaded', 'Uploaded'
+    FAILED = 'Failed', 'Failed'
+
+class ConversionUpload(models.Model):
+    conversion_upload_id = models.BigAutoField(primary_key=True)
+    service = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=20, choices=ConversionUploadStatusChoices, default=ConversionUploadStatusChoices.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True)
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_uploaded = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.service} conversion ({self.status})"
+
+    class Meta:
+        db_table = 'conversion_upload'
+        indexes = [
+            models.Index(fields=['service', 'status', 'available_at']),
+        ]
+
+class ProspectingRollup(models.Model):
+    prospecting_rollup_id = models.AutoField(primary_key=True)
+    segment = models.CharField(max_length=50)
+    month = models.DateField()
+    leads = models.IntegerField(default=0)
+    converted_leads = models.IntegerField(default=0)
+    quotes = models.IntegerField(default=0)
+    booked = models.IntegerField(default=0)
+    value = models.FloatField(default=0)
+    date_refreshed = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.segment} {self.month:%Y-%m}"
+
+    class Meta:
+        db_table = 'prospecting_rollup'
+        unique_together = ('segment', 'month')
+
+class WebhookProviderChoices(models.TextChoices):
+    TWILIO = 'twilio', 'Twilio'
+    CALLRAIL = 'callrail', 'CallRail'
+    STRIPE = 'stripe', 'Stripe'
+    FACEBOOK = 'facebook', 'Facebook'
+
+class WebhookEventStatusChoices(models.TextChoices):
+    PENDING = 'Pending', 'Pending'
+    IN_PROGRESS = 'In Progress', 'In Progress'
+    PROCESSED = 'Processed', 'Processed'
+    FAILED = 'Failed', 'Failed'
+
+class WebhookEvent(models.Model):
+    webhook_event_id = models.BigAutoField(primary_key=True)
+    provider = models.CharField(max_length=20, choices=WebhookProviderChoices)
+    event_type = models.CharField(max_length=100)
+    external_id = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=255, null=True)
+    headers = models.JSONField(default=dict)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=WebhookEventStatusChoices, default=WebhookEventStatusChoices.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_processed = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.event_type} {self.external_id} ({self.status})"
+
+    class Meta:
+        db_table = 'webhook_event'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event_type', 'external_id'],
+                name='unique_webhook_event_external_id'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
 class GoogleReview(models.Model):
     review_id = models.AutoField(primary_key=True)
     external_id = models.CharField(max_length=255, unique=True)
@@ -1562,6 +1729,46 @@ class ItemStateChangeHistory(models.Model):
             models.Index(fields=['item', 'target_date']),
         ]
 
+class ItemAvailability(models.Model):
+    """
+    Projection of the inventory ledger: units available for an item from target_date onward,
+    until the next row. Maintained by ItemInventoryManager in the same transaction as each ledger write.
+    """
+    item_availability_id = models.BigAutoField(primary_key=True)
+    item = models.ForeignKey(Item, db_column='item_id', related_name='availability', on_delete=models.CASCADE)
+    target_date = models.DateField()
+    available = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.item} - {self.target_date}: {self.available}"
+
+    class Meta:
+        db_table = 'item_availability'
+        ordering = ['target_date']
+        constraints = [
+            models.UniqueConstraint(fields=['item', 'target_date'], name='unique_item_availability_date'),
+        ]
+
+class OrderStatusChoices(models.TextChoices):
+    ORDER_PLACED = 'Order Placed'
+    ORDER_CANCELLED = 'Order Cancelled'
+    AWAITING_PREPARATION = 'Awaiting Preparation'
+    READY_FOR_DISPATCH = 'Ready for Dispatch'
+    DISPATCHED = 'Dispatched'
+    FINALIZED = 'Finalized'
+
+    # Delivery flow
+    DELIVERY_FAILED = 'Delivery Failed'
+    PENDING_REVIEW_OF_DELIVERY = 'Pending Review of Delivery'
+    DELIVERED = 'Delivered'
+    PENDING_PICK_UP = 'Pending Pick Up'
+    PICKED_UP = 'Picked Up'
+
+    # Pickup-only flow
+    CUSTOMER_PICKED_UP = 'Customer Picked Up'
+    PENDING_CUSTOMER_RETURN = 'Pending Customer Return'
+    CUSTOMER_RETURNED = 'Customer Returned'
+
 class Order(models.Model):
     order_id = models.BigAutoField(primary_key=True)
     lead = models.ForeignKey(Lead, db_column='lead_id', related_name='orders', on_delete=models.CASCADE)
@@ -1571,6 +1778,7 @@ class Order(models.Model):
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
     has_delivery = models.BooleanField(default=True)
+    current_status = models.CharField(max_length=60, choices=OrderStatusChoices, null=True, db_index=True)
 
     def save(self, *args, **kwargs):
         if not self.pk:
@@ -1592,16 +1800,6 @@ class Order(models.Model):
         from core.logic.managers.order import OrderManager
         return OrderManager(self)
     
-    @property
-    def current_status(self):
-        latest_change = (
-            self.changes
-            .select_related("status")
-            .order_by("-date_created")
-            .first()
-        )
-        return latest_change.status.status if latest_change else None
-    
     @property
     def amount(self):
         items_total = sum(
@@ -1711,26 +1909,6 @@ class OrderItemChangeHistory(models.Model):
     class Meta:
         db_table = 'order_item_change_history'
 
-class OrderStatusChoices(models.TextChoices):
-    ORDER_PLACED = 'Order Placed'
-    ORDER_CANCELLED = 'Order Cancelled'
-    AWAITING_PREPARATION = 'Awaiting Preparation'
-    READY_FOR_DISPATCH = 'Ready for Dispatch'
-    DISPATCHED = 'Dispatched'
-    FINALIZED = 'Finalized'
-
-    # Delivery flow
-    DELIVERY_FAILED = 'Delivery Failed'
-    PENDING_REVIEW_OF_DELIVERY = 'Pending Review of Delivery'
-    DELIVERED = 'Delivered'
-    PENDING_PICK_UP = 'Pending Pick Up'
-    PICKED_UP = 'Picked Up'
-
-    # Pickup-only flow
-    CUSTOMER_PICKED_UP = 'Customer Picked Up'
-    PENDING_CUSTOMER_RETURN = 'Pending Customer Return'
-    CUSTOMER_RETURNED = 'Customer Returned'
-
 class OrderStatus(models.Model):
     order_status_id = models.AutoField(primary_key=True)
     status = models.CharField(max_length=60, choices=OrderStatusChoices, unique=True)
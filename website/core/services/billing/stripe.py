@@ -1,4 +1,3 @@
-import requests
 import stripe
 from website import settings
 from core.billing.base import BillingServiceInterface
@@ -14,6 +13,7 @@ from core.messaging import messaging_service
 from core.enums import AlertStatus
 from core.utils import default_alert_handler
 from core.logger import logger
+from core.logic.http.sessions import get_session
 from core.managers.event import EventManager
 
 class StripeBillingService(BillingServiceInterface):
@@ -21,19 +21,36 @@ class StripeBillingService(BillingServiceInterface):
         self.api_key = api_key
         self.webhook_secret = webhook_secret
         self.alert = default_alert_handler
-        self.phone_numbers = [u.forward_phone_number for u in User.objects.filter(is_superuser=True)]
 
         stripe.api_key = self.api_key
 
-    def handle_payment_webhook(self, request):
-        payload = request.body
+    @property
+    def phone_numbers(self) -> list[str]:
+        # Read when a receipt goes out rather than when the service is first touched.
+        return list(User.objects.filter(is_superuser=True).values_list('forward_phone_number', flat=True))
+
+    def verify_payment_webhook(self, request):
+        """Returns the verified Stripe event, or None when the signature is missing or invalid."""
         stripe_signature = request.headers.get('Stripe-Signature')
 
         if not stripe_signature:
+            return None
+
+        try:
+            return stripe.Webhook.construct_event(request.body, stripe_signature, self.webhook_secret)
+        except (ValueError, stripe.SignatureVerificationError):
+            return None
+
+    def handle_payment_webhook(self, request):
+        event = self.verify_payment_webhook(request)
+
+        if event is None:
             return HttpResponse(status=400)
 
+        return self.process_payment_event(event)
+
+    def process_payment_event(self, event):
         try:
-            event = stripe.Webhook.construct_event(payload, stripe_signature, self.webhook_secret)
             event_type = event.get('type')
             data = event.get('data', {}).get('object')
 
@@ -125,7 +142,7 @@ class StripeBillingService(BillingServiceInterface):
             receipt_url = charge.get("receipt_url")
             if receipt_url:
                 try:
-                    response = requests.get(receipt_url)
+                    response = get_session('stripe').get(receipt_url)
                     if response.status_code == 200:
                         filename = f"{invoice.external_id}.html"
                         invoice.receipt.save(filename, ContentFile(response.content), save=True)
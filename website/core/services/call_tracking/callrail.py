@@ -1,10 +1,11 @@
+import base64
+import hashlib
+import hmac
 import json
-import mimetypes
 import os
 import uuid
 
-from django.http import HttpResponse
-from django.core.files.base import ContentFile
+from django.http import HttpRequest, HttpResponse
 from django.core.files import File
 import requests
 
@@ -15,7 +16,6 @@ from website import settings
 from core.models import (
     Lead,
     Message,
-    MessageMedia,
     PhoneCall,
     PhoneCallTranscription,
     TrackingPhoneCall,
@@ -24,10 +24,14 @@ from core.models import (
     TrackingTextMessageMetadata,
     User,
 )
-from core.utils import cleanup_dir_files, convert_audio_format, convert_video_to_mp4, create_generic_file_name, download_file_from_url, get_content_type_from_url, handle_create_lead_from_inbound_communication, normalize_phone_number
-from core.messaging.utils import MIME_EXTENSION_MAP
+from core.utils import cleanup_dir_files, handle_create_lead_from_inbound_communication, normalize_phone_number
+from core.logic.helpers.media import download_file_from_url
 from core.transcription import transcription_service
 from core.calling import calling_service
+from core.logic.media.sources import MediaSource
+from core.logic.outbox.publisher import outbox
+from core.logic.cache.counters import unread_message_counter
+from core.logic.http.sessions import get_session
 
 CALLRAIL_FIELDS = [
     "agent_email",
@@ -98,6 +102,19 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
     def __init__(self):
         self.account_id = settings.CALL_RAIL_ACCOUNT_ID
         self.api_key = settings.CALL_RAIL_API_KEY
+        self.signing_key = settings.CALL_RAIL_WEBHOOK_SIGNATURE_SECRET_TOKEN
+
+    def verify_request(self, request: HttpRequest) -> bool:
+        """CallRail signs each webhook with a base64 HMAC-SHA1 of the raw body in the `Signature` header."""
+        if settings.DEBUG:
+            return True
+
+        signature = request.headers.get("Signature")
+        if not signature or not self.signing_key:
+            return False
+
+        digest = hmac.new(self.signing_key.encode("utf-8"), request.body, hashlib.sha1).digest()
+        return hmac.compare_digest(base64.b64encode(digest).decode("ascii"), signature)
 
     def handle_inbound_tracking_call(self, request) -> HttpResponse:
         try:
@@ -160,9 +177,18 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
             return HttpResponse("An unexpected error occurred.", status=500)
     
     def handle_inbound_tracking_call_end(self, request) -> HttpResponse:
+        if not self.verify_request(request):
+            return HttpResponse("Invalid CallRail signature.", status=403)
+
         try:
             data = json.loads(request.body.decode("utf-8"))
+        except ValueError:
+            return HttpResponse("Invalid JSON.", status=400)
 
+        return self.process_inbound_tracking_call_end(data)
+
+    def process_inbound_tracking_call_end(self, data: dict) -> HttpResponse:
+        try:
             resource_id = data.get('resource_id')
             tracking_phone_call = TrackingPhoneCall.objects.get(external_id=resource_id)
             tracking_phone_call.status = data.get('call_type')
@@ -257,47 +283,16 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
             message.is_read = False
             message.is_notified = False
             message.save()
+            unread_message_counter.incr()
 
-            for media_url in data.get('media_urls'):
-                content_type = get_content_type_from_url(media_url)
-
-                source_ext = mimetypes.guess_extension(content_type) or MIME_EXTENSION_MAP.get(content_type, '.bin')
-                source_file_name = create_generic_file_name(content_type, source_ext)
-                source_file_path = os.path.join(settings.UPLOADS_URL, source_file_name)
-
-                # Download the media file
-                headers = {
-                    "Authorization": f"Token token={self.api_key}"
-                }
-                download_file_from_url(url=media_url, local_file_path=source_file_path, headers=headers)
-
-                # Handle audio conversion to mp3
-                if content_type.startswith("audio/"):
-                    target_file_name = create_generic_file_name(content_type, '.mp3')
-                    target_file_path = os.path.join(settings.UPLOADS_URL, target_file_name)
-                    target_content_type = "audio/mpeg"
-
-                    with open(source_file_path, 'rb') as source_file:
-                        buffer = convert_audio_format(file=source_file, target_file_path=target_file_path, to_format="mp3")
-
-                    media = MessageMedia(message=message, content_type=target_content_type)
-                    media.file.save(target_file_name, ContentFile(buffer.read()))
-
-                # Handle video conversion to mp4
-                elif content_type.startswith("video/"):
-                    target_file_name = create_generic_file_name(content_type, '.mp4')
-                    target_file_path = os.path.join(settings.UPLOADS_URL, target_file_name)
-
-                    convert_video_to_mp4(source_file_path, target_file_path)
-
-                    with open(target_file_path, 'rb') as target_video_file:
-                        media = MessageMedia(message=message, content_type='video/mp4')
-                        media.file.save(target_file_name, ContentFile(target_video_file.read()))
-                else:
-                    # Handle image files
-                    with open(source_file_path, 'rb') as f:
-                        media = MessageMedia(message=message, content_type=content_type)
-                        media.file.save(source_file_name, ContentFile(f.read()))
+            for i, media_url in enumerate(data.get('media_urls') or []):
+                outbox.process_inbound_media(
+                    message,
+                    media_url=media_url,
+                    content_type=None,
+                    source=MediaSource.CALLRAIL,
+                    idempotency_key=f"media:{message.external_id}:{i}",
+                )
 
             lead, created = Lead.objects.get_or_create(
                 full_name=data.get("formatted_customer_name", 'Wireless Caller'),
@@ -321,7 +316,7 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
         params = {
             "fields": ",".join(CALLRAIL_FIELDS)
         }
-        response = requests.get(url, headers=headers, params=params)
+        response = get_session('callrail').get(url, headers=headers, params=params)
         response.raise_for_status()
         return response.json()
     
@@ -347,7 +342,7 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
         all_calls = []
 
         while True:
-            response = requests.get(url, headers=headers, params=params)
+            response = get_session('callrail').get(url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -371,7 +366,7 @@ class CallRailTrackingService(CallingTrackingServiceInterface):
         }
 
         try:
-            response = requests.get(url, headers=headers)
+            response = get_session('callrail').get(url, headers=headers)
 
             if response.status_code == 404:
                 logger.warning(f"Recording not found for call_id={call_id}")
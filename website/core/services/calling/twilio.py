@@ -10,7 +10,8 @@ from twilio.request_validator import RequestValidator
 from twilio.rest import Client
 
 from core.models import CallTrackingNumber, Lead, LeadNote, Message, PhoneCallStatusHistory, User
-from core.utils import cleanup_dir_files, download_file_from_twilio, str_to_datetime
+from core.utils import cleanup_dir_files, str_to_datetime
+from core.logic.helpers.media import download_file_from_twilio
 from website import settings
 from core.logger import logger
 from .base import CallingServiceInterface
@@ -1,9 +1,43 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import connection
 from django.utils.module_loading import import_string
 from django.conf import settings
 
+from core.logger import logger
+
+@dataclass
+class BackendResult:
+    service: str
+    ok: bool
+    skipped: bool = False
+    timed_out: bool = False
+    error: str | None = None
+    response: Any = None
+    duration_seconds: float = 0.0
+
+@dataclass
+class BackendMetrics:
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
 class ConversionServiceLoader:
     def __init__(self):
         self._instances = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.metrics: dict[str, BackendMetrics] = {}
 
     def get(self, key):
         """Get the service instance either from settings or internal registry."""
@@ -26,22 +60,110 @@ class ConversionServiceLoader:
         keys = set(settings.CONVERSION_SERVICES.keys())
         return [self.get(key) for key in keys]
 
-    def send_conversion(self, data: dict):
-        """Send the conversion data to all registered services."""
-        for service in self.all_services():
-            try:
-                service.send_conversion(data)
-            except Exception as e:
-                print(f'Error while sending conversion. {str(e)}')
-                continue
-    
-    def retract_conversion(self, data: dict):
-        for service in self.all_services():
+    def send_conversion(self, data: dict) -> dict[str, BackendResult]:
+        """Send the conversion data to all registered services at once."""
+        return self._dispatch(self._send, data)
+
+    def retract_conversion(self, data: dict) -> dict[str, BackendResult]:
+        return self._dispatch(self._retract, data)
+
+    def _send(self, key: str, data: dict) -> BackendResult:
+        service = self.get(key)
+        if not service.accepts(data):
+            return BackendResult(service=key, ok=True, skipped=True)
+
+        result = service.send_conversions([data])[0]
+        return BackendResult(service=key, ok=result.ok, error=result.error, response=result.response)
+
+    def _retract(self, key: str, data: dict) -> BackendResult:
+        service = self.get(key)
+        if not hasattr(service, 'retract_conversion'):
+            return BackendResult(service=key, ok=True, skipped=True)
+
+        response = service.retract_conversion(data)
+        return BackendResult(
+            service=key,
+            ok=response is not None,
+            error=None if response is not None else 'Retraction was not accepted.',
+            response=response,
+        )
+
+    def _dispatch(self, call, data: dict) -> dict[str, BackendResult]:
+        """
+        Runs `call` for every registered service on a shared thread pool, so the total latency is
+        that of the slowest backend rather than the sum. A backend that overruns its TIMEOUT is
+        reported as timed out and left to finish in the background.
+        """
+        pool = self._get_pool()
+
+        # Instantiate services here rather than racing to do it on the pool.
+        self.all_services()
+
+        started = time.monotonic()
+        futures = {key: pool.submit(self._timed, call, key, data) for key in settings.CONVERSION_SERVICES}
+
+        results = {}
+        for key, future in futures.items():
+            timeout = settings.CONVERSION_SERVICES[key].get("TIMEOUT", settings.CONVERSION_DISPATCH_TIMEOUT)
+            remaining = max(0, started + timeout - time.monotonic())
+
             try:
-                if hasattr(service, 'retract_conversion'):
-                    service.retract_conversion(data)
-            except Exception as e:
-                print(f'Error while retracting conversion. {str(e)}')
-                continue
+                results[key] = future.result(timeout=remaining)
+            except TimeoutError:
+                results[key] = BackendResult(
+                    service=key,
+                    ok=False,
+                    timed_out=True,
+                    error=f'No response within {timeout}s.',
+                    duration_seconds=time.monotonic() - started,
+                )
+
+            self._record(results[key])
+
+        return results
+
+    def submit(self, fn, *args) -> Future:
+        """Runs `fn(*args)` on the dispatch pool and closes the thread's connection afterwards."""
+        return self._get_pool().submit(self._closing, fn, *args)
+
+    @staticmethod
+    def _closing(fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            connection.close()
+
+    def _timed(self, call, key: str, data: dict) -> BackendResult:
+        started = time.monotonic()
+
+        try:
+            result = call(key, data)
+        except Exception as e:
+            logger.error(f'Conversion backend {key} failed: {e}', exc_info=True)
+            result = BackendResult(service=key, ok=False, error=str(e))
+        finally:
+            # Pool threads each hold their own connection.
+            connection.close()
+
+        result.duration_seconds = time.monotonic() - started
+        return result
+
+    def _record(self, result: BackendResult):
+        with self._lock:
+            metrics = self.metrics.setdefault(result.service, BackendMetrics())
+            metrics.calls += 1
+            metrics.failures += not result.ok
+            metrics.timeouts += result.timed_out
+            metrics.total_seconds += result.duration_seconds
+            metrics.last_seconds = result.duration_seconds
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=settings.CONVERSION_DISPATCH_WORKERS,
+                    thread_name_prefix='conversions',
+                )
+            return self._pool
 
-conversion_service = ConversionServiceLoader()
\ No newline at end of file
+conversion_service = ConversionServiceLoader()
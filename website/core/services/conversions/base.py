@@ -1,11 +1,23 @@
 import hashlib
 from abc import ABC, abstractmethod
-from core.http.base import BaseHttpClient
+from dataclasses import dataclass
+from typing import Any, Callable
+from core.logic.http.base import BaseHttpClient
 from core.logger import logger
 
+@dataclass
+class ConversionResult:
+    ok: bool
+    error: str | None = None
+    response: dict | None = None
+    retryable: bool = True
+
 class ConversionService(ABC):
+    # Largest number of conversions the platform accepts in one upload.
+    max_batch_size = 1
+
     def __init__(self, **options):
-        self.http = BaseHttpClient()
+        self.http = BaseHttpClient(service=self._get_service_name())
         self.options = options
 
     @abstractmethod
@@ -43,5 +55,36 @@ class ConversionService(ABC):
             logger.error(e, exc_info=True, stack_info=True)
             raise Exception(str(e))
 
+    def accepts(self, data: dict) -> bool:
+        return bool(self._is_valid(data))
+
+    def send_conversions(self, items: list[dict]) -> list[ConversionResult]:
+        """
+        Uploads several conversions and returns one result per item, in order. Platforms with a
+        batch endpoint override this; the default sends them one at a time.
+        """
+        results = []
+        for data in items:
+            try:
+                self.send_conversion(data)
+                results.append(ConversionResult(ok=True))
+            except Exception as e:
+                results.append(ConversionResult(ok=False, error=str(e)))
+        return results
+
+    def _build_payloads(self, items: list[dict], build: Callable[[dict], Any]) -> tuple[dict[int, Any], dict[int, ConversionResult]]:
+        """
+        Builds the upload payload of each item, keyed by its index. An item whose payload can't be
+        built gets a non-retryable failure of its own instead of failing the rest of the batch.
+        """
+        payloads, failures = {}, {}
+        for index, data in enumerate(items):
+            try:
+                payloads[index] = build(data)
+            except Exception as e:
+                logger.error(f"Could not build {self._get_service_name()} conversion payload: {e}", exc_info=True)
+                failures[index] = ConversionResult(ok=False, error=f"Invalid conversion data: {e}", retryable=False)
+        return payloads, failures
+
     def hash_to_sha256(self, value: str) -> str:
         return hashlib.sha256(value.encode("utf-8")).hexdigest() if value else None
\ No newline at end of file
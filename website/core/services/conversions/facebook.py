@@ -1,9 +1,14 @@
 import re
 from django.utils import timezone
 from website import settings
-from .base import ConversionService
+from .base import ConversionResult, ConversionService
+
+# Graph API error code for a malformed or rejected parameter.
+INVALID_PARAMETER = 100
 
 class FacebookConversionService(ConversionService):
+    max_batch_size = 1000
+
     def _construct_payload(self, data: dict) -> dict:
         instant_form_lead_id = data.get('instant_form_lead_id')
 
@@ -82,6 +87,42 @@ class FacebookConversionService(ConversionService):
             'data': [event]
         }
     
+    def send_conversions(self, items: list[dict]) -> list[ConversionResult]:
+        payloads, results = self._build_payloads(items, self._construct_payload)
+
+        if payloads:
+            indices = list(payloads)
+            results.update(zip(indices, self._send_payloads([payloads[index] for index in indices])))
+
+        return [results[index] for index in range(len(items))]
+
+    def _send_payloads(self, payloads: list[dict]) -> list[ConversionResult]:
+        events = [event for payload in payloads for event in payload['data']]
+
+        try:
+            response = self.http.request(
+                method="POST",
+                url=self._get_endpoint(),
+                payload={'data': events},
+                headers={"Content-Type": "application/json"}
+            )
+            body = response.json()
+        except Exception as e:
+            return [ConversionResult(ok=False, error=str(e)) for _ in payloads]
+
+        if response.ok:
+            return [ConversionResult(ok=True, response=body) for _ in payloads]
+
+        error = body.get('error') or {}
+        if error.get('code') != INVALID_PARAMETER:
+            return [ConversionResult(ok=False, error=str(error or body), response=body) for _ in payloads]
+
+        # One bad event rejects the whole request; send them separately to find out which.
+        if len(payloads) > 1:
+            return [result for payload in payloads for result in self._send_payloads([payload])]
+
+        return [ConversionResult(ok=False, error=str(error), response=body, retryable=False)]
+
     def _add_valid_property(self, target: dict, key: str, value):
         if value:
             target[key] = value
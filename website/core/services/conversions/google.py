@@ -2,19 +2,24 @@ from datetime import datetime
 from django.utils import timezone
 from website import settings
 from core.logger import logger
-from .base import ConversionService
-from core.google.api import google_api_service
+from .base import ConversionResult, ConversionService
+from core.services.google.api import google_api_service
 from google.protobuf.json_format import MessageToDict
 from google.rpc import status_pb2
 
 
 class GoogleAdsConversionService(ConversionService):
+    max_batch_size = 2000
+
     def __init__(self, **options: dict):
         super().__init__(**options)
-        self.client = google_api_service.google_ads_client
         self.customer_id = settings.GOOGLE_ADS_CUSTOMER_ID
         self.conversion_actions = options.get("conversion_actions", {})
 
+    @property
+    def client(self):
+        return google_api_service.google_ads_client
+
     def _get_service_name(self) -> str:
         return "google_ads"
 
@@ -58,41 +63,7 @@ class GoogleAdsConversionService(ConversionService):
 
         payload = self._construct_payload(data)
         try:
-            upload_service = self.client.get_service("ConversionUploadService")
-            action_service = self.client.get_service("ConversionActionService")
-            click_conversion = self.client.get_type("ClickConversion")
-
-            click_conversion.conversion_action = action_service.conversion_action_path(
-                payload["customer_id"], payload["conversion_action_id"]
-            )
-            if payload.get("gclid"):
-                click_conversion.gclid = payload["gclid"]
-            
-            if payload.get("gbraid"):
-                click_conversion.gbraid = payload["gbraid"]
-            
-            if payload.get("wbraid"):
-                click_conversion.wbraid = payload["wbraid"]
-
-            click_conversion.consent.ad_user_data = self.client.enums.ConsentStatusEnum.GRANTED
-            click_conversion.consent.ad_personalization = self.client.enums.ConsentStatusEnum.GRANTED
-            click_conversion.conversion_date_time = payload["conversion_date_time"]
-            click_conversion.currency_code = settings.DEFAULT_CURRENCY
-
-            if payload.get("order_id"):
-                click_conversion.order_id = str(payload["order_id"])
-            elif payload.get("lead_id"):
-                click_conversion.order_id = str(payload["lead_id"])
-            
-            if payload.get("conversion_value"):
-                click_conversion.conversion_value = float(payload["conversion_value"])
-
-            request = self.client.get_type("UploadClickConversionsRequest")
-            request.customer_id = payload["customer_id"]
-            request.conversions.append(click_conversion)
-            request.partial_failure = True
-
-            response = upload_service.upload_click_conversions(request=request)
+            response = self._upload([self._build_click_conversion(payload)])
 
             print("\n=== GOOGLE ADS CONVERSION UPLOAD RESPONSE ===")
 
@@ -115,7 +86,91 @@ class GoogleAdsConversionService(ConversionService):
         except Exception as e:
             logger.exception(f"Error during Google Ads conversion upload: {e}", exc_info=True)
             return None
-    
+
+    def send_conversions(self, items: list[dict]) -> list[ConversionResult]:
+        conversions, results = self._build_payloads(items, lambda data: self._build_click_conversion(self._construct_payload(data)))
+        if not conversions:
+            return [results[index] for index in range(len(items))]
+
+        # Partial failures report positions in the request, which skips the items that failed to build.
+        indices = list(conversions)
+
+        try:
+            response = self._upload([conversions[index] for index in indices])
+        except Exception as e:
+            logger.exception(f"Error during Google Ads conversion upload: {e}", exc_info=True)
+            results.update({index: ConversionResult(ok=False, error=str(e)) for index in indices})
+            return [results[index] for index in range(len(items))]
+
+        errors = self._partial_failure_errors(response)
+        for position, index in enumerate(indices):
+            if position in errors:
+                # Partial failures are problems with the conversion itself (unknown click ID, too old, ...).
+                results[index] = ConversionResult(ok=False, error=errors[position], retryable=False)
+            else:
+                result = response.results[position]
+                results[index] = ConversionResult(ok=True, response=type(result).to_dict(result))
+
+        return [results[index] for index in range(len(items))]
+
+    def _build_click_conversion(self, payload: dict):
+        action_service = self.client.get_service("ConversionActionService")
+        click_conversion = self.client.get_type("ClickConversion")
+
+        click_conversion.conversion_action = action_service.conversion_action_path(
+            payload["customer_id"], payload["conversion_action_id"]
+        )
+        if payload.get("gclid"):
+            click_conversion.gclid = payload["gclid"]
+
+        if payload.get("gbraid"):
+            click_conversion.gbraid = payload["gbraid"]
+
+        if payload.get("wbraid"):
+            click_conversion.wbraid = payload["wbraid"]
+
+        click_conversion.consent.ad_user_data = self.client.enums.ConsentStatusEnum.GRANTED
+        click_conversion.consent.ad_personalization = self.client.enums.ConsentStatusEnum.GRANTED
+        click_conversion.conversion_date_time = payload["conversion_date_time"]
+        click_conversion.currency_code = settings.DEFAULT_CURRENCY
+
+        if payload.get("order_id"):
+            click_conversion.order_id = str(payload["order_id"])
+        elif payload.get("lead_id"):
+            click_conversion.order_id = str(payload["lead_id"])
+
+        if payload.get("conversion_value"):
+            click_conversion.conversion_value = float(payload["conversion_value"])
+
+        return click_conversion
+
+    def _upload(self, click_conversions: list):
+        upload_service = self.client.get_service("ConversionUploadService")
+
+        request = self.client.get_type("UploadClickConversionsRequest")
+        request.customer_id = self.customer_id
+        request.conversions.extend(click_conversions)
+        request.partial_failure = True
+
+        return upload_service.upload_click_conversions(request=request)
+
+    def _partial_failure_errors(self, response) -> dict[int, str]:
+        """Maps the index of each rejected conversion in the request to its error messages."""
+        errors: dict[int, list[str]] = {}
+        if not response.partial_failure_error.code:
+            return {}
+
+        failure_type = type(self.client.get_type("GoogleAdsFailure"))
+        for detail in response.partial_failure_error.details:
+            failure = failure_type.deserialize(detail.value)
+            for error in failure.errors:
+                for element in error.location.field_path_elements:
+                    if element.field_name == "conversions":
+                        errors.setdefault(element.index, []).append(error.message)
+                        break
+
+        return {index: "; ".join(messages) for index, messages in errors.items()}
+
     def retract_conversion(self, data: dict):
         if not self._is_valid(data):
             return None
@@ -1,4 +1,3 @@
-import requests
 from requests.auth import HTTPBasicAuth
 
 from django.http import HttpResponse
@@ -7,6 +6,7 @@ from django.core.exceptions import ValidationError
 from core.delivery.base import DeliveryServiceInterface
 from core.models import DriverStop
 from core.logger import logger
+from core.logic.http.sessions import get_session
 
 CIRCUIT_BASE_URL = "https://api.getcircuit.com/public/v0.2b"
 
@@ -82,7 +82,7 @@ class SpokeDeliveryService(DeliveryServiceInterface):
         if depot:
             payload["depot"] = depot
 
-        response = requests.post(
+        response = get_session('spoke').post(
             f"{CIRCUIT_BASE_URL}/plans",
             auth=HTTPBasicAuth(self.api_key, ""),
             json=payload,
@@ -5,6 +5,8 @@ import requests
 from core.facebook.api.base import FacebookAPIServiceInterface
 from core.models import Ad, AdSpend, FacebookAccessToken
 from core.logger import logger
+from core.logic.cache.tokens import facebook_tokens
+from core.logic.http.sessions import get_session
 from website import settings
 from core.utils import get_facebook_token_expiry_date, normalize_phone_number
 from marketing.utils import create_ad_from_params, parse_datetime
@@ -12,12 +14,19 @@ from marketing.enums import ConversionServiceType
 
 class FacebookAPIService(FacebookAPIServiceInterface):
     def __init__(self, api_version: str, app_id: str, app_secret: str, account_id: str):
-        self.page_access_token = FacebookAccessToken.objects.order_by('-date_created').first()
         self.api_version = api_version
         self.app_id = app_id
         self.app_secret = app_secret
         self.account_id = account_id
 
+    @property
+    def page_access_token(self) -> FacebookAccessToken | None:
+        return facebook_tokens.get()
+
+    @property
+    def session(self):
+        return get_session('facebook')
+
     def get_lead_data(self, lead):
         try:
             leadgen_id = lead.get("leadgen_id")
@@ -34,7 +43,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
                         "adset_id,adset_name,created_time,is_organic,ad_name,platform"
             }
 
-            response = requests.get(url, params=params, timeout=20)
+            response = self.session.get(url, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
 
@@ -60,7 +69,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
                 'fields': 'instagram_accounts{followers_count}'
             }
 
-            response = requests.get(url, params=params, timeout=20)
+            response = self.session.get(url, params=params, timeout=20)
             response.raise_for_status()
 
             data = response.json()
@@ -88,7 +97,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
             'fields': 'leadgen_forms{id}',
         }
 
-        response = requests.get(url, params=params, timeout=20)
+        response = self.session.get(url, params=params, timeout=20)
         if response.status_code != 200:
             raise Exception(f"Error fetching leadgen_forms: {response.json()}")
 
@@ -108,7 +117,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
         }
 
         while url:
-            response = requests.get(url, params=params, timeout=20)
+            response = self.session.get(url, params=params, timeout=20)
             if response.status_code != 200:
                 raise Exception(f"Error fetching leads for form {form_id}: {response.json()}")
 
@@ -132,7 +141,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
         }
 
         try:
-            response = requests.get('https://graph.facebook.com/oauth/access_token', params=params, timeout=20)
+            response = self.session.get('https://graph.facebook.com/oauth/access_token', params=params, timeout=20)
             response.raise_for_status()
         except requests.RequestException as e:
             logger.error(e, exc_info=True)
@@ -146,7 +155,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
         )
         token.save()
 
-        self.page_access_token = token
+        facebook_tokens.set(token)
 
     def _normalize_field_name(self, field_name):
         FIELD_MAP = {
@@ -233,7 +242,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
             else:
                 params["date_preset"] = "last_7d"
 
-            response = requests.get(url, params=params, timeout=20)
+            response = self.session.get(url, params=params, timeout=20)
             response.raise_for_status()
 
             data = response.json()
@@ -275,7 +284,7 @@ class FacebookAPIService(FacebookAPIServiceInterface):
 
             all_ads = []
             while url:
-                response = requests.get(url, params=params if "after" not in url else None, timeout=20)
+                response = self.session.get(url, params=params if "after" not in url else None, timeout=20)
 
                 response.raise_for_status()
                 data = response.json()
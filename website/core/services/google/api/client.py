@@ -1,6 +1,7 @@
 import base64
 from email.mime.text import MIMEText
 from datetime import timedelta
+from functools import cached_property
 
 from django.conf import settings
 from django.utils import timezone
@@ -9,31 +10,63 @@ from googleapiclient.discovery import build
 
 from google.ads.googleads.client import GoogleAdsClient
 
-from core.models import AdPlatform, AdPlatformChoices, AdSpend, GoogleAccessToken
+from core.models import AdPlatformChoices, AdSpend
 from core.logger import logger
-from core.utils import load_google_credentials
+from core.logic.cache.tokens import google_credentials
+from core.logic.cache.lookups import ad_platforms
 
 class GoogleAPIService:
+    """
+    Discovery and Ads clients are built on first use, so a process that only sends email never
+    builds a Google Ads client. Credentials come from the shared, refresh-ahead token cache; a
+    discovery client is rebuilt whenever the cache hands out new credentials.
+    """
+
     def __init__(self):
-        self.token = GoogleAccessToken.objects.order_by("-date_created").first()
-        if not self.token:
+        self._clients = {}
+
+    @property
+    def creds(self):
+        creds = google_credentials.get()
+        if not creds:
             raise Exception("No Google access token found in DB.")
+        return creds
+
+    @property
+    def gmail(self):
+        return self._client("gmail", "v1")
+
+    @property
+    def sheets(self):
+        return self._client("sheets", "v4")
+
+    @property
+    def calendar(self):
+        return self._client("calendar", "v3")
+
+    @cached_property
+    def google_ads_client(self):
+        # The Ads client only holds the refresh token and exchanges it itself.
+        return self.build_ads_client()
 
-        self.creds = load_google_credentials()
-        self.gmail = self.build("gmail", "v1")
-        self.sheets = self.build("sheets", "v4")
-        self.google_ads_client = self.build_ads_client()
-        self.calendar = self.build("calendar", "v3")
+    def _client(self, api_name: str, api_version: str):
+        creds = self.creds
+        cached = self._clients.get(api_name)
+        if cached is None or cached[0] is not creds:
+            cached = (creds, self.build(api_name, api_version))
+            self._clients[api_name] = cached
+        return cached[1]
 
     def build(self, api_name: str, api_version: str):
         return build(api_name, api_version, credentials=self.creds)
     
     def build_ads_client(self):
+        creds = self.creds
         return GoogleAdsClient.load_from_dict({
             "developer_token": settings.GOOGLE_ADS_DEVELOPER_TOKEN,
-            "client_id": self.creds.client_id,
-            "client_secret": self.creds.client_secret,
-            "refresh_token": self.creds.refresh_token,
+            "client_id": creds.client_id,
+            "client_secret": creds.client_secret,
+            "refresh_token": creds.refresh_token,
             "login_customer_id": settings.GOOGLE_ADS_CUSTOMER_ID,
             "use_proto_plus": True,
         })
@@ -123,12 +156,12 @@ class GoogleAPIService:
                     date = row.segments.date
                     spend = row.metrics.cost_micros / 1_000_000
 
-                    platform = AdPlatform.objects.get(name=AdPlatformChoices.GOOGLE)
+                    platform = ad_platforms.get(AdPlatformChoices.GOOGLE)
 
                     AdSpend.objects.create(
                         spend=spend,
                         date=date,
-                        ad_platform=platform,
+                        platform_id=platform.pk,
                     )
                 
         except Exception as e:
@@ -1,51 +1,55 @@
-import mimetypes
-import os
-
-from django.http import HttpRequest, HttpResponse
-from django.core.files.base import ContentFile
+from django.http import HttpRequest, HttpResponse, QueryDict
 from django.utils.timezone import make_aware, is_naive
 
 from twilio.request_validator import RequestValidator
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
-from core.utils import cleanup_dir_files, convert_audio_format, convert_video_to_mp4, create_generic_file_name, download_file_from_twilio, str_to_datetime
+from core.utils import str_to_datetime
 from core.models import Message, MessageMedia
 
 from communication.forms import MessageForm
 from communication.enums import TwilioWebhookCallbacks
 from .base import MessagingServiceInterface
-from .utils import MIME_EXTENSION_MAP
 from core.logger import logger
+from core.logic.media.sources import MediaSource
+from core.logic.outbox.publisher import outbox
+from core.logic.cache.counters import unread_message_counter
 
-from website.settings import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, UPLOADS_URL, DEBUG
+from website.settings import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, DEBUG
 
 class TwilioMessagingService(MessagingServiceInterface):
     def __init__(self):
         self.client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
         self.validator = RequestValidator(TWILIO_AUTH_TOKEN)
 
+    def verify_request(self, request: HttpRequest) -> bool:
+        if DEBUG:
+            return True
+
+        return self.validator.validate(
+            request.build_absolute_uri(),
+            request.POST,
+            request.META.get("HTTP_X_TWILIO_SIGNATURE")
+        )
+
     def handle_inbound_message(self, request: HttpRequest) -> HttpResponse:
         if request.method != "POST":
             return HttpResponse("Only POST allowed", status=405)
 
-        if not DEBUG:
-            valid = self.validator.validate(
-                request.build_absolute_uri(),
-                request.POST,
-                request.META.get("HTTP_X_TWILIO_SIGNATURE")
-            )
+        if not self.verify_request(request):
+            return HttpResponse("Invalid Twilio signature.", status=403)
 
-            if not valid:
-                return HttpResponse("Invalid Twilio signature.", status=403)
+        return self.process_inbound_message(request.POST)
 
+    def process_inbound_message(self, data: QueryDict) -> HttpResponse:
         try:
-            message_sid = request.POST.get("MessageSid")
-            text_from = request.POST.get("From")
-            text_to = request.POST.get("To")
-            body = request.POST.get("Body", "")
-            num_media = int(request.POST.get("NumMedia", 0))
-            sms_status = request.POST.get("SmsStatus")
+            message_sid = data.get("MessageSid")
+            text_from = data.get("From")
+            text_to = data.get("To")
+            body = data.get("Body", "")
+            num_media = int(data.get("NumMedia", 0))
+            sms_status = data.get("SmsStatus")
 
             if isinstance(body, str) and not body.strip():
                 body = None
@@ -59,56 +63,27 @@ class TwilioMessagingService(MessagingServiceInterface):
                 status=sms_status,
                 is_read=False,
             )
+            unread_message_counter.incr()
 
             for i in range(num_media):
-                media_url = request.POST.get(f"MediaUrl{i}")
-                content_type = request.POST.get(f"MediaContentType{i}")
-
-                source_ext = mimetypes.guess_extension(content_type) or MIME_EXTENSION_MAP.get(content_type, '.bin')
-                source_file_name = create_generic_file_name(content_type, source_ext)
-                source_file_path = os.path.join(UPLOADS_URL, source_file_name)
+                media_url = data.get(f"MediaUrl{i}")
+                content_type = data.get(f"MediaContentType{i}")
 
                 if not (media_url and content_type):
                     continue
 
-                # Download the media file
-                download_file_from_twilio(twilio_resource=media_url, local_file_path=source_file_path)
-
-                # Handle audio conversion to mp3
-                if content_type.startswith("audio/"):
-                    target_file_name = create_generic_file_name(content_type, '.mp3')
-                    target_file_path = os.path.join(UPLOADS_URL, target_file_name)
-                    target_content_type = "audio/mpeg"
-
-                    with open(source_file_path, 'rb') as source_file:
-                        buffer = convert_audio_format(file=source_file, target_file_path=target_file_path, to_format="mp3")
-
-                    media = MessageMedia(message=message, content_type=target_content_type)
-                    media.file.save(target_file_name, ContentFile(buffer.read()))
-
-                # Handle video conversion to mp4
-                elif content_type.startswith("video/"):
-                    target_file_name = create_generic_file_name(content_type, '.mp4')
-                    target_file_path = os.path.join(UPLOADS_URL, target_file_name)
-
-                    convert_video_to_mp4(source_file_path, target_file_path)
-
-                    with open(target_file_path, 'rb') as target_video_file:
-                        media = MessageMedia(message=message, content_type='video/mp4')
-                        media.file.save(target_file_name, ContentFile(target_video_file.read()))
-                else:
-                    # Handle image files
-                    with open(source_file_path, 'rb') as f:
-                        media = MessageMedia(message=message, content_type=content_type)
-                        media.file.save(source_file_name, ContentFile(f.read()))
+                outbox.process_inbound_media(
+                    message,
+                    media_url=media_url,
+                    content_type=content_type,
+                    source=MediaSource.TWILIO,
+                    idempotency_key=f"media:{message_sid}:{i}",
+                )
 
         except Exception as e:
             logger.error(e, exc_info=True)
             return HttpResponse("Unexpected error occurred.", status=500)
 
-        finally:
-            cleanup_dir_files(UPLOADS_URL)
-
         return HttpResponse("Message received successfully.", status=200)
 
     def handle_outbound_message(self, form: MessageForm) -> None:
@@ -1,7 +1,6 @@
 import json
 import os
 
-import requests
 import boto3
 import time
 
@@ -9,6 +8,7 @@ from website import settings
 from core.models import Lead, LeadNote, PhoneCallTranscription, User
 from core.ai import ai_agent
 from core.utils import normalize_phone_number
+from core.logic.http.sessions import get_session
 
 class AWSTranscriptionService:
     def __init__(self):
@@ -47,7 +47,7 @@ class AWSTranscriptionService:
             print("Transcript URL not found in response.")
             return
 
-        response = requests.get(transcript_url)
+        response = get_session('aws').get(transcript_url)
 
         if response.status_code != 200:
             print('Bad Response for Transcription URL: ', response.status_code)
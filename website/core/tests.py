@@ -1,3 +1,801 @@
+import json
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.utils import timezone
+from google.ads.googleads.client import GoogleAdsClient
+from google.auth.credentials import AnonymousCredentials
+from google.protobuf import any_pb2
+from website import settings
+
+from core.logic.analytics.prospecting import prospecting_rollups
+from core.logic.conversions.worker import ConversionUploadWorker
+from core.logic.managers.item import ItemInventoryManager
+from core.logic.managers.lead import LeadStateManager
+from core.logic.outbox.publisher import outbox
+from core.logic.queues.batch import BackgroundBatchWriter
+from core.logic.outbox.transports import OutboxTransport
+from core.logic.outbox.worker import OutboxWorker
+from core.logic.processors.lead import LeadEngagementProcessor
+from core.logic.tracking.attribution import batched_refresh, refresh_attribution
+from core.logic.webhooks.handlers import registry as webhook_handlers
+from core.logic.webhooks.inbox import webhook_inbox
+from core.logic.webhooks.worker import WebhookWorker
+from core.models import ConversionUpload, ConversionUploadStatusChoices, Invoice, InvoiceType, InvoiceTypeEnum, Item, ItemCategory, ItemState, ItemStateChangeHistory, ItemStateChoices, Lead, LeadEngagementHistory, LeadStatus, LeadStatusChoices, LeadEngagementState, LeadEngagementStateChoices, LeadMarketing, LeadMarketingMetadata, Order, OrderItem, OutboxMessage, OutboxStatusChoices, ProspectingRollup, Quote, QuoteService, Service, ServiceType, UnitType, User, WebhookEvent, WebhookEventStatusChoices, WebhookProviderChoices
+from core.services.conversions import conversion_service
+from core.services.conversions.base import ConversionResult
+from core.services.conversions.google import GoogleAdsConversionService
+from core.services.facebook.api import facebook_api_service
+from core.utils import parse_google_ads_cookie
+
+def make_due(row):
+    """Moves a queued row's backoff or lease into the past."""
+    type(row).objects.filter(pk=row.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+
+class InventoryProjectionTests(TestCase):
+    """The stored ItemAvailability rows must always equal what the raw ledger adds up to."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for choice in ItemStateChoices:
+            ItemState.objects.create(state=choice)
+
+        category = ItemCategory.objects.create(name='Tables')
+        cls.item = Item.objects.create(name='Banquet Table', item_category=category, price=10)
+        cls.lead = Lead.objects.create(full_name='Jane Doe', phone_number='+15555550100')
+
+        cls.start = date(2026, 6, 10)
+        cls.end = date(2026, 6, 12)
+        cls.item.inventory.purchase(10, date(2026, 6, 1))
+
+    def make_order(self, units: int) -> Order:
+        order = Order.objects.create(
+            lead=self.lead,
+            start_date=timezone.make_aware(datetime(self.start.year, self.start.month, self.start.day)),
+            end_date=timezone.make_aware(datetime(self.end.year, self.end.month, self.end.day)),
+        )
+        OrderItem.objects.create(order=order, item=self.item, units=units, price_per_unit=10)
+        return order
+
+    def assertProjectionMatchesLedger(self):
+        manager = ItemInventoryManager(self.item)
+        self.assertEqual(manager.stored_availability(), manager.ledger_availability())
+
+    def test_reserve_items(self):
+        order = self.make_order(units=3)
+
+        ItemInventoryManager.reserve_items(order, [(self.item.pk, 3), (self.item.pk, 1)])
+
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start), 6)
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start - timedelta(days=1)), 10)
+
+    def test_reserve_items_rejects_more_than_available(self):
+        order = self.make_order(units=11)
+
+        with self.assertRaises(ValidationError):
+            ItemInventoryManager.reserve_items(order, [(self.item.pk, 11)])
+
+        self.assertProjectionMatchesLedger()
+        self.assertFalse(ItemStateChangeHistory.objects.filter(order=order).exists())
+
+    def test_reserve_then_return(self):
+        order = self.make_order(units=4)
+
+        self.item.inventory.reserve_item(order)
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start), 6)
+
+        self.item.inventory.return_items(order, self.end)
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start), 6)
+        self.assertEqual(self.item.inventory.available_units_on_date(self.end), 10)
+
+    def test_reserve_then_cancel(self):
+        order = self.make_order(units=4)
+
+        self.item.inventory.reserve_item(order)
+        self.item.inventory.cancel_reservation(order)
+
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start), 10)
+
+    def test_backdated_write_shifts_later_rows(self):
+        order = self.make_order(units=4)
+        self.item.inventory.reserve_item(order)
+
+        self.item.inventory.purchase(5, date(2026, 5, 20))
+        self.item.inventory.decommission(2, date(2026, 6, 11))
+
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.start), 11)
+        self.assertEqual(self.item.inventory.available_units_on_date(self.end), 9)
+
+    def test_rebuild_availability(self):
+        order = self.make_order(units=4)
+        self.item.inventory.reserve_item(order)
+
+        # A row written around the manager leaves the projection stale until it is rebuilt.
+        ItemStateChangeHistory.objects.create(
+            item=self.item,
+            state=ItemState.objects.get(state=ItemStateChoices.SOLD),
+            quantity=1,
+            target_date=self.end,
+        )
+        self.item.inventory.rebuild_availability()
+
+        self.assertProjectionMatchesLedger()
+        self.assertEqual(self.item.inventory.available_units_on_date(self.end), 5)
+
+class FlakyTransport(OutboxTransport):
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.delivered = []
+
+    def deliver(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('Provider unavailable')
+
+        self.delivered.append(message.idempotency_key)
+
+class OutboxTests(TestCase):
+    def test_enqueue_is_idempotent(self):
+        first = outbox.enqueue('email.send_html', {'to': 'a@example.com'}, idempotency_key='order:1:status-change:7:placed-email')
+        second = outbox.enqueue('email.send_html', {'to': 'b@example.com'}, idempotency_key='order:1:status-change:7:placed-email')
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(OutboxMessage.objects.get().payload, {'to': 'a@example.com'})
+
+    def test_delivers_once(self):
+        transport = FlakyTransport()
+        outbox.enqueue('email.send_html', {}, idempotency_key='key')
+
+        worker = OutboxWorker(transport)
+        message = worker.process_next()
+
+        self.assertIsNone(worker.process_next())
+        self.assertEqual(transport.delivered, ['key'])
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.DELIVERED)
+        self.assertEqual(message.attempts, 1)
+        self.assertIsNotNone(message.date_delivered)
+
+    def test_failed_delivery_is_retried_after_backoff(self):
+        transport = FlakyTransport(failures=1)
+        message = outbox.enqueue('email.send_html', {}, idempotency_key='key')
+        worker = OutboxWorker(transport)
+
+        worker.process_next()
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.PENDING)
+        self.assertEqual(message.last_error, 'Provider unavailable')
+        self.assertGreater(message.available_at, timezone.now())
+
+        # Not due until its backoff has passed.
+        self.assertIsNone(worker.process_next())
+
+        make_due(message)
+        worker.process_next()
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.DELIVERED)
+        self.assertEqual(message.attempts, 2)
+        self.assertIsNone(message.last_error)
+        self.assertEqual(transport.delivered, ['key'])
+
+    def test_gives_up_after_max_attempts(self):
+        message = outbox.enqueue('email.send_html', {}, idempotency_key='key')
+        worker = OutboxWorker(FlakyTransport(failures=5))
+
+        with mock.patch.object(settings, 'OUTBOX_MAX_ATTEMPTS', 2):
+            worker.process_next()
+            make_due(message)
+            worker.process_next()
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.FAILED)
+        self.assertEqual(message.attempts, 2)
+
+    def test_expired_lease_is_claimed_again(self):
+        message = outbox.enqueue('email.send_html', {}, idempotency_key='key')
+        queue = OutboxWorker.queue
+
+        [stale] = queue.claim()
+        make_due(message)
+        [fresh] = queue.claim()
+        self.assertEqual(fresh.attempts, 2)
+
+        # The first worker finishing late must not overwrite the new lease holder.
+        stale.status = OutboxStatusChoices.DELIVERED
+        self.assertEqual(queue.release([stale], ['date_delivered']), [])
+
+        fresh.status = OutboxStatusChoices.DELIVERED
+        self.assertEqual(queue.release([fresh], ['date_delivered']), [fresh])
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.DELIVERED)
+
+    def test_expired_lease_on_last_attempt_fails(self):
+        message = outbox.enqueue('email.send_html', {}, idempotency_key='key')
+
+        with mock.patch.object(settings, 'OUTBOX_MAX_ATTEMPTS', 1):
+            OutboxWorker.queue.claim()
+            make_due(message)
+            self.assertEqual(OutboxWorker.queue.claim(), [])
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxStatusChoices.FAILED)
+        self.assertEqual(message.last_error, 'Lease expired after 1 attempt(s).')
+
+class WebhookTests(TestCase):
+    def store(self, body='{"id": 1}', external_id=None) -> WebhookEvent:
+        return webhook_inbox.store(
+            provider=WebhookProviderChoices.STRIPE,
+            event_type='test.event',
+            body=body,
+            external_id=external_id,
+        )
+
+    def test_redelivery_is_stored_once(self):
+        first = self.store(external_id='evt_1')
+        second = self.store(body='{"id": 1, "retry": true}', external_id='evt_1')
+        self.assertEqual(first.pk, second.pk)
+
+        # Without a provider ID the body hash identifies the delivery.
+        self.assertEqual(self.store().pk, self.store().pk)
+        self.assertNotEqual(self.store().pk, self.store(body='{"id": 2}').pk)
+
+        self.assertEqual(WebhookEvent.objects.count(), 3)
+
+    def test_failed_handler_rolls_back_and_is_retried(self):
+        calls = []
+
+        def handler(event):
+            calls.append(event.pk)
+            ItemCategory.objects.create(name=f'Category {len(calls)}')
+            if len(calls) == 1:
+                raise ValueError('Lead not found yet')
+
+        event = self.store()
+        worker = WebhookWorker()
+
+        with mock.patch.dict(webhook_handlers, {'test.event': handler}):
+            worker.process_next()
+            event.refresh_from_db()
+            self.assertEqual(event.status, WebhookEventStatusChoices.PENDING)
+            self.assertEqual(event.last_error, 'Lead not found yet')
+            self.assertFalse(ItemCategory.objects.exists())
+            self.assertIsNone(worker.process_next())
+
+            make_due(event)
+            worker.process_next()
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusChoices.PROCESSED)
+        self.assertEqual(event.attempts, 2)
+        self.assertIsNotNone(event.date_processed)
+        self.assertEqual(list(ItemCategory.objects.values_list('name', flat=True)), ['Category 2'])
+
+    def test_unregistered_event_type_fails_after_max_attempts(self):
+        event = self.store()
+        worker = WebhookWorker()
+
+        with mock.patch.object(settings, 'WEBHOOK_MAX_ATTEMPTS', 1):
+            worker.process_next()
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusChoices.FAILED)
+        self.assertEqual(event.last_error, "No webhook handler registered for 'test.event'.")
+
+    def test_facebook_leadgen_retry_texts_each_lead_once(self):
+        for choice in LeadStatusChoices:
+            LeadStatus.objects.create(status=choice)
+        User.objects.create_user(username='company', phone_number='+15555550000', forward_phone_number=settings.COMPANY_PHONE_NUMBER)
+
+        body = json.dumps({'entry': [{'changes': [
+            {'field': 'leadgen', 'value': {'leadgen_id': '1001'}},
+            {'field': 'leadgen', 'value': {'leadgen_id': '1002'}},
+        ]}]})
+        event = webhook_inbox.store(provider=WebhookProviderChoices.FACEBOOK, event_type='facebook.leadgen', body=body)
+        graph_api_down = True
+
+        def get_lead_data(lead):
+            if lead['leadgen_id'] == '1002' and graph_api_down:
+                raise ConnectionError('Graph API unavailable')
+            return {'phone_number': f"+1555555{lead['leadgen_id']}", 'full_name': 'Jane Doe', 'created_time': timezone.now(), 'platform': 'fb', 'is_organic': True}
+
+        worker = WebhookWorker()
+        # Lead has no lead_status column for LeadStateManager to read; new leads start with no status.
+        no_status = mock.patch.object(LeadStateManager, 'current_status', new_callable=mock.PropertyMock, return_value=None)
+
+        with no_status, mock.patch.object(facebook_api_service, 'get_lead_data', side_effect=get_lead_data):
+            worker.process_next()
+            self.assertFalse(Lead.objects.exists())
+            self.assertFalse(OutboxMessage.objects.filter(action='messaging.send_text').exists())
+
+            graph_api_down = False
+            make_due(event)
+            worker.process_next()
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusChoices.PROCESSED)
+
+        texts = OutboxMessage.objects.filter(action='messaging.send_text', idempotency_key__endswith=':initial-contact')
+        self.assertEqual(texts.count(), 2)
+        self.assertEqual(
+            sorted(texts.values_list('idempotency_key', flat=True)),
+            sorted(f'lead:{pk}:initial-contact' for pk in Lead.objects.values_list('pk', flat=True)),
+        )
+
+class GoogleConversionBatchTests(TestCase):
+    """Partial failures report positions in the request, which must map back to the caller's items."""
+
+    def setUp(self):
+        self.client = GoogleAdsClient(credentials=AnonymousCredentials(), developer_token='test', use_proto_plus=True)
+        patcher = mock.patch.object(GoogleAdsConversionService, 'client', self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.service = GoogleAdsConversionService(conversion_actions={'lead_created': 111})
+        self.items = [
+            {'event_name': 'lead_created', 'gclid': 'gclid-0', 'lead_id': 1, 'event_time': 1760000000},
+            # Can't be built, so it never reaches the request.
+            {'event_name': 'lead_created', 'gclid': 'gclid-1', 'lead_id': 2, 'event_time': 'yesterday'},
+            {'event_name': 'lead_created', 'gclid': 'gclid-2', 'lead_id': 3, 'event_time': 1760000000},
+            {'event_name': 'lead_created', 'gclid': 'gclid-3', 'lead_id': 4, 'event_time': 1760000000},
+        ]
+
+    def make_response(self, gclids: list[str | None], failed_positions: dict[int, str]):
+        response = self.client.get_type('UploadClickConversionsResponse')
+
+        for gclid in gclids:
+            result = self.client.get_type('ClickConversionResult')
+            if gclid:
+                result.gclid = gclid
+            response.results.append(result)
+
+        failure = self.client.get_type('GoogleAdsFailure')
+        for position, message in failed_positions.items():
+            error = self.client.get_type('GoogleAdsError')
+            error.message = message
+            error.location.field_path_elements.append(
+                self.client.get_type('ErrorLocation').FieldPathElement(field_name='conversions', index=position)
+            )
+            failure.errors.append(error)
+
+        if failed_positions:
+            response.partial_failure_error.code = 3
+            response.partial_failure_error.details.append(any_pb2.Any(value=type(failure).serialize(failure)))
+
+        return response
+
+    def test_partial_failure_maps_to_original_index(self):
+        response = self.make_response(['gclid-0', None, 'gclid-3'], {1: 'The click is too old.'})
+
+        with mock.patch.object(self.service, '_upload', return_value=response) as upload:
+            results = self.service.send_conversions(self.items)
+
+        [conversions] = upload.call_args.args
+        self.assertEqual([conversion.gclid for conversion in conversions], ['gclid-0', 'gclid-2', 'gclid-3'])
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].response['gclid'], 'gclid-0')
+
+        self.assertFalse(results[1].ok)
+        self.assertFalse(results[1].retryable)
+        self.assertTrue(results[1].error.startswith('Invalid conversion data'))
+
+        self.assertFalse(results[2].ok)
+        self.assertFalse(results[2].retryable)
+        self.assertEqual(results[2].error, 'The click is too old.')
+
+        self.assertTrue(results[3].ok)
+        self.assertEqual(results[3].response['gclid'], 'gclid-3')
+
+    def test_failed_upload_is_retried_for_built_items_only(self):
+        with mock.patch.object(self.service, '_upload', side_effect=ConnectionError('Deadline exceeded')):
+            results = self.service.send_conversions(self.items)
+
+        self.assertEqual([result.ok for result in results], [False] * 4)
+        self.assertEqual([result.retryable for result in results], [True, False, True, True])
+        self.assertEqual(results[0].error, 'Deadline exceeded')
+
+    def test_missing_results_are_retried(self):
+        uploads = [
+            ConversionUpload.objects.create(service='google', payload=item, idempotency_key=f"key-{index}")
+            for index, item in enumerate(self.items[:3])
+        ]
+        self.service.max_batch_size = 10
+
+        with mock.patch.object(conversion_service, 'get', return_value=self.service), \
+                mock.patch.object(self.service, 'send_conversions', return_value=[ConversionResult(ok=True, response={'gclid': 'gclid-0'})]), \
+                self.assertLogs('internal', level='ERROR'):
+            processed = ConversionUploadWorker().process_service('google', batch_size=10)
+
+        self.assertEqual(processed, 3)
+        for upload in uploads:
+            upload.refresh_from_db()
+
+        self.assertEqual(uploads[0].status, ConversionUploadStatusChoices.UPLOADED)
+        for upload in uploads[1:]:
+            self.assertEqual(upload.status, ConversionUploadStatusChoices.PENDING)
+            self.assertEqual(upload.last_error, 'missing result')
+            self.assertGreater(upload.available_at, timezone.now())
+
+def legacy_conversion_data(lead_marketing: LeadMarketing) -> dict:
+    """The metadata walk _create_data_dict did before LeadAttribution existed."""
+    data = {}
+    for metadata in lead_marketing.metadata.all():
+        if metadata.key == '_fbc':
+            data['fbc'] = metadata.value
+        elif metadata.key == '_fbp':
+            data['fbp'] = metadata.value
+        elif metadata.key == '_ga':
+            data['ga'] = metadata.value
+        elif metadata.key == 'gclid':
+            data['gclid'] = metadata.value
+        elif metadata.key == 'gbraid':
+            data['gbraid'] = metadata.value
+        elif metadata.key == 'wbraid':
+            data['wbraid'] = metadata.value
+        elif metadata.key == '_gcl_aw':
+            if 'gclid' not in data:
+                cookie_click_id = parse_google_ads_cookie(metadata.value)
+                if cookie_click_id:
+                    data['gclid'] = cookie_click_id
+        else:
+            data[metadata.key] = metadata.value
+    return data
+
+class AttributionTests(TestCase):
+    CASES = {
+        'google and facebook clicks': {
+            'gclid': 'Cj0KCQ', '_fbc': 'fb.1.1700000000.AbC', '_fbp': 'fb.1.1700000000.123',
+            '_ga': 'GA1.1.123.456', 'fbclid': 'IwAR0', 'utm_source': 'google', 'utm_campaign': 'spring',
+        },
+        'click ID from the cookie only': {'_gcl_aw': 'GCL.1700000000.CookieClick', 'utm_medium': 'cpc'},
+        'cookie saved before the click ID': {'_gcl_aw': 'GCL.1700000000.CookieClick', 'gclid': 'Cj0KCQ'},
+        'click ID saved before the cookie': {'gclid': 'Cj0KCQ', '_gcl_aw': 'GCL.1700000000.CookieClick'},
+        'unreadable cookie': {'_gcl_aw': 'not-a-cookie', 'source': 'direct'},
+        'app clicks': {'gbraid': '0AAAAA', 'wbraid': 'CjkKEQ'},
+        'no metadata': {},
+    }
+
+    def make_lead_marketing(self, phone_number: str, metadata: dict) -> LeadMarketing:
+        lead = Lead.objects.create(full_name='Jane Doe', phone_number=phone_number)
+        lead_marketing = LeadMarketing.objects.create(lead=lead)
+        for key, value in metadata.items():
+            LeadMarketingMetadata.objects.create(lead_marketing=lead_marketing, key=key, value=value)
+        return lead_marketing
+
+    def test_conversion_data_matches_metadata_walk(self):
+        for number, (name, metadata) in enumerate(self.CASES.items()):
+            with self.subTest(name):
+                lead_marketing = self.make_lead_marketing(f'+1555555{number:04}', metadata)
+                attribution = refresh_attribution(lead_marketing)
+
+                self.assertEqual(attribution.conversion_data(), legacy_conversion_data(lead_marketing))
+
+    def test_click_flags(self):
+        google = refresh_attribution(self.make_lead_marketing('+15555550001', {'_gcl_aw': 'GCL.1700000000.CookieClick'}))
+        self.assertTrue(google.has_google_click)
+        self.assertFalse(google.has_facebook_click)
+
+        facebook = refresh_attribution(self.make_lead_marketing('+15555550002', {'fbclid': 'IwAR0'}))
+        self.assertFalse(facebook.has_google_click)
+        self.assertTrue(facebook.has_facebook_click)
+
+    def test_saves_keep_the_record_current(self):
+        lead_marketing = self.make_lead_marketing('+15555550001', {'utm_source': 'google'})
+        LeadMarketingMetadata.objects.create(lead_marketing=lead_marketing, key='gclid', value='Cj0KCQ')
+
+        attribution = LeadMarketing.objects.get(pk=lead_marketing.pk).attribution
+        self.assertEqual(attribution.gclid, 'Cj0KCQ')
+        self.assertTrue(attribution.has_google_click)
+
+    def test_batched_refresh_rebuilds_each_lead_once(self):
+        lead = Lead.objects.create(full_name='Jane Doe', phone_number='+15555550001')
+
+        with mock.patch('core.logic.tracking.attribution.refresh_attribution', wraps=refresh_attribution) as refresh:
+            with batched_refresh():
+                lead_marketing = LeadMarketing.objects.create(lead=lead)
+                lead_marketing.save()
+                for key, value in self.CASES['google and facebook clicks'].items():
+                    LeadMarketingMetadata.objects.create(lead_marketing=lead_marketing, key=key, value=value)
+
+                refresh.assert_not_called()
+
+        refresh.assert_called_once()
+        self.assertEqual(
+            LeadMarketing.objects.get(pk=lead_marketing.pk).attribution.conversion_data(),
+            legacy_conversion_data(lead_marketing),
+        )
+
+def legacy_prospecting_metrics(segment: str, year: int) -> dict[int, dict]:
+    """The per-lead loop ProspectingAnalytics ran before the rollups."""
+    leads = Lead.objects.filter().prefetch_related('quotes__quote_services')
+
+    if segment == 'rental':
+        cutoff = timezone.make_aware(datetime(2025, 10, 1))
+        leads = leads.filter(created_at__gte=cutoff, lead_marketing__attribution__has_google_click=True)
+    elif segment == 'bartending':
+        leads = leads.filter(lead_marketing__attribution__has_facebook_click=True)
+
+    metrics = {month: {'leads': 0, 'converted_leads': 0, 'quotes': set(), 'booked': set(), 'value': 0} for month in range(1, 13)}
+    for lead in leads:
+        if year == lead.created_at.year:
+            month = metrics[lead.created_at.month]
+            month['leads'] += 1
+            if any(quote.is_booked for quote in lead.quotes.all()):
+                month['converted_leads'] += 1
+
+        for quote in lead.quotes.all():
+            if quote.event_date.year != year:
+                continue
+
+            month = metrics[quote.event_date.month]
+            month['quotes'].add(lead.pk)
+            if quote.is_booked:
+                month['booked'].add(lead.pk)
+                month['value'] += quote.amount()
+
+    for month in metrics.values():
+        month['quotes'] = len(month['quotes'])
+        month['booked'] = len(month['booked'])
+
+    return metrics
+
+class ProspectingRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Seeded as in migration 0051; every new quote gets one invoice of each type.
+        for invoice_type, percentage in (('DEPOSIT', 0.25), ('REMAINING', 0.75), ('FULL', 1.00), ('EXTEND', 1.00)):
+            InvoiceType.objects.create(type=invoice_type, amount_percentage=percentage)
+
+        cls.service = Service.objects.create(
+            service='Bartender',
+            service_type=ServiceType.objects.create(type='Service'),
+            unit_type=UnitType.objects.create(type='Hourly'),
+        )
+
+        facebook = cls.make_lead('2025-09-15', {'fbclid': 'IwAR0'})
+        cls.make_quote(facebook, '2025-10-20', [(2, 100), (1, 50)], paid=InvoiceTypeEnum.FULL)
+        cls.make_quote(facebook, '2025-12-05', [(4, 25)])
+
+        google = cls.make_lead('2025-10-10', {'gclid': 'Cj0KCQ'})
+        cls.make_quote(google, '2025-10-25', [(3, 40)], paid=InvoiceTypeEnum.DEPOSIT)
+        cls.make_quote(google, '2025-10-02', [(1, 500)])
+
+        # Clicked before rental leads were tracked, so only in the 'all' segment.
+        early_google = cls.make_lead('2025-09-20', {'_gcl_aw': 'GCL.1700000000.CookieClick'})
+        cls.make_quote(early_google, '2025-11-11', [(5, 30)], paid=InvoiceTypeEnum.FULL)
+
+        organic = cls.make_lead('2025-11-03', {})
+        cls.make_quote(organic, '2025-11-30', [(2, 75)])
+
+        both = cls.make_lead('2025-12-01', {'gclid': 'Cj0KCR', '_fbc': 'fb.1.1700000000.AbC'})
+        cls.make_quote(both, '2026-01-15', [(1, 900)], paid=InvoiceTypeEnum.FULL)
+
+    @classmethod
+    def make_lead(cls, created: str, metadata: dict) -> Lead:
+        created_at = timezone.make_aware(datetime.fromisoformat(f'{created} 12:00'))
+        lead = Lead.objects.create(full_name='Jane Doe', phone_number=f'+1555{Lead.objects.count():07}', created_at=created_at)
+
+        lead_marketing = LeadMarketing.objects.create(lead=lead)
+        for key, value in metadata.items():
+            LeadMarketingMetadata.objects.create(lead_marketing=lead_marketing, key=key, value=value)
+
+        return lead
+
+    @classmethod
+    def make_quote(cls, lead: Lead, event_date: str, services: list[tuple], paid: InvoiceTypeEnum | None = None):
+        quote = Quote.objects.create(lead=lead, adults=50, hours=4, event_date=date.fromisoformat(event_date))
+        for units, price in services:
+            QuoteService.objects.create(quote=quote, service=cls.service, units=units, price_per_unit=price)
+
+        if paid:
+            # Invoice.save() reprices the quote's other invoices on payment, which these fixtures don't need.
+            quote.invoices.filter(invoice_type__type=paid.value).update(date_paid=timezone.now())
+
+    def test_rollups_match_per_lead_loop(self):
+        for segment in ('all', 'bartending', 'rental'):
+            with self.subTest(segment):
+                legacy = legacy_prospecting_metrics(segment, 2025)
+                rollups = prospecting_rollups.compute(segment, date(2025, 1, 1), date(2025, 12, 1))
+
+                for month, expected in legacy.items():
+                    rollup = rollups[date(2025, month, 1)]
+                    self.assertEqual(
+                        {
+                            'leads': rollup.leads,
+                            'converted_leads': rollup.converted_leads,
+                            'quotes': rollup.quotes,
+                            'booked': rollup.booked,
+                            'value': rollup.value,
+                        },
+                        expected,
+                        f'{segment} {month:02}/2025',
+                    )
+
+    def test_expected_totals(self):
+        rollups = prospecting_rollups.compute('all', date(2025, 9, 1), date(2025, 12, 1))
+
+        self.assertEqual(rollups[date(2025, 9, 1)].leads, 2)
+        self.assertEqual(rollups[date(2025, 9, 1)].converted_leads, 2)
+        self.assertEqual(rollups[date(2025, 10, 1)].quotes, 2)
+        self.assertEqual(rollups[date(2025, 10, 1)].booked, 2)
+        self.assertEqual(rollups[date(2025, 10, 1)].value, 370)
+        self.assertEqual(rollups[date(2025, 11, 1)].booked, 1)
+
+    def test_closed_months_are_stored_and_invalidated(self):
+        with mock.patch('core.logic.analytics.prospecting.timezone.now', return_value=timezone.make_aware(datetime(2026, 2, 10))):
+            prospecting_rollups.get('all', date(2025, 9, 1), date(2026, 2, 1))
+
+            stored = set(ProspectingRollup.objects.values_list('month', flat=True))
+            self.assertEqual(stored, {date(2025, 9, 1), date(2025, 10, 1), date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)})
+
+            with self.captureOnCommitCallbacks(execute=True):
+                invoice = Invoice.objects.get(quote__event_date=date(2025, 11, 30), invoice_type__type=InvoiceTypeEnum.FULL.value)
+                invoice.date_paid = timezone.now()
+                invoice.save()
+
+            # The quote's event month and its lead's created month are both November.
+            stored = set(ProspectingRollup.objects.values_list('month', flat=True))
+            self.assertEqual(stored, {date(2025, 9, 1), date(2025, 10, 1), date(2025, 12, 1), date(2026, 1, 1)})
+
+            [november] = prospecting_rollups.get('all', date(2025, 11, 1), date(2025, 11, 1))
+            self.assertEqual(november.booked, 2)
+            self.assertEqual(november.converted_leads, 1)
+            self.assertEqual(november.value, 300)
+
+    def test_attribution_change_invalidates_lead_months(self):
+        with mock.patch('core.logic.analytics.prospecting.timezone.now', return_value=timezone.make_aware(datetime(2026, 2, 10))):
+            prospecting_rollups.get('rental', date(2025, 9, 1), date(2026, 1, 1))
+            self.assertEqual(prospecting_rollups.get('rental', date(2025, 11, 1), date(2025, 11, 1))[0].leads, 0)
+
+            organic = Lead.objects.get(created_at__month=11)
+            with self.captureOnCommitCallbacks(execute=True):
+                LeadMarketingMetadata.objects.create(lead_marketing=organic.lead_marketing, key='gclid', value='Cj0KCS')
+
+            stored = set(ProspectingRollup.objects.values_list('month', flat=True))
+            self.assertEqual(stored, {date(2025, 9, 1), date(2025, 10, 1), date(2025, 12, 1), date(2026, 1, 1)})
+
+            [november] = prospecting_rollups.get('rental', date(2025, 11, 1), date(2025, 11, 1))
+            self.assertEqual(november.leads, 1)
+            self.assertEqual(november.quotes, 1)
+
+    def test_moved_quote_invalidates_its_old_month(self):
+        quote = Quote.objects.get(event_date=date(2025, 12, 5))
+        # Quote.save() re-saves its invoices before the row changes, which would invalidate the old month on its own.
+        quote.invoices.all().delete()
+
+        with mock.patch('core.logic.analytics.prospecting.timezone.now', return_value=timezone.make_aware(datetime(2026, 2, 10))):
+            prospecting_rollups.get('all', date(2025, 9, 1), date(2026, 1, 1))
+            self.assertEqual(prospecting_rollups.get('all', date(2025, 12, 1), date(2025, 12, 1))[0].quotes, 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                quote.event_date = date(2026, 1, 20)
+                quote.save()
+
+            # December (old event month), January (new event month) and September (the lead's created month).
+            stored = set(ProspectingRollup.objects.values_list('month', flat=True))
+            self.assertEqual(stored, {date(2025, 10, 1), date(2025, 11, 1)})
+
+            [december] = prospecting_rollups.get('all', date(2025, 12, 1), date(2025, 12, 1))
+            self.assertEqual(december.quotes, 0)
+
+class RecordingWriter(BackgroundBatchWriter):
+    def __init__(self, capacity: int, fail: bool = False):
+        super().__init__(capacity=capacity, flush_interval=60, batch_size=capacity)
+        self.fail = fail
+        self.batches = []
+        self.errors = []
+
+    def write(self, items, dropped):
+        if self.fail:
+            raise RuntimeError('Database unavailable')
+        self.batches.append((items, dropped))
+
+    def report_error(self, message):
+        self.errors.append(message)
+
+    def _ensure_started(self):
+        # Tests flush by hand instead of from the writer thread.
+        pass
+
+class BackgroundBatchWriterTests(TestCase):
+    def test_full_queue_drops_and_counts(self):
+        writer = RecordingWriter(capacity=3)
+        for item in range(5):
+            writer.put(item)
+
+        writer.flush()
+        writer.flush()
+
+        self.assertEqual(writer.batches, [([0, 1, 2], 2)])
+
+    def test_write_errors_are_reported_not_raised(self):
+        writer = RecordingWriter(capacity=3, fail=True)
+        writer.put('entry')
+
+        writer.flush()
+
+        self.assertEqual(writer.errors, ['RecordingWriter failed to write 1 item(s): Database unavailable'])
+
+    def test_stop_writes_what_is_left(self):
+        writer = RecordingWriter(capacity=3)
+        writer.put('entry')
+
+        writer.stop()
+        writer.stop()
+
+        self.assertEqual(writer.batches, [(['entry'], 0)])
+
+class LeadEngagementProcessorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='company', phone_number='+15555550000', forward_phone_number=settings.COMPANY_PHONE_NUMBER)
+
+    def make_engagement(self, phone_number: str, state: LeadEngagementStateChoices, **fields) -> LeadEngagementState:
+        lead = Lead.objects.create(full_name='Jane Doe', phone_number=phone_number)
+        return LeadEngagementState.objects.create(
+            lead=lead,
+            state=state,
+            last_contacted_at=timezone.now() - timedelta(days=4),
+            **fields,
+        )
+
+    def test_follow_up_is_queued_with_its_transition(self):
+        engagement = self.make_engagement('+15555550101', LeadEngagementStateChoices.FIRST_CONTACT)
+
+        queued = LeadEngagementProcessor().run()
+
+        engagement.refresh_from_db()
+        history = LeadEngagementHistory.objects.get(lead=engagement.lead)
+        message = OutboxMessage.objects.get()
+
+        self.assertEqual(queued, 1)
+        self.assertEqual(engagement.state, LeadEngagementStateChoices.FOLLOW_UP_1)
+        self.assertEqual(message.action, 'messaging.send_text')
+        self.assertEqual(message.idempotency_key, f'lead-engagement-history:{history.pk}:follow-up')
+        self.assertEqual(message.payload['text_to'], '+15555550101')
+
+    def test_failed_enqueue_rolls_back_that_lead_only(self):
+        failing = self.make_engagement('+15555550101', LeadEngagementStateChoices.FIRST_CONTACT)
+        other = self.make_engagement('+15555550102', LeadEngagementStateChoices.FOLLOW_UP_1, follow_up_attempts=1)
+
+        def enqueue(message, idempotency_key=None):
+            if message.text_to == failing.lead.phone_number:
+                raise ConnectionError('Database unavailable')
+            return original(message, idempotency_key=idempotency_key)
+
+        original = outbox.send_text_message
+        with mock.patch.object(outbox, 'send_text_message', side_effect=enqueue), self.assertLogs('internal', level='ERROR'):
+            queued = LeadEngagementProcessor().run()
+
+        failing.refresh_from_db()
+        other.refresh_from_db()
+
+        self.assertEqual(queued, 1)
+        self.assertEqual(failing.state, LeadEngagementStateChoices.FIRST_CONTACT)
+        self.assertFalse(LeadEngagementHistory.objects.filter(lead=failing.lead).exists())
+        self.assertEqual(other.state, LeadEngagementStateChoices.FOLLOW_UP_2)
+        self.assertEqual(OutboxMessage.objects.get().payload['text_to'], other.lead.phone_number)
+
+    def test_unexpected_error_does_not_roll_back_the_batch(self):
+        archived = self.make_engagement('+15555550101', LeadEngagementStateChoices.FOLLOW_UP_2, follow_up_attempts=2, retry_cycles=2)
+        other = self.make_engagement('+15555550102', LeadEngagementStateChoices.FIRST_CONTACT)
+
+        with mock.patch('core.logic.managers.lead.LeadStateManager.archive', side_effect=RuntimeError('Archive failed')), self.assertLogs('internal', level='ERROR'):
+            LeadEngagementProcessor().run()
+
+        archived.refresh_from_db()
+        other.refresh_from_db()
 
-# Create your tests here.
+        self.assertEqual(archived.state, LeadEngagementStateChoices.FOLLOW_UP_2)
+        self.assertEqual(other.state, LeadEngagementStateChoices.FOLLOW_UP_1)
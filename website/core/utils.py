@@ -15,8 +15,6 @@ import uuid
 from pathlib import Path
 
 from django.http import HttpRequest
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 
 from django.core.exceptions import ValidationError
 from django.shortcuts import render
@@ -25,20 +23,12 @@ from django.utils.dateparse import parse_datetime
 from django.utils.timezone import make_aware, is_naive
 from django.contrib.sessions.models import Session
 
-import requests
-
 from django.db import models
 
 from website import settings
-from io import BytesIO
-from moviepy import VideoFileClip
-
-from pydub import AudioSegment
 from core.messaging.utils import MIME_EXTENSION_MAP
 from core.logger import logger
 
-import phonenumbers
-from phonenumbers.phonenumberutil import NumberParseException
 from core.enums import AlertHTTPCodes, AlertStatus
 
 ALPHANUMERIC_CHARS = string.ascii_uppercase + string.digits
@@ -97,27 +87,9 @@ def cleanup_dir_files(dir_path):
         if file.is_file():
             file.unlink()
 
-def download_file_from_twilio(twilio_resource: str, local_file_path: str) -> None:
-        try:
-            response = requests.get(
-                twilio_resource,
-                auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
-                stream=True
-            )
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logger.exception(str(e), exc_info=True)
-            raise Exception(f"Failed to download file: {e}")
-
-        try:
-            with open(local_file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-        except Exception as e:
-            logger.exception(str(e), exc_info=True)
-            raise Exception(f"Failed to save file locally: {e}")
-
 def format_phone_number(phone_number: str, region: str = "US") -> str:
+    import phonenumbers
+
     try:
         p = phonenumbers.parse(phone_number, region)
         if phonenumbers.is_valid_number(p):
@@ -202,36 +174,6 @@ def get_paired_reviews(max_pairs=4):
 
     return reviews
 
-class AttachmentProcessingError(Exception):
-    pass
-
-def convert_audio_format(file, target_file_path: str, to_format: str) -> BytesIO:
-    try:
-        with open(target_file_path, "wb") as tmp_file:
-            if hasattr(file, "chunks"):
-                for chunk in file.chunks():
-                    tmp_file.write(chunk)
-            else:
-                tmp_file.write(file.read())
-
-        audio = AudioSegment.from_file(target_file_path)
-        buffer = BytesIO()
-        audio.export(buffer, format=to_format, bitrate="192k")
-        buffer.seek(0)
-        return buffer
-
-    except Exception as e:
-        raise AttachmentProcessingError(f"Audio conversion failed: {str(e)}") from e
-
-    finally:
-        if os.path.exists(target_file_path):
-            os.remove(target_file_path)
-
-def convert_video_to_mp4(input_path: str, output_path: str):
-    clip = VideoFileClip(input_path)
-    clip.write_videofile(output_path, codec="libx264", audio_codec="aac", preset="medium", threads=2)
-    clip.close()
-
 def get_upload_sub_dir(content_type: str) -> str:
     return {
         "audio": "audio",
@@ -268,6 +210,8 @@ def generate_random_long_int(num_digits=18):
     return random.randint(lower, upper)
 
 def normalize_phone_number(value: str, default_region: str = "US") -> str | None:
+    import phonenumbers
+
     if not value or not isinstance(value, str):
         return None
 
@@ -278,7 +222,7 @@ def normalize_phone_number(value: str, default_region: str = "US") -> str | None
                 number,
                 phonenumbers.PhoneNumberFormat.E164,
             )
-    except NumberParseException as e:
+    except phonenumbers.NumberParseException as e:
         logger.exception(str(e), exc_info=True)
 
     return None
@@ -334,69 +278,47 @@ def run_cmd(cmd, env_vars=None):
     if result.returncode != 0:
         raise Exception(f"Command failed: {cmd}")
 
-def get_content_type_from_url(url: str) -> str:
-    response = requests.head(url, allow_redirects=True)
-    return response.headers.get("Content-Type")
+def get_session_data(session_key):
+    return get_sessions_data([session_key]).get(session_key, {})
 
-def download_file_from_url(url: str, local_file_path: str, headers: dict | None = None, params: dict | None = None,) -> None:
-    try:
-        response = requests.get(url, stream=True, headers=headers, params=params)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.exception("Failed to download file", exc_info=True)
-        raise Exception(f"Failed to download file from {url}: {e}") from e
+def get_sessions_data(session_keys, chunk_size=1000) -> dict[str, dict]:
+    """
+    Decodes many sessions at once, keyed by session key. Live sessions come from the session cache
+    in one round trip; the rest are read from the database in chunks, expired ones included, since
+    attribution only needs what the visitor's session recorded. Unknown keys are left out.
+    """
+    from django.contrib.sessions.backends.cached_db import KEY_PREFIX
+    from django.core.cache import caches
 
-    try:
-        with open(local_file_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-    except Exception as e:
-        logger.exception("Failed to save file locally", exc_info=True)
-        raise Exception(f"Failed to save file locally at {local_file_path}: {e}") from e
-    
-def get_session_data(session_key):
-    try:
-        session = Session.objects.get(pk=session_key)
-        return session.get_decoded()
-    except Session.DoesNotExist:
+    session_keys = [key for key in dict.fromkeys(session_keys) if key]
+    if not session_keys:
         return {}
 
-def load_google_credentials():
-    from core.models import GoogleAccessToken
-    token = GoogleAccessToken.objects.order_by("-date_created").first()
+    cached = caches[settings.SESSION_CACHE_ALIAS].get_many([KEY_PREFIX + key for key in session_keys])
+    data = {key[len(KEY_PREFIX):]: value for key, value in cached.items()}
 
-    with open(settings.GOOGLE_API_CREDENTIALS_PATH, "r") as f:
-        credentials_data = json.load(f)
+    missing = [key for key in session_keys if key not in data]
+    for i in range(0, len(missing), chunk_size):
+        for session in Session.objects.filter(pk__in=missing[i:i + chunk_size]):
+            data[session.session_key] = session.get_decoded()
 
-    client_info = credentials_data.get("installed") or credentials_data.get("web")
-    client_id = client_info.get('client_id')
-    client_secret = client_info.get('client_secret')
+    return data
 
-    creds = Credentials(
-        token=token.access_token,
-        refresh_token=token.refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=client_id,
-        client_secret=client_secret,
-        scopes=settings.GOOGLE_API_SCOPES,
-    )
+def get_sessions_data_by_external_id(external_ids) -> dict[str, dict]:
+    """Session data for many tracked visitors, keyed by external ID, via their SessionMapping rows."""
+    from core.models import SessionMapping
 
-    if creds.expired:
-        creds.refresh(Request())
-        date_expires = creds.expiry
-        if is_naive(date_expires):
-            date_expires = make_aware(date_expires)
-        
-        new_token = GoogleAccessToken(
-            access_token=creds.token,
-            refresh_token=creds.refresh_token,
-            scope=",".join(creds.scopes),
-            date_expires=date_expires,
-        )
-        new_token.save()
+    session_keys = dict(
+        SessionMapping.objects.filter(external_id__in=[str(external_id) for external_id in external_ids])
+        .values_list('external_id', 'session_key')
+    )
+    sessions = get_sessions_data(session_keys.values())
 
-    return creds
+    return {
+        external_id: sessions[session_key]
+        for external_id, session_key in session_keys.items()
+        if session_key in sessions
+    }
 
 def generate_order_code():
     """
@@ -554,7 +476,7 @@ def parse_google_ads_cookie(value: str) -> str | None:
 def get_most_frequent_communication_user(messages):
     from core.models import User
 
-    default_user = User.objects.get(forward_phone_number=settings.COMPANY_NUMBER)
+    default_user = User.objects.get(forward_phone_number=settings.COMPANY_PHONE_NUMBER)
 
     if not messages:
         return default_user
@@ -6,15 +6,15 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.contrib.auth import authenticate, login, logout
 from django.db import transaction
-from django.core.files.storage import storages
 
 from website import settings
 
 from marketing.mixins import LandingPageMixin, UserTrackingMixin, VisitTrackingMixin
 from core.services.email import email_service
+from core.logic.cache.pages import media_url, social_proof
 from .logger import logger
-from .models import Event, GoogleReview, Invoice, LandingPage, Lead
-from .utils import get_average_ratings, get_paired_reviews, is_mobile, format_phone_number, normalize_phone_number
+from .models import Invoice, LandingPage, Lead
+from .utils import is_mobile, format_phone_number, normalize_phone_number
 from .forms import ContactForm, LoginForm, LeadForm
 from .enums import AlertHTTPCodes, AlertStatus
 
@@ -103,7 +103,6 @@ class HomeView(LandingPageMixin, BaseWebsiteView):
 
         context['js_files'] += ['js/floatingHeader.js']
 
-        media_storage = storages['media']
         cocktail_images = [
             ('Raspberry Spritz', 'raspberry_spritz.webp'),
             ('Mojitos', 'mojitos.webp'),
@@ -116,7 +115,7 @@ class HomeView(LandingPageMixin, BaseWebsiteView):
         cocktails = [
             {
                 'name': name,
-                'src': media_storage.url(filename)
+                'src': media_url(filename)
             }
             for name, filename in cocktail_images
         ]
@@ -173,11 +172,6 @@ class HomeView(LandingPageMixin, BaseWebsiteView):
             }
         ]
 
-        reviews = GoogleReview.objects.all()
-        paired_reviews = get_paired_reviews()
-        reviews_ratings = get_average_ratings()
-        events = Event.objects.count()
-
         signature_cocktails = [
             {
                 'type': 'Signature Cocktails',
@@ -284,10 +278,7 @@ class HomeView(LandingPageMixin, BaseWebsiteView):
         context['offers'] = offers
         context['cocktails'] = cocktails
         context['features'] = features
-        context['paired_reviews'] = paired_reviews
-        context['reviews'] = reviews
-        context['reviews_ratings'] = reviews_ratings
-        context['events'] = events
+        context.update(social_proof.get_context())
         context['signature_cocktails'] = signature_cocktails
         context['left_social_images'] = left_social_images
         context['right_social_images'] = right_social_images
@@ -469,54 +460,46 @@ class ChairRentals(BaseWebsiteView):
 
         context['js_files'] += ['js/floatingHeader.js']
 
-        reviews = GoogleReview.objects.all()
-        paired_reviews = get_paired_reviews()
-        reviews_ratings = get_average_ratings()
-        events = Event.objects.count()
-
-        media_storage = storages['media']
-        
-
         items = [
             {
                 'name': 'Plastic Folding Chairs',
                 'price': 2.00,
-                'image': media_storage.url('white_plastic_folding_chair.webp'),
+                'image': media_url('white_plastic_folding_chair.webp'),
             },
             {
                 'name': 'Resin Folding Chairs',
                 'price': 4.00,
-                'image': media_storage.url('resin_folding_chairs.webp'),
+                'image': media_url('resin_folding_chairs.webp'),
             },
             {
                 'name': 'Chiavari Chairs',
                 'price': 7.00,
-                'image': media_storage.url('chiavari_chair.webp'),
+                'image': media_url('chiavari_chair.webp'),
             },
             {
                 'name': 'Cross Back Chairs',
                 'price': 10.00,
-                'image': media_storage.url('crossback_chair.webp'),
+                'image': media_url('crossback_chair.webp'),
             },
             {
                 'name': 'Willow Chairs',
                 'price': 10.00,
-                'image': media_storage.url('wiilow_chair.webp'),
+                'image': media_url('wiilow_chair.webp'),
             },
             {
                 'name': 'Bamboo Chairs',
                 'price': 10.00,
-                'image': media_storage.url('bamboo_chair.webp'),
+                'image': media_url('bamboo_chair.webp'),
             },
             {
                 'name': 'O Chairs',
                 'price': 15.00,
-                'image': media_storage.url('o_chair.webp'),
+                'image': media_url('o_chair.webp'),
             },
             {
                 'name': 'Bar Stools',
                 'price': 13.00,
-                'image': media_storage.url('chiavari_bar_stool.webp'),
+                'image': media_url('chiavari_bar_stool.webp'),
             },
         ]
 
@@ -574,10 +557,7 @@ class ChairRentals(BaseWebsiteView):
 
         comments = [f"comment_{i}.webp" for i in range(1, 14)]
 
-        context['paired_reviews'] = paired_reviews
-        context['reviews'] = reviews
-        context['reviews_ratings'] = reviews_ratings
-        context['events'] = events
+        context.update(social_proof.get_context())
         context['items'] = items
         context['faqs'] = faqs
         context['comments'] = comments
@@ -593,38 +573,31 @@ class TableRentals(BaseWebsiteView):
 
         context['js_files'] += ['js/floatingHeader.js']
 
-        reviews = GoogleReview.objects.all()
-        paired_reviews = get_paired_reviews()
-        reviews_ratings = get_average_ratings()
-        events = Event.objects.count()
-
-        media_storage = storages['media']
-        
         items = [
             {
                 'name': 'Plastic Folding Tables',
                 'price': 14.00,
-                'image': media_storage.url('plastic_folding_tables.webp'),
+                'image': media_url('plastic_folding_tables.webp'),
             },
             {
                 'name': 'Serpentine Tables',
                 'price': 16.00,
-                'image': media_storage.url('serpentine_tables.webp'),
+                'image': media_url('serpentine_tables.webp'),
             },
             {
                 'name': 'Round Tables',
                 'price': 14.00,
-                'image': media_storage.url('round_tables.webp'),
+                'image': media_url('round_tables.webp'),
             },
             {
                 'name': "Banquet Tables",
                 'price': 15.00,
-                'image': media_storage.url('banque_tables.webp'),
+                'image': media_url('banque_tables.webp'),
             },
             {
                 'name': 'Cocktail Tables',
                 'price': 12.00,
-                'image': media_storage.url('cocktail_tables.webp'),
+                'image': media_url('cocktail_tables.webp'),
             }
         ]
 
@@ -681,10 +654,7 @@ class TableRentals(BaseWebsiteView):
 
         comments = [f"comment_{i}.webp" for i in range(1, 14)]
 
-        context['paired_reviews'] = paired_reviews
-        context['reviews'] = reviews
-        context['reviews_ratings'] = reviews_ratings
-        context['events'] = events
+        context.update(social_proof.get_context())
         context['items'] = items
         context['faqs'] = faqs
         context['comments'] = comments
@@ -700,43 +670,36 @@ class TentRentals(BaseWebsiteView):
 
         context['js_files'] += ['js/floatingHeader.js']
 
-        reviews = GoogleReview.objects.all()
-        paired_reviews = get_paired_reviews()
-        reviews_ratings = get_average_ratings()
-        events = Event.objects.count()
-
-        media_storage = storages['media']
-        
         items = [
             {
                 'name': '10x10 Pop-Up Tents & Canopies (Up To 10 Guests)',
                 'price': 80.00,
-                'image': media_storage.url('10x10_pop_up_tent.webp'),
+                'image': media_url('10x10_pop_up_tent.webp'),
             },
             {
                 'name': '10x20 Pop-Up Tents & Canopies (Up To 20 Guests)',
                 'price': 160.00,
-                'image': media_storage.url('10x20_pop_up_tent.webp'),
+                'image': media_url('10x20_pop_up_tent.webp'),
             },
             {
                 'name': '10x40 Frame Tents (Up To 40 Guests)',
                 'price': 220.00,
-                'image': media_storage.url('10x40_tent_rental.webp'),
+                'image': media_url('10x40_tent_rental.webp'),
             },
             {
                 'name': '20x20 Frame Tents (Up To 50 Guests)',
                 'price': 240.00,
-                'image': media_storage.url('20x20_tent_rental.webp'),
+                'image': media_url('20x20_tent_rental.webp'),
             },
             {
                 'name': '15x30 Frame Tents (Up To 60 Guests)',
                 'price': 240.00,
-                'image': media_storage.url('15x30_tent_rental.webp'),
+                'image': media_url('15x30_tent_rental.webp'),
             },
             {
                 'name': '20x40 Frame Tents (Up To 100 Guests)',
                 'price': 480.00,
-                'image': media_storage.url('20x40_tent_rental.webp'),
+                'image': media_url('20x40_tent_rental.webp'),
             },
         ]
 
@@ -793,10 +756,7 @@ class TentRentals(BaseWebsiteView):
 
         comments = [f"comment_{i}.webp" for i in range(1, 14)]
 
-        context['paired_reviews'] = paired_reviews
-        context['reviews'] = reviews
-        context['reviews_ratings'] = reviews_ratings
-        context['events'] = events
+        context.update(social_proof.get_context())
         context['items'] = items
         context['faqs'] = faqs
         context['comments'] = comments
@@ -812,33 +772,26 @@ class BarRentals(BaseWebsiteView):
 
         context['js_files'] += ['js/floatingHeader.js']
 
-        reviews = GoogleReview.objects.all()
-        paired_reviews = get_paired_reviews()
-        reviews_ratings = get_average_ratings()
-        events = Event.objects.count()
-
-        media_storage = storages['media']
-        
         items = [
             {
                 'name': 'Budget Bar Rental',
                 'price': 50.00,
-                'image': media_storage.url('budget_bar_rental.webp'),
+                'image': media_url('budget_bar_rental.webp'),
             },
             {
                 'name': 'Folding Bar Rental (4 Different Colors)',
                 'price': 100.00,
-                'image': media_storage.url('folding_bar_rental.webp'),
+                'image': media_url('folding_bar_rental.webp'),
             },
             {
                 'name': 'Professional Bar Rental',
                 'price': 200.00,
-                'image': media_storage.url('professional_bar_rental.webp'),
+                'image': media_url('professional_bar_rental.webp'),
             },
             {
                 'name': 'Modular Bar Rental (Up To 7 Pieces)',
                 'price': 300.00,
-                'image': media_storage.url('modular_bar_rental.webp'),
+                'image': media_url('modular_bar_rental.webp'),
             }
         ]
 
@@ -894,10 +847,7 @@ class BarRentals(BaseWebsiteView):
 
         comments = [f"comment_{i}.webp" for i in range(1, 14)]
 
-        context['paired_reviews'] = paired_reviews
-        context['reviews'] = reviews
-        context['reviews_ratings'] = reviews_ratings
-        context['events'] = events
+        context.update(social_proof.get_context())
         context['items'] = items
         context['faqs'] = faqs
         context['comments'] = comments
@@ -81,6 +81,7 @@ urlpatterns = [
     path('message/<int:pk>/', views.MessageDetailView.as_view(), name='message_detail'),
     path('message/<int:pk>/edit/', views.MessageUpdateView.as_view(), name='message_update'),
     path('message/<int:pk>/read/', views.MessageReadView.as_view(), name='message_read'),
+    path('message/unread/', views.UnreadMessagesView.as_view(), name='message_unread'),
     
     # Phone Call
     path('phone-call/', views.PhoneCallListView.as_view(), name='phonecall_list'),
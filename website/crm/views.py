@@ -1,6 +1,5 @@
-from collections import defaultdict
 import calendar
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from django.forms import ValidationError
 from django.http import FileResponse, Http404, HttpResponse
 from django.views.generic.edit import CreateView, UpdateView, DeleteView, FormView
@@ -15,9 +14,9 @@ from django.utils import timezone
 from django.db import transaction
 
 from website import settings
-from core.models import AdPlatform, AdPlatformChoices, AdSpend, CallTrackingNumber, CocktailIngredient, EventCocktail, EventDocument, EventShoppingList, EventShoppingListEntry, EventStaff, EventStatusChoices, FacebookAccessToken, HTTPLog, Ingredient, InternalLog, Invoice, InvoiceTypeEnum, LandingPage, LeadMarketingMetadata, LeadNote, LeadStatusEnum, Message, PhoneCall, Message, Quote, QuotePreset, QuotePresetService, QuoteService, AddedOrRemoveActionChoices, QuoteServiceChangeHistory, SessionMapping, StoreItem, Visit
+from core.models import AdPlatformChoices, CallTrackingNumber, CocktailIngredient, EventCocktail, EventDocument, EventShoppingList, EventShoppingListEntry, EventStaff, EventStatusChoices, FacebookAccessToken, HTTPLog, Ingredient, InternalLog, Invoice, InvoiceTypeEnum, LandingPage, LeadMarketingMetadata, LeadNote, LeadStatusEnum, Message, PhoneCall, Message, Quote, QuotePreset, QuotePresetService, QuoteService, AddedOrRemoveActionChoices, QuoteServiceChangeHistory, SessionMapping, StoreItem, Visit
 from communication.forms import MessageForm, OutboundPhoneCallForm, PhoneCallForm
-from core.models import LeadStatus, Lead, User, Service, Cocktail, Event, LeadMarketing
+from core.models import Lead, User, Service, Cocktail, Event, LeadMarketing
 from core.forms import ServiceForm, UserForm
 from crm.forms import EventClientConfirmationForm, EventFilterForm, FacebookAccessTokenForm, InternalLogForm, InvoiceForm, LandingPageForm, LeadMarketingMetadataForm, MarketingAnalyticsFilterForm, ProspectingMetricsFilterForm, QuickQuoteForm, QuoteForm, CocktailIngredientForm, EventCocktailForm, EventShoppingListForm, EventStaffForm, CallTrackingNumberForm, IngredientForm, LeadForm, CocktailForm, EventForm, LeadMarketingForm, LeadNoteForm, QuotePresetEditFormForm, QuotePresetForm, QuotePresetServiceForm, QuoteSendForm, QuoteServiceForm, StoreItemForm, VisitForm
 from core.enums import AlertStatus
@@ -29,6 +28,11 @@ from core.utils import format_phone_number, format_text_message, get_first_field
 from core.utils import create_ad_from_params, generate_params_dict_from_url
 from crm.utils import calculate_quote_service_values, convert_to_item_quantity, update_quote_invoices
 from core.messaging import messaging_service
+from core.logic.cache.lookups import ad_platforms, lead_statuses
+from core.logic.analytics.marketing import MarketingMetrics, marketing_analytics
+from core.logic.analytics.prospecting import prospecting_rollups
+from core.logic.cache.counters import unread_message_counter
+from core.logic.tracking.visits import visit_tracker
 from crm.filters import EventFilter
 
 class CRMContextMixin:
@@ -59,7 +63,8 @@ class CRMContextMixin:
             "company_name": settings.COMPANY_NAME,
             "page_path": f"{settings.ROOT_DOMAIN}{self.request.path}",
             "is_mobile": is_mobile(self.request.META.get('HTTP_USER_AGENT', '')),
-            "unread_messages": Message.objects.filter(is_read=False).count(),
+            "unread_messages": unread_message_counter.get(),
+            "unread_messages_poll_seconds": settings.UNREAD_MESSAGES_POLL_SECONDS,
             "nav_links": nav_links,
             "debug": settings.DEBUG,
         })
@@ -242,7 +247,7 @@ class LeadListView(CRMListView):
     context_object_name = 'leads'
 
     def get_queryset(self):
-        queryset = super().get_queryset().order_by('-created_at')
+        queryset = super().get_queryset().select_related('lead_marketing__attribution').order_by('-created_at')
         
         search = self.request.GET.get('search')
         
@@ -310,7 +315,7 @@ class LeadArchiveView(CRMUpdateView):
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
 
-        archived_status = LeadStatus.objects.get(status=LeadStatusEnum.ARCHIVED.value)
+        archived_status = lead_statuses.get(LeadStatusEnum.ARCHIVED.value)
         self.object.lead_status = archived_status
         self.object.save()
 
@@ -460,10 +465,9 @@ class MessageReadView(CRMUpdateView):
             lead_pk = request.headers.get("X-Lead-ID")
 
             if is_read == "false" and message_pk:
-                message = Message.objects.filter(pk=message_pk).first()
-                if message:
-                    message.is_read = True
-                    message.save(update_fields=["is_read"])
+                # Conditional update so concurrent clicks on the same message only decrement once.
+                if Message.objects.filter(pk=message_pk, is_read=False).update(is_read=True):
+                    unread_message_counter.decr()
 
             lead = Lead.objects.get(pk=lead_pk)
             return render(request, 'crm/lead_chat_messages.html', { 'lead': lead })
@@ -471,6 +475,17 @@ class MessageReadView(CRMUpdateView):
         except Exception as e:
             return self.alert(request, str(e), AlertStatus.INTERNAL_ERROR, reswap=True)
 
+class UnreadMessagesView(LoginRequiredMixin, TemplateView):
+    template_name = 'crm/unread_messages_badge.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            "unread_messages": unread_message_counter.get(),
+            "unread_messages_poll_seconds": settings.UNREAD_MESSAGES_POLL_SECONDS,
+        })
+        return context
+
 class PhoneCallListView(CRMTableView):
     model = PhoneCall
     table_class = PhoneCallTable
@@ -534,13 +549,17 @@ class VisitUpdateView(UpdateView):
     model = Visit
     http_method_names = ['post']
 
-    def form_valid(self, form):
-        visit = form.save(commit=False)
-
-        if not visit.cookies:
-            visit.cookies = self.request.COOKIES
+    def post(self, request, *args, **kwargs):
+        form = self.get_form_class()(request.POST)
+        if not form.is_valid():
+            return HttpResponse(status=400)
 
-        visit.save()
+        # The visit may still be buffered, so this can't go through get_object().
+        visit_tracker.update(
+            visit_id=self.kwargs.get('pk'),
+            session_duration=form.cleaned_data['session_duration'],
+            cookies=request.COOKIES,
+        )
 
         return HttpResponse(status=201)
 
@@ -1446,76 +1465,30 @@ class MarketingAnalytics(CRMBaseView, TemplateView):
             date_to = timezone.make_aware(datetime.combine(form.cleaned_data["date_to"], datetime.max.time()))
         else:
             date_from = timezone.make_aware(datetime(2025, 10, 1))
-            date_to = timezone.make_aware(datetime.now())
-
-        ad_spend = AdSpend.objects.filter(date__range=(date_from, date_to))
-        google = AdPlatform.objects.get(platform=AdPlatformChoices.GOOGLE)
-        facebook = AdPlatform.objects.get(platform=AdPlatformChoices.FACEBOOK)
-
-        google_spend_entries = ad_spend.filter(platform_id=google.pk)
-        facebook_spend_entries = ad_spend.filter(platform_id=facebook.pk)
-
-        google_ad_spend = google_spend_entries.aggregate(ad_spend=Sum('spend'))['ad_spend'] or 0
-        facebook_ad_spend = facebook_spend_entries.aggregate(ad_spend=Sum('spend'))['ad_spend'] or 0
-
-        leads = Lead.objects.filter(created_at__range=(date_from, date_to))
-        google_leads = leads.filter(lead_marketing__ad__ad_platform=google).distinct()
-        facebook_leads = leads.filter(lead_marketing__ad__ad_platform=facebook).distinct()
-
-        google_leads_with_events = google_leads.filter(events__isnull=False).distinct()
-        facebook_leads_with_events = facebook_leads.filter(events__isnull=False).distinct()
-
-        google_leads_count = google_leads.count()
-        facebook_leads_count = facebook_leads.count()
-
-        google_events = Event.objects.filter(lead__in=google_leads)
-        facebook_events = Event.objects.filter(lead__in=facebook_leads)
-
-        google_event_count = google_leads_with_events.count()
-        facebook_event_count = facebook_leads_with_events.count()
-
-        google_revenue = google_events.aggregate(total_revenue=Sum('amount'))['total_revenue'] or 0
-        facebook_revenue = facebook_events.aggregate(total_revenue=Sum('amount'))['total_revenue'] or 0
-
-        google_aov = google_revenue / google_event_count if google_event_count > 0 else 0
-        facebook_aov = facebook_revenue / facebook_event_count if facebook_event_count > 0 else 0
-
-        google_closing_percent = (google_event_count / google_leads_count) * 100 if google_leads_count > 0 else 0
-        facebook_closing_percent = (facebook_event_count / facebook_leads_count) * 100 if facebook_leads_count > 0 else 0
-
-        google_roas = google_revenue / google_ad_spend if google_ad_spend > 0 else 0
-        facebook_roas = facebook_revenue / facebook_ad_spend if facebook_ad_spend > 0 else 0
-
-        google_cpl = google_ad_spend / google_leads_count if google_leads_count > 0 else 0
-        facebook_cpl = facebook_ad_spend / facebook_leads_count if facebook_leads_count > 0 else 0
-
-        google_cpa = google_ad_spend / google_leads_with_events.count() if google_leads_with_events.exists() else 0
-        facebook_cpa = facebook_ad_spend / facebook_leads_with_events.count() if facebook_leads_with_events.exists() else 0
+            # End of today rather than now, so the default range shares one cache entry all day.
+            date_to = timezone.make_aware(datetime.combine(datetime.now(), datetime.max.time()))
+
+        metrics = {
+            row.dimensions['platform']: row
+            for row in marketing_analytics.get(date_from, date_to, dimensions=('platform',))
+        }
+
+        for prefix, platform in (('google', AdPlatformChoices.GOOGLE), ('facebook', AdPlatformChoices.FACEBOOK)):
+            platform_metrics = metrics.get(ad_platforms.get(platform).pk) or MarketingMetrics(dimensions={'platform': platform}, ad_spend=0)
+
+            ctx.update({
+                f'{prefix}_count': platform_metrics.leads,
+                f'{prefix}_event_count': platform_metrics.converted_leads,
+                f'{prefix}_revenue': platform_metrics.revenue,
+                f'{prefix}_aov': platform_metrics.aov,
+                f'{prefix}_closing_percent': platform_metrics.closing_percent,
+                f'{prefix}_roas': platform_metrics.roas,
+                f'{prefix}_cpl': platform_metrics.cpl,
+                f'{prefix}_cpa': platform_metrics.cpa,
+                f'{prefix}_ad_spend': platform_metrics.ad_spend,
+            })
 
-        ctx.update({
-            'google_count': google_leads_count,
-            'google_event_count': google_event_count,
-            'google_revenue': google_revenue,
-            'google_aov': google_aov,
-            'google_closing_percent': google_closing_percent,
-            'google_roas': google_roas,
-            'google_cpl': google_cpl,
-            'google_cpa': google_cpa,
-
-            'facebook_count': facebook_leads_count,
-            'facebook_event_count': facebook_event_count,
-            'facebook_revenue': facebook_revenue,
-            'facebook_aov': facebook_aov,
-            'facebook_closing_percent': facebook_closing_percent,
-            'facebook_roas': facebook_roas,
-            'facebook_cpl': facebook_cpl,
-            'facebook_cpa': facebook_cpa,
-
-            'google_ad_spend': google_ad_spend,
-            'facebook_ad_spend': facebook_ad_spend,
-
-            'filter_form': form,
-        })
+        ctx['filter_form'] = form
 
         # Revenue metrics by business segment
         events = Event.objects.filter(
@@ -1679,79 +1652,19 @@ class ProspectingAnalytics(CRMBaseView, TemplateView):
         year = int(form.cleaned_data.get('year'))
         segment = form.cleaned_data.get('business_segment')
 
-        date_from = timezone.make_aware(datetime(year, 1, 1))
-        date_to = timezone.make_aware(datetime(year, 12, 31, 23, 59, 59))
-        min_date = timezone.make_aware(datetime(2025, 8, 1))
-        if date_from < min_date:
-            date_from = min_date
-
-        leads = Lead.objects.filter().prefetch_related('quotes__quote_services')
-
-        if segment == 'rental':
-            cutoff = timezone.make_aware(datetime(2025, 10, 1))
-            leads = leads.filter(
-                created_at__gte=cutoff
-            ).filter(
-                Q(lead_marketing__metadata__key='gclid') |
-                Q(lead_marketing__metadata__key='_gcl_aw') |
-                Q(lead_marketing__metadata__key='gbraid')
-            ).distinct()
-        elif segment == 'bartending':
-            leads = leads.filter(
-                Q(lead_marketing__metadata__key='_fbc') |
-                Q(lead_marketing__metadata__key='fbclid') |
-                Q(lead_marketing__instant_form_lead_id__isnull=False)
-            ).distinct()
-                
-        lead_month_map = defaultdict(int)
-        value_month_map = defaultdict(float)
-        quote_month_map = defaultdict(set)
-        booked_month_map = defaultdict(set)
-        converted_leads_map = defaultdict(int)
-
-        year = int(form.cleaned_data['year'])
-
-        for lead in leads:
-
-            # Count leads created within current selected year
-            if year == lead.created_at.year:
-                month = lead.created_at.month
-                lead_month_map[month] += 1
-                is_booked = any(quote.is_booked for quote in lead.quotes.all())
-                if is_booked:
-                    converted_leads_map[month] += 1
-
-            for quote in lead.quotes.all():
-
-                # Only count quotes for current year
-                if quote.event_date.year != year:
-                    continue
-
-                month = quote.event_date.month
-                quote_month_map[month].add(lead.pk)
-
-                if quote.is_booked:
-                    booked_month_map[month].add(lead.pk)
-                    value_month_map[month] += quote.amount()
+        rollups = prospecting_rollups.get(segment, date(year, 1, 1), date(year, 12, 1))
 
         metrics = []
-        for month in range(1, 13):
-            total_leads = lead_month_map.get(month, 0)
-            converted_leads = converted_leads_map.get(month, 0)
-            leads_with_quotes = quote_month_map.get(month, set())
-            booked_leads = booked_month_map.get(month, set())
-            value = value_month_map.get(month, 0)
-            conv_percent = (len(booked_leads) / len(leads_with_quotes) * 100) if leads_with_quotes else 0
-
+        for rollup in rollups:
             metrics.append({
-                'month': datetime(year, month, 1),
-                'leads': total_leads,
-                'converted_leads': converted_leads,
-                'converted_leads_percentage': (converted_leads / total_leads) * 100 if total_leads > 0 else 0,
-                'quotes': len(leads_with_quotes),
-                'booked': len(booked_leads),
-                'value': value,
-                'conversion': conv_percent
+                'month': datetime(rollup.month.year, rollup.month.month, 1),
+                'leads': rollup.leads,
+                'converted_leads': rollup.converted_leads,
+                'converted_leads_percentage': (rollup.converted_leads / rollup.leads) * 100 if rollup.leads > 0 else 0,
+                'quotes': rollup.quotes,
+                'booked': rollup.booked,
+                'value': rollup.value,
+                'conversion': (rollup.booked / rollup.quotes * 100) if rollup.quotes else 0,
             })
 
         ctx.update({
@@ -0,0 +1,12 @@
+def post_worker_init(worker):
+    from core.logic.cache.warmup import warm_up
+
+    warm_up()
+
+def worker_exit(server, worker):
+    from core.logic.http.capture import http_log_writer
+    from core.logic.tracking.visits import visit_tracker
+
+    # Write out buffered visits and HTTP logs before the worker goes away.
+    visit_tracker.stop()
+    http_log_writer.stop()
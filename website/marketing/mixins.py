@@ -3,9 +3,10 @@ import random
 
 from django.conf import settings
 from django.http import HttpRequest
-from core.models import LandingPage, LeadMarketing, SessionMapping, Visit
+from core.models import LandingPage, SessionMapping
 from core.utils import is_paid_traffic
 from core.helpers.marketing import MarketingHelper
+from core.logic.tracking.visits import visit_tracker
     
 class UserTrackingMixin:
     def dispatch(self, request, *args, **kwargs):
@@ -14,10 +15,12 @@ class UserTrackingMixin:
             if not external_id:
                 external_id = str(uuid.uuid4())
 
-            mapping_exists = SessionMapping.objects.filter(external_id=external_id).exists()
+            # The mapping is checked once per session rather than on every page view.
+            if not request.session.get("has_session_mapping"):
+                if not SessionMapping.objects.filter(external_id=external_id).exists():
+                    self._init_user_tracking(request, external_id)
 
-            if not mapping_exists:
-                self._init_user_tracking(request, external_id)
+                request.session["has_session_mapping"] = True
 
         return super().dispatch(request, *args, **kwargs)
 
@@ -55,28 +58,19 @@ class UserTrackingMixin:
 class VisitTrackingMixin:
     def dispatch(self, request: HttpRequest, *args, **kwargs):
         if not request.user.is_authenticated:
-            referrer = request.META.get('HTTP_REFERER')
-            external_id = request.session.get('external_id')
-
-            lead_marketing = LeadMarketing.objects.filter(external_id=external_id).first()
+            landing_page_id = None
+            if not request.GET.get('test'):
+                landing_page_id = request.session.get('landing_page_id')
 
-            visit = Visit(
-                external_id=external_id,
-                referrer=referrer,
+            # Written in batches by the tracker; lead marketing and landing page are resolved then.
+            request.session['visit_id'] = visit_tracker.record(
+                external_id=request.session.get('external_id'),
                 url=request.build_absolute_uri(),
-                lead_marketing=lead_marketing,
+                referrer=request.META.get('HTTP_REFERER'),
                 cookies=request.COOKIES,
+                landing_page_id=landing_page_id,
             )
 
-            if not request.GET.get('test'):
-                lp = request.session.get('landing_page_id')
-                if lp:
-                    visit.landing_page = LandingPage.objects.filter(pk=lp).first()
-
-            visit.save()
-
-            request.session['visit_id'] = visit.visit_id
-
         return super().dispatch(request, *args, **kwargs)
     
 class LandingPageMixin:
@@ -4,12 +4,10 @@ import hashlib
 
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.db import transaction
 
-from core.models import Lead
+from core.models import WebhookProviderChoices
 from website import settings
-from core.services.facebook.api import facebook_api_service
-from core.enums import LeadEngagementAction
+from core.logic.webhooks.inbox import webhook_inbox
 
 @csrf_exempt
 def handle_facebook_create_new_lead(request: HttpRequest) -> HttpResponse:
@@ -42,39 +40,25 @@ def handle_facebook_create_new_lead(request: HttpRequest) -> HttpResponse:
                 return HttpResponse('Invalid signature', status=403)
 
             payload = json.loads(request.body)
-            entries = []
-
-            for entry in payload.get('entry', []):
-                for change in entry.get('changes', []):
-                    if change.get('field') == 'leadgen':
-                        value = change.get('value', {})
-                        entries.append({
-                            'leadgen_id': value.get('leadgen_id'),
-                            'page_id': value.get('page_id'),
-                            'form_id': value.get('form_id'),
-                            'adgroup_id': value.get('adgroup_id'),
-                            'ad_id': value.get('ad_id'),
-                            'created_time': value.get('created_time'),
-                        })
-
-            for entry in entries:
-                data = facebook_api_service.get_lead_data(lead=entry)
-                if not data.get('phone_number'):
-                    continue
-
-                with transaction.atomic():
-                    lead, created = Lead.objects.get_or_create(
-                        phone_number=data.get('phone_number'),
-                        defaults={ 
-                            'full_name': data.get('full_name'),
-                            'message': data.get('message'),
-                            'created_at': data.get('created_time'),
-                         }
-                    )
-
-                    if created:
-                        lead.manager.handle_lead_creation_via_instant_form(data=data, entry=entry)
-                        lead.actions.send_automated_message(LeadEngagementAction.INITIAL_CONTACT)
+            leadgen_ids = sorted(
+                str(change.get('value', {}).get('leadgen_id'))
+                for entry in payload.get('entry', [])
+                for change in entry.get('changes', [])
+                if change.get('field') == 'leadgen'
+            )
+
+            external_id = ",".join(leadgen_ids)
+            if not external_id or len(external_id) > 255:
+                external_id = None
+
+            webhook_inbox.store(
+                provider=WebhookProviderChoices.FACEBOOK,
+                event_type='facebook.leadgen',
+                body=request.body.decode('utf-8'),
+                content_type=request.content_type,
+                headers=dict(request.headers),
+                external_id=external_id,
+            )
 
             return JsonResponse({'status': 'received'}, status=200)
 
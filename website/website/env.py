@@ -18,6 +18,9 @@ class EnvConfig:
         # Server
         "ALLOWED_HOSTS",
 
+        # Cache
+        "REDIS_URL",
+
         # Company
         "COMPANY_NAME",
         "SITE_NAME",
@@ -90,6 +90,22 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env.get("REDIS_URL"),
+        'KEY_PREFIX': 'yd',
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env.get("REDIS_URL"),
+        'KEY_PREFIX': 'yd:sessions',
+    },
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -149,6 +165,7 @@ GOOGLE_ADS_CALL_CONVERSION_LABEL = env.get('GOOGLE_ADS_CALL_CONVERSION_LABEL')
 GOOGLE_ADS_DEVELOPER_TOKEN = env.get('GOOGLE_ADS_DEVELOPER_TOKEN')
 GOOGLE_ADS_ID = env.get('GOOGLE_ADS_ID')
 GOOGLE_ADS_CUSTOMER_ID = env.get('GOOGLE_ADS_CUSTOMER_ID')
+GOOGLE_CALENDAR_ID = env.get('GOOGLE_CALENDAR_ID', 'primary')
 
 EVENT_BOOKED_GOOGLE_ADS_CONVERSION_ACTION_ID = 7355438593
 LEAD_CREATED_GOOGLE_ADS_CONVERSION_ACTION_ID = 7446313673
@@ -177,6 +194,7 @@ STRIPE_WEBHOOK_SECRET = env.get("STRIPE_WEBHOOK_SECRET")
 
 CALL_RAIL_API_KEY = env.get("CALL_RAIL_API_KEY")
 CALL_RAIL_ACCOUNT_ID = env.get("CALL_RAIL_ACCOUNT_ID")
+CALL_RAIL_WEBHOOK_SIGNATURE_SECRET_TOKEN = env.get("CALL_RAIL_WEBHOOK_SIGNATURE_SECRET_TOKEN")
 
 OPEN_AI_API_KEY = env.get("OPEN_AI_API_KEY")
 
@@ -279,6 +297,78 @@ DELIVERY_SERVICE = 'core.services.delivery.spoke.SpokeService'
 TRANSCRIPTION_SERVICE = 'core.services.transcription.aws.AWSTranscriptionService'
 TRANSCRIPTION_STORAGE_PREFIX = 'uploads/jobs/'
 
+# Outbox
+OUTBOX_TRANSPORT = 'core.logic.outbox.transports.HandlerTransport'
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 3600
+OUTBOX_LEASE_SECONDS = 900
+
+# Webhooks
+WEBHOOK_MAX_ATTEMPTS = 5
+WEBHOOK_BACKOFF_SECONDS = 15
+WEBHOOK_MAX_BACKOFF_SECONDS = 3600
+WEBHOOK_LEASE_SECONDS = 300
+
+# Media
+MEDIA_TRANSCODE_WORKERS = 2
+MEDIA_TRANSCODE_TIMEOUT = 600
+MEDIA_VIDEO_PRESET = 'veryfast'
+
+# Unread messages
+UNREAD_MESSAGES_CACHE = 'default'
+UNREAD_MESSAGES_CACHE_TIMEOUT = 300
+UNREAD_MESSAGES_POLL_SECONDS = 30
+
+# Marketing pages
+MARKETING_PAGE_CACHE = 'default'
+MARKETING_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Analytics
+MARKETING_ANALYTICS_CACHE = 'default'
+MARKETING_ANALYTICS_CACHE_TIMEOUT = 60 * 5
+
+# Visit tracking
+VISIT_BUFFER_SIZE = 5000
+VISIT_FLUSH_BATCH_SIZE = 200
+VISIT_FLUSH_INTERVAL = 2
+VISIT_ID_BLOCK_SIZE = 100
+VISIT_UPDATE_MAX_ATTEMPTS = 5
+
+# Sessions
+SESSION_CLEANUP_CHUNK_SIZE = 1000
+
+# HTTP logs
+HTTP_LOG_SAMPLE_RATE = 0.1
+HTTP_LOG_MAX_BODY_BYTES = 16 * 1024
+HTTP_LOG_BUFFER_SIZE = 5000
+HTTP_LOG_FLUSH_BATCH_SIZE = 200
+HTTP_LOG_FLUSH_INTERVAL = 2
+HTTP_LOG_RETENTION_DAYS = 30
+HTTP_LOG_CLEANUP_CHUNK_SIZE = 1000
+
+# HTTP clients
+HTTP_TIMEOUT = (5, 30)
+HTTP_SERVICE_TIMEOUTS = {
+    'media': (5, 120),
+    'twilio': (5, 120),
+}
+HTTP_POOL_MAXSIZE = 10
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_BACKOFF_JITTER = 0.5
+HTTP_CIRCUIT_FAILURE_THRESHOLD = 5
+HTTP_CIRCUIT_RESET_SECONDS = 60
+
+# Conversions
+CONVERSION_UPLOAD_BATCH_SIZE = 500
+CONVERSION_UPLOAD_MAX_ATTEMPTS = 8
+CONVERSION_UPLOAD_BACKOFF_SECONDS = 60
+CONVERSION_UPLOAD_MAX_BACKOFF_SECONDS = 3600
+CONVERSION_UPLOAD_LEASE_SECONDS = 900
+CONVERSION_DISPATCH_WORKERS = 8
+CONVERSION_DISPATCH_TIMEOUT = 15
+
 # Marketing Services
 CONVERSION_SERVICES = {
     "facebook": {
@@ -326,7 +416,10 @@ LOGGING = {
     'handlers': {
         'db': {
             'level': 'ERROR',
-            'class': 'core.logs.handler.DatabaseLogHandler',
+            'class': 'core.logic.logs.handler.DatabaseLogHandler',
+            'capacity': 10000,
+            'flush_interval': 2.0,
+            'batch_size': 500,
         },
         'console': {
             'level': 'DEBUG',